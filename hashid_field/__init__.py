@@ -1,5 +1,6 @@
 from .field import HashidField, BigHashidField, HashidAutoField, BigHashidAutoField
-from .hashid import Hashid
+from .field import ShardedHashidField, ShardedHashidAutoField
+from .hashid import Hashid, CompositeHashid
 
 __title__ = 'Django Hashid Field'
 __version__ = "3.4.1"
@@ -0,0 +1,129 @@
+import copy
+import operator
+from functools import reduce
+
+try:
+    from django.contrib.admin.utils import lookup_spawns_duplicates
+except ImportError:  # Django < 4.0
+    from django.contrib.admin.utils import lookup_needs_distinct as lookup_spawns_duplicates
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.text import smart_split, unescape_string_literal
+
+from .field import HashidFieldMixin
+from .lookups import get_hashids_for_hashid_field
+
+
+def _get_search_hashid_field(opts, search_field):
+    """
+    Returns a tuple of (path, field) if the `search_fields` entry refers to a Hashid*Field, or to a relation whose
+    target is a Hashid*Field, otherwise None. `path` is the entry without any search prefix or lookup.
+    """
+    parts = search_field.lstrip('^=@').split(LOOKUP_SEP)
+    path = []
+    field = None
+    for part in parts:
+        if part == 'pk':
+            part = opts.pk.name
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            if field is None:
+                return None
+            break  # The rest is a lookup, such as "id__exact"
+        path.append(part)
+        if field.is_relation and part != parts[-1]:
+            # path_infos was added in Django 4.1
+            path_infos = field.path_infos if hasattr(field, 'path_infos') else field.get_path_info()
+            opts = path_infos[-1].to_opts
+    if field is not None and not isinstance(field, HashidFieldMixin):
+        field = getattr(field, 'target_field', None)
+    if not isinstance(field, HashidFieldMixin):
+        return None
+    return LOOKUP_SEP.join(path), field
+
+
+def _looks_like_hashid(field, term):
+    """Cheaply checks whether a search term could be a hashid, or an allowed integer, for the given field."""
+    if not term.startswith(field.prefix):
+        return False
+    term = term[len(field.prefix):]
+    if field.allow_int_lookup and term.isdigit():
+        return True
+    is_candidate = getattr(field._hashids, 'is_candidate', None)
+    return bool(term) and (is_candidate is None or is_candidate(term))
+
+
+class HashidSearchMixin:
+    """
+    A ModelAdmin mixin that makes searching by hashid fast. Search terms that look like a hashid for one of the
+    Hashid*Fields in `search_fields` are decoded in one batch and matched with a single `__in` clause per field, so
+    pasting several IDs finds all of them. As in ModelAdmin, every other term must also match, and the terms that were
+    decoded are still searched for in the other `search_fields`, in case they aren't IDs after all.
+    """
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        if not search_fields or not search_term:
+            return super().get_search_results(request, queryset, search_term)
+
+        hashid_fields = []
+        text_fields = []
+        for search_field in search_fields:
+            hashid_field = _get_search_hashid_field(queryset.model._meta, str(search_field))
+            if hashid_field is None:
+                text_fields.append(search_field)
+            else:
+                hashid_fields.append(hashid_field)
+        if not hashid_fields:
+            return super().get_search_results(request, queryset, search_term)
+
+        terms = []
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            terms.append(bit)
+
+        hashid_queries = []
+        matched_terms = set()
+        may_have_duplicates = False
+        for path, field in hashid_fields:
+            candidates = [term for term in terms if _looks_like_hashid(field, term)]
+            if not candidates:
+                continue
+            hashids, _invalid = get_hashids_for_hashid_field(field, candidates)
+            if hashids:
+                matched_terms.update(hashids)
+                hashid_queries.append(Q(**{"%s__in" % path: list(hashids.values())}))
+                may_have_duplicates |= lookup_spawns_duplicates(self.opts, path)
+
+        if not hashid_queries:
+            return super().get_search_results(request, queryset, search_term)
+
+        # The decoded terms are IDs the user is looking for, so any of them may match, unless they are all text that
+        # one of the other fields matches.
+        hashid_terms = [term for term in terms if term in matched_terms]
+        results = queryset.filter(reduce(operator.or_, hashid_queries))
+        if text_fields:
+            text_results, text_duplicates = self._get_text_search_results(request, queryset, text_fields, hashid_terms)
+            results |= text_results
+            may_have_duplicates |= text_duplicates
+
+        # Every other term has to match too, as it would in ModelAdmin
+        remaining_terms = [term for term in terms if term not in matched_terms]
+        if remaining_terms:
+            if not text_fields:
+                return queryset.none(), False
+            text_results, text_duplicates = self._get_text_search_results(
+                request, queryset, text_fields, remaining_terms)
+            results &= text_results
+            may_have_duplicates |= text_duplicates
+        return results, may_have_duplicates
+
+    def _get_text_search_results(self, request, queryset, text_fields, terms):
+        # Let ModelAdmin build the text search, on a copy that only searches the other fields, which would otherwise
+        # try to decode every term again.
+        search_term = " ".join('"%s"' % term.replace('\\', '\\\\').replace('"', '\\"') for term in terms)
+        text_admin = copy.copy(self)
+        text_admin.get_search_fields = lambda request: text_fields
+        return super(HashidSearchMixin, text_admin).get_search_results(request, queryset, search_term)
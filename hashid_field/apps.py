@@ -0,0 +1,16 @@
+import sys
+
+from django.apps import AppConfig, apps
+
+
+class HashidFieldConfig(AppConfig):
+    name = 'hashid_field'
+    verbose_name = "Hashid Field"
+
+    def ready(self):
+        from .resolver import registry
+        registry.populate(apps.get_models())
+
+        # Only pull in Django REST Framework if the project uses it, rather than whenever models are imported
+        if 'rest_framework' in sys.modules or apps.is_installed('rest_framework'):
+            from . import rest  # noqa: F401 Importing it registers the fields with ModelSerializer
@@ -0,0 +1,120 @@
+from array import array
+from collections.abc import Sequence
+
+from django.db.models import BigIntegerField, ExpressionWrapper, F
+
+from .hashid import Hashid
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class HashidArray(Sequence):
+    """
+    A sequence of the Hashids of a Hashid*Field, stored as a compact array of 64-bit integers. Items are only encoded
+    when they are accessed, or all at once with `strings()`. Membership tests and set operations work on the integers,
+    and a HashidArray can be passed to an `__in` lookup on any Hashid*Field as is.
+    """
+    def __init__(self, ids, field):
+        self.ids = ids if isinstance(ids, array) and ids.typecode == 'q' else array('q', ids)
+        self.field = field
+        self._id_set = None
+
+    @classmethod
+    def from_queryset(cls, queryset, field_name='pk'):
+        """Returns a HashidArray of a Hashid*Field of every row in the queryset, loaded without encoding any of them."""
+        field = queryset.model._meta.pk if field_name == 'pk' else queryset.model._meta.get_field(field_name)
+        ids = queryset.values_list(ExpressionWrapper(F(field_name), output_field=BigIntegerField()), flat=True)
+        return cls(ids, field)
+
+    def _to_id(self, value):
+        if isinstance(value, Hashid):
+            return value.id
+        if type(value) is int:
+            return value
+        return self.field.get_hashid(value).id
+
+    def _to_ids(self, values):
+        if isinstance(values, HashidArray):
+            return values.ids
+        return [self._to_id(value) for value in values]
+
+    def _get_id_set(self):
+        if self._id_set is None:
+            self._id_set = frozenset(self.ids)
+        return self._id_set
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(self.ids[index], self.field)
+        return self.field.get_hashid(self.ids[index])
+
+    def __iter__(self):
+        get_hashid = self.field.get_hashid
+        for id in self.ids:
+            yield get_hashid(id)
+
+    def __contains__(self, value):
+        try:
+            return self._to_id(value) in self._get_id_set()
+        except ValueError:
+            return False
+
+    def contains(self, values):
+        """Returns a list of whether each of the given Hashids, hashid strings or integers is in the array."""
+        id_set = self._get_id_set()
+        result = []
+        for value in values:
+            try:
+                result.append(self._to_id(value) in id_set)
+            except ValueError:
+                result.append(False)
+        return result
+
+    def strings(self):
+        """Returns a list of the hashid strings of every item, encoding them all at once."""
+        if self.field.hashid_class is not Hashid:
+            return [str(self.field.get_hashid(id)) for id in self.ids]
+        encode = self.field._hashids.encode
+        prefix = self.field.prefix
+        return [prefix + encode(id) for id in self.ids]
+
+    def to_numpy(self):
+        """Returns the integer IDs as a NumPy array that shares memory with this HashidArray."""
+        if numpy is None:
+            raise ImportError("NumPy is not installed")
+        return numpy.frombuffer(self.ids, dtype=numpy.int64)
+
+    def __and__(self, other):
+        other_ids = frozenset(self._to_ids(other))
+        return self.__class__((id for id in self.ids if id in other_ids), self.field)
+
+    def __or__(self, other):
+        id_set = set(self._get_id_set())
+        ids = array('q', self.ids)
+        for id in self._to_ids(other):
+            if id not in id_set:
+                id_set.add(id)
+                ids.append(id)
+        return self.__class__(ids, self.field)
+
+    def __sub__(self, other):
+        other_ids = frozenset(self._to_ids(other))
+        return self.__class__((id for id in self.ids if id not in other_ids), self.field)
+
+    def __eq__(self, other):
+        if isinstance(other, HashidArray):
+            return self.ids == other.ids
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        if len(self.ids) > 10:
+            return "HashidArray({}, ... {} more)".format(list(self.ids[:10]), len(self.ids) - 10)
+        return "HashidArray({})".format(list(self.ids))
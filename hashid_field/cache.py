@@ -0,0 +1,81 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+# Tables are shared by every field with the same configuration, since those fields produce identical Hashid objects.
+_intern_tables = {}
+_negative_caches = {}
+_negative_caches_lock = threading.Lock()
+
+
+def get_intern_table(salt, min_length, alphabet, prefix, *options):
+    """
+    Returns the weak-value interning table of Hashid objects for the given configuration, keyed by integer id. Any
+    extra `options` that change the Hashids produced, such as a CompositeHashid's `local_id_bits`, are part of the key.
+    """
+    key = (salt, min_length, alphabet, prefix) + options
+    try:
+        return _intern_tables[key]
+    except KeyError:
+        return _intern_tables.setdefault(key, weakref.WeakValueDictionary())
+
+
+class NegativeCache(object):
+    """
+    A bounded set of strings known not to be valid hashids for a configuration, so that they can be rejected without
+    decoding them again. Once it holds `maxsize` strings, adding another evicts the least recently seen one, and
+    strings longer than `max_value_length` are never added, so the memory it can use is capped no matter what is sent.
+    """
+    max_value_length = 256
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.evictions = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, value):
+        with self._lock:
+            if value not in self._values:
+                return False
+            self._values.move_to_end(value)
+            self.hits += 1
+            return True
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, value):
+        if len(value) > self.max_value_length:
+            return
+        with self._lock:
+            self._values[value] = None
+            self._values.move_to_end(value)
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self.hits = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Returns a dict of the number of lookups rejected from the cache, evictions, and the current and max size."""
+        with self._lock:
+            return {'hits': self.hits, 'evictions': self.evictions, 'size': len(self._values), 'maxsize': self.maxsize}
+
+
+def get_negative_cache(maxsize, salt, min_length, alphabet, prefix, *options):
+    """
+    Returns the NegativeCache of invalid strings for the given configuration. As with get_intern_table(), any extra
+    `options` that change which strings are valid, such as retired salts, are part of the key.
+    """
+    key = (maxsize, salt, min_length, alphabet, prefix) + options
+    with _negative_caches_lock:
+        try:
+            return _negative_caches[key]
+        except KeyError:
+            return _negative_caches.setdefault(key, NegativeCache(maxsize))
@@ -12,3 +12,6 @@ setattr(settings, 'HASHID_FIELD_LOOKUP_EXCEPTION', getattr(settings, 'HASHID_FIE
 setattr(settings, 'HASHID_FIELD_ENABLE_HASHID_OBJECT', getattr(settings, 'HASHID_FIELD_ENABLE_HASHID_OBJECT', True))
 setattr(settings, 'HASHID_FIELD_ENABLE_DESCRIPTOR', getattr(settings, 'HASHID_FIELD_ENABLE_DESCRIPTOR', True))
 
+setattr(settings, 'HASHID_FIELD_ENABLE_INTERNING', getattr(settings, 'HASHID_FIELD_ENABLE_INTERNING', False))
+setattr(settings, 'HASHID_FIELD_NEGATIVE_CACHE_SIZE', getattr(settings, 'HASHID_FIELD_NEGATIVE_CACHE_SIZE', 0))
+setattr(settings, 'HASHID_FIELD_SHARDS', getattr(settings, 'HASHID_FIELD_SHARDS', {}))
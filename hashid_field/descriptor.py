@@ -1,17 +1,33 @@
-from hashids import Hashids
+from time import perf_counter
 
+from . import instrumentation
+from .encoder import make_hashids
 from .hashid import Hashid
 
 
 class HashidDescriptor(object):
-    def __init__(self, field_name, salt, min_length, alphabet, prefix="", hashids=None, enable_hashid_object=True):
+    def __init__(self, field_name, salt, min_length, alphabet, prefix="", hashids=None, enable_hashid_object=True,
+                 hashid_class=Hashid, hashid_options=None, get_hashids=None, get_hashid=None):
         self.field_name = field_name
         self.salt = salt
         self.min_length = min_length
         self.alphabet = alphabet
         self.prefix = prefix
-        self.hashids = hashids or Hashids(salt=self.salt, min_length=self.min_length, alphabet=self.alphabet)
+        self._hashids = hashids
+        self._get_hashids = get_hashids
+        self._get_hashid = get_hashid
         self.enable_hashid_object = enable_hashid_object
+        self.hashid_class = hashid_class
+        self.hashid_options = hashid_options or {}
+
+    @property
+    def hashids(self):
+        if self._hashids is None:
+            if self._get_hashids is not None:
+                self._hashids = self._get_hashids()
+            else:
+                self._hashids = make_hashids(self.salt, self.min_length, self.alphabet)
+        return self._hashids
 
     def __get__(self, instance, owner=None):
         if instance is not None and self.field_name in instance.__dict__:
@@ -20,22 +36,51 @@ class HashidDescriptor(object):
             return None
 
     def __set__(self, instance, value):
-        self._set_value(instance, self.field_name, value, enable_hashid_object=self.enable_hashid_object)
-        if not self.enable_hashid_object:
-            self._set_value(instance, self.field_name + "_hashid", value, enable_hashid_object=True)
+        if instrumentation.hooks:
+            start = perf_counter()
+            self._set(instance, value)
+            instrumentation.emit(instrumentation.DESCRIPTOR_SET, self._get_label(instance), perf_counter() - start,
+                                 value)
+        else:
+            self._set(instance, value)
+
+    def _get_label(self, instance):
+        meta = getattr(instance, '_meta', None)
+        if meta is None:
+            return "{}.{}".format(instance.__class__.__name__, self.field_name)
+        return "{}.{}".format(meta.label, self.field_name)
+
+    def _set(self, instance, value):
+        if self.enable_hashid_object:
+            self._set_value(instance, self.field_name, value, enable_hashid_object=True)
+        else:
+            # Convert the value only once for both the string and the "_hashid" attribute. If the string is the one
+            # we made last time, as when a model is cleaned and the cleaned value set again, then just keep the Hashid.
+            hashid_name = self.field_name + "_hashid"
+            hashid = instance.__dict__.get(hashid_name)
+            if not (isinstance(value, str) and isinstance(hashid, Hashid) and str(hashid) == value):
+                self._set_value(instance, hashid_name, value, enable_hashid_object=True)
+                hashid = instance.__dict__[hashid_name]
+            instance.__dict__[self.field_name] = str(hashid) if isinstance(hashid, Hashid) else value
+
+    def _make_hashid(self, value):
+        # Convert with the field when there is one, so values made with its retired salts are accepted too
+        if self._get_hashid is not None:
+            return self._get_hashid(value)
+        return self.hashid_class(value, salt=self.salt, min_length=self.min_length, alphabet=self.alphabet,
+                                 prefix=self.prefix, hashids=self.hashids, **self.hashid_options)
 
     def _set_value(self, instance, name, value, enable_hashid_object):
         if value is None:
             instance.__dict__[name] = value
-        if isinstance(value, Hashid):
+        elif isinstance(value, Hashid):
             if enable_hashid_object:
                 instance.__dict__[name] = value
             else:
                 instance.__dict__[name] = str(value)
         else:
             try:
-                h = Hashid(value, salt=self.salt, min_length=self.min_length, alphabet=self.alphabet,
-                           prefix=self.prefix, hashids=self.hashids)
+                h = self._make_hashid(value)
                 if enable_hashid_object:
                     instance.__dict__[name] = h
                 else:
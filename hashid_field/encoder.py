@@ -0,0 +1,159 @@
+import re
+from functools import lru_cache
+
+from hashids import Hashids, _reorder
+
+# Alphabets at most this long also get a table of every two-character digit pair, so that encoding and decoding handle
+# two digits per step. Hex or numeric alphabets produce long hashids, so this is where it pays off.
+PAIR_TABLE_MAX_ALPHABET = 32
+
+
+class _LotteryTable(object):
+    """Everything needed to encode or decode a single number whose hashid starts with one particular lottery char."""
+    __slots__ = ('alphabet', 'index', 'pairs', 'pair_index', 'pads')
+
+    def __init__(self, alphabet, with_pairs, min_length):
+        self.alphabet = alphabet
+        self.index = {char: i for i, char in enumerate(alphabet)}
+        if with_pairs:
+            self.pairs = [a + b for a in alphabet for b in alphabet]
+            self.pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+        else:
+            self.pairs = self.pair_index = None
+        # The (left, right) padding added by each round of hashids._ensure_length. Every round adds a whole alphabet's
+        # worth of characters, so this many rounds is always enough to reach min_length.
+        self.pads = []
+        split_at = len(alphabet) // 2
+        for _ in range(-(-min_length // len(alphabet))):
+            alphabet = _reorder(alphabet, alphabet)
+            self.pads.append((alphabet[split_at:], alphabet[:split_at]))
+
+
+class TableHashids(Hashids):
+    """
+    A drop-in replacement for hashids.Hashids that produces exactly the same output, but encodes and decodes single
+    numbers with precomputed per-lottery tables and integer arithmetic instead of shuffling the alphabet every time.
+
+    A hashid of a single number only depends on which of the alphabet's characters was picked as the "lottery", so
+    there are only len(alphabet) different shuffled alphabets that can ever be used. They are built the first time
+    each lottery is seen. Anything else (multiple numbers, non-int values) is handled by hashids.Hashids.
+    """
+    def __init__(self, salt='', min_length=0, alphabet=Hashids.ALPHABET):
+        super().__init__(salt=salt, min_length=min_length, alphabet=alphabet)
+        self._len_alphabet = len(self._alphabet)
+        self._with_pairs = self._len_alphabet <= PAIR_TABLE_MAX_ALPHABET
+        self._tables = {}
+        self._charset = frozenset(self._alphabet + self._separators + self._guards)
+        self._alphabet_chars = frozenset(self._alphabet)
+        self._separator_chars = frozenset(self._separators)
+        self._guard_re = re.compile('[{}]'.format(re.escape(self._guards)))
+
+    def _get_table(self, lottery):
+        table = self._tables.get(lottery)
+        if table is None:
+            alphabet_salt = (lottery + self._salt + self._alphabet)[:self._len_alphabet]
+            table = self._tables.setdefault(lottery, _LotteryTable(_reorder(self._alphabet, alphabet_salt),
+                                                                   self._with_pairs, self._min_length))
+        return table
+
+    def is_candidate(self, hashid):
+        """Returns whether `hashid` only uses characters that could appear in a hashid of this configuration."""
+        return bool(hashid) and self._charset.issuperset(hashid)
+
+    def encode(self, *values):
+        if len(values) != 1 or type(values[0]) is not int or values[0] < 0:
+            return super().encode(*values)
+        number = values[0]
+        len_alphabet = self._len_alphabet
+        values_hash = number % 100
+        lottery = self._alphabet[values_hash % len_alphabet]
+        table = self._get_table(lottery)
+
+        digits = []
+        if table.pairs is not None:
+            pairs = table.pairs
+            pair_base = len_alphabet * len_alphabet
+            while number >= len_alphabet:
+                number, remainder = divmod(number, pair_base)
+                digits.append(pairs[remainder])
+            # The last pair can't have a leading zero digit, since the loop only takes a pair when number >= base
+            if number or not digits:
+                digits.append(table.alphabet[number])
+            hashed = ''.join(reversed(digits))
+        else:
+            alphabet = table.alphabet
+            while True:
+                number, remainder = divmod(number, len_alphabet)
+                digits.append(alphabet[remainder])
+                if not number:
+                    break
+            hashed = ''.join(reversed(digits))
+
+        encoded = lottery + hashed
+        if len(encoded) < self._min_length:
+            encoded = self._ensure_length(encoded, table, values_hash)
+        return encoded
+
+    def _ensure_length(self, encoded, table, values_hash):
+        # Same as hashids._ensure_length, but with the repeatedly reordered alphabets cached on the lottery table
+        min_length = self._min_length
+        guards = self._guards
+        len_guards = len(guards)
+        encoded = guards[(values_hash + ord(encoded[0])) % len_guards] + encoded
+        if len(encoded) < min_length:
+            encoded += guards[(values_hash + ord(encoded[2])) % len_guards]
+
+        pads = iter(table.pads)
+        while len(encoded) < min_length:
+            left, right = next(pads)
+            encoded = left + encoded + right
+            excess = len(encoded) - min_length
+            if excess > 0:
+                from_index = excess // 2
+                encoded = encoded[from_index:from_index + min_length]
+        return encoded
+
+    def decode(self, hashid):
+        if not hashid or not isinstance(hashid, str):
+            return ()
+        parts = self._guard_re.split(hashid)
+        core = parts[1] if 2 <= len(parts) <= 3 else parts[0]
+        if not core or core[0] not in self._alphabet_chars:
+            return ()
+        if not self._separator_chars.isdisjoint(core):
+            return super().decode(hashid)
+
+        hashed = core[1:]
+        if not hashed:
+            return ()
+        table = self._get_table(core[0])
+        len_alphabet = self._len_alphabet
+        number = 0
+        try:
+            if table.pair_index is not None:
+                if len(hashed) % 2:
+                    number = table.index[hashed[0]]
+                    hashed = hashed[1:]
+                pair_base = len_alphabet * len_alphabet
+                pair_index = table.pair_index
+                for i in range(0, len(hashed), 2):
+                    number = number * pair_base + pair_index[hashed[i:i + 2]]
+            else:
+                index = table.index
+                for char in hashed:
+                    number = number * len_alphabet + index[char]
+        except KeyError:
+            return ()
+        # The lottery has to match the number before it's worth encoding it again to verify the whole hashid
+        if self._alphabet[number % 100 % len_alphabet] != core[0]:
+            return ()
+        return (number,) if self.encode(number) == hashid else ()
+
+
+@lru_cache(maxsize=256)
+def make_hashids(salt, min_length, alphabet):
+    """
+    Returns the encoder for a configuration. Encoders are shared between all fields, descriptors, serializer fields and
+    Hashids with the same configuration, so each one is only built, and its tables filled, once.
+    """
+    return TableHashids(salt=salt, min_length=min_length, alphabet=alphabet)
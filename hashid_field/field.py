@@ -1,3 +1,8 @@
+from contextlib import contextmanager
+from functools import lru_cache
+import threading
+from time import perf_counter
+
 from django import forms
 from django.core import exceptions, checks
 from django.core import validators as django_validators
@@ -6,21 +11,31 @@ from django.db.models import Field
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django.contrib.admin import widgets as admin_widgets
-from hashids import Hashids
 
 from .lookups import HashidExactLookup, HashidIterableLookup
 from .lookups import HashidGreaterThan, HashidGreaterThanOrEqual, HashidLessThan, HashidLessThanOrEqual
+from .lookups import HashidRangeLookup
 from .descriptor import HashidDescriptor
-from .hashid import Hashid
+from .encoder import make_hashids
+from .tables import make_mapped_hashids
+from . import instrumentation
+from .cache import get_intern_table, get_negative_cache
+from .hashid import Hashid, CompositeHashid
 from .conf import settings
-from .validators import HashidMaxValueValidator, HashidMinValueValidator
+from .validators import HashidMaxValueValidator, HashidMinValueValidator, cleaned_hashid
+
 
+# The most Hashids each column of a query keeps to share between rows with the same value
+CONVERTER_CACHE_SIZE = 1000
 
+
+@lru_cache(maxsize=None)
 def _alphabet_unique_len(alphabet):
-    return len([x for i, x in enumerate(alphabet) if alphabet.index(x) == i])
+    return len(set(alphabet))
 
 
 class HashidFieldMixin(object):
+    hashid_class = Hashid
     default_error_messages = {
         'invalid': _("'%(value)s' value must be a positive integer or a valid Hashids string."),
         'invalid_hashid': _("'%(value)s' value must be a valid Hashids string."),
@@ -33,6 +48,7 @@ class HashidFieldMixin(object):
         'gte': HashidGreaterThanOrEqual,
         'lt': HashidLessThan,
         'lte': HashidLessThanOrEqual,
+        'range': HashidRangeLookup,
     }
 
     def __init__(self, salt=settings.HASHID_FIELD_SALT,
@@ -41,17 +57,35 @@ class HashidFieldMixin(object):
                  allow_int_lookup=settings.HASHID_FIELD_ALLOW_INT_LOOKUP,
                  enable_hashid_object=settings.HASHID_FIELD_ENABLE_HASHID_OBJECT,
                  enable_descriptor=settings.HASHID_FIELD_ENABLE_DESCRIPTOR,
-                 prefix="", *args, **kwargs):
+                 enable_interning=settings.HASHID_FIELD_ENABLE_INTERNING,
+                 negative_cache_size=settings.HASHID_FIELD_NEGATIVE_CACHE_SIZE,
+                 retired_salts=(), encoding_table=None, prefix="", *args, **kwargs):
         self.salt = salt
         self.min_length = min_length
         self.alphabet = alphabet
         if _alphabet_unique_len(self.alphabet) < 16:
             raise exceptions.ImproperlyConfigured("'alphabet' must contain a minimum of 16 unique characters")
-        self._hashids = Hashids(salt=self.salt, min_length=self.min_length, alphabet=self.alphabet)
         self.allow_int_lookup = allow_int_lookup
         self.enable_hashid_object = enable_hashid_object
         self.enable_descriptor = enable_descriptor
         self.prefix = prefix
+        self.enable_interning = enable_interning
+        self._prepared = threading.local()
+        self._hashid_options = {}
+        self.retired_salts = tuple(retired_salts)
+        self.encoding_table = encoding_table
+        self._retired_salt_hits = dict.fromkeys(self.retired_salts, 0)
+        self._retired_salt_hits_lock = threading.Lock()
+        if self.enable_interning:
+            self._intern_table = get_intern_table(self.salt, self.min_length, self.alphabet, self.prefix)
+        else:
+            self._intern_table = None
+        self.negative_cache_size = negative_cache_size
+        if self.negative_cache_size:
+            self.negative_cache = get_negative_cache(self.negative_cache_size, self.salt, self.min_length,
+                                                     self.alphabet, self.prefix, self.retired_salts)
+        else:
+            self.negative_cache = None
         super().__init__(*args, **kwargs)
 
     def deconstruct(self):
@@ -91,6 +125,23 @@ class HashidFieldMixin(object):
             ]
         return []
 
+    @cached_property
+    def _hashids(self):
+        # Built on first use rather than in __init__, since models rendered from migration states never encode anything
+        if self.encoding_table:
+            return make_mapped_hashids(self.encoding_table, self.salt, self.min_length, self.alphabet)
+        return make_hashids(self.salt, self.min_length, self.alphabet)
+
+    @cached_property
+    def _retired_hashids(self):
+        return [(salt, make_hashids(salt, self.min_length, self.alphabet)) for salt in self.retired_salts]
+
+    @property
+    def retired_salt_hits(self):
+        """Returns a dict of {salt: count} of how many values were only valid with each of the retired salts."""
+        with self._retired_salt_hits_lock:
+            return dict(self._retired_salt_hits)
+
     @cached_property
     def validators(self):
         if self.enable_hashid_object:
@@ -117,14 +168,113 @@ class HashidFieldMixin(object):
             return str(hashid)
 
     def get_hashid(self, id):
-        return Hashid(id, salt=self.salt, min_length=self.min_length, alphabet=self.alphabet,
-                      prefix=self.prefix, hashids=self._hashids)
+        if self._intern_table is None:
+            return self._make_hashid(id)
+        if type(id) is int:
+            hashid = self._intern_table.get(id)
+            if hashid is not None:
+                return hashid
+        hashid = self._make_hashid(id)
+        return self._intern_table.setdefault(hashid.id, hashid)
+
+    def _make_hashid(self, id):
+        negative_cache = self.negative_cache
+        if negative_cache is None or type(id) is not str:
+            return self._make_new_hashid(id)
+        if id in negative_cache:
+            if instrumentation.hooks:
+                instrumentation.emit(instrumentation.NEGATIVE_CACHE_HIT, instrumentation.get_label(self), value=id)
+            raise ValueError("value must be a positive integer or a valid Hashid string")
+        try:
+            return self._make_new_hashid(id)
+        except ValueError:
+            negative_cache.add(id)
+            raise
+
+    def _make_new_hashid(self, id):
+        if instrumentation.hooks:
+            return self._make_hashid_instrumented(id)
+        try:
+            return self._new_hashid(id)
+        except ValueError:
+            if self.retired_salts:
+                return self._make_hashid_from_retired(id)
+            raise
+
+    def _new_hashid(self, value, salt=None, hashids=None):
+        if hashids is None:
+            salt, hashids = self.salt, self._hashids
+        return Hashid(value, salt=salt, min_length=self.min_length, alphabet=self.alphabet, prefix=self.prefix,
+                      hashids=hashids)
+
+    def _make_hashid_from_retired(self, value):
+        """
+        Returns a Hashid in the current configuration for a hashid made with one of the retired salts, trying them in
+        order, or raises ValueError if it isn't valid for any of them.
+        """
+        if isinstance(value, str) and value.startswith(self.prefix):
+            hashid = value[len(self.prefix):]
+            # All of the retired salts share the alphabet, so if the characters are wrong for one they're wrong for all
+            if self._hashids.is_candidate(hashid):
+                for salt, hashids in self._retired_hashids:
+                    try:
+                        retired = self._new_hashid(value, salt=salt, hashids=hashids)
+                    except ValueError:
+                        continue
+                    with self._retired_salt_hits_lock:
+                        self._retired_salt_hits[salt] += 1
+                    return self._new_hashid(retired.id)
+        raise ValueError("value must be a positive integer or a valid Hashid string")
+
+    def _make_hashid_instrumented(self, id):
+        event = instrumentation.ENCODE if isinstance(id, int) else instrumentation.DECODE
+        start = perf_counter()
+        try:
+            try:
+                hashid = self._new_hashid(id)
+            except ValueError:
+                if not self.retired_salts:
+                    raise
+                hashid = self._make_hashid_from_retired(id)
+        except ValueError:
+            instrumentation.emit(instrumentation.DECODE_FAILED, instrumentation.get_label(self),
+                                 perf_counter() - start, id)
+            raise
+        instrumentation.emit(event, instrumentation.get_label(self), perf_counter() - start, id)
+        return hashid
 
     def from_db_value(self, value, expression, connection):
         if value is None:
             return value
         return self.encode_id(value)
 
+    def get_db_converters(self, connection):
+        # Django asks for the converters once per column of each compiled query, so swap our from_db_value for one that
+        # remembers what it has already encoded. Every row that references the same integer (e.g. the same author
+        # across a page of books, or the join keys of a prefetch_related batch) then shares a single Hashid instead of
+        # encoding again.
+        converters = super().get_db_converters(connection)
+        return [self._get_interning_converter() if converter == self.from_db_value else converter
+                for converter in converters]
+
+    def _get_interning_converter(self):
+        encoded = {}
+
+        def from_db_value(value, expression, connection):
+            if value is None:
+                return value
+            try:
+                return encoded[value]
+            except KeyError:
+                # Start again when it's full, so that iterating over a large queryset keeps a bounded amount in memory,
+                # even for a column like the primary key whose values never repeat
+                if len(encoded) >= CONVERTER_CACHE_SIZE:
+                    encoded.clear()
+                hashid = encoded[value] = self.encode_id(value)
+                return hashid
+        from_db_value.cache = encoded
+        return from_db_value
+
     def get_lookup(self, lookup_name):
         if lookup_name in self.exact_lookups:
             return HashidExactLookup
@@ -136,40 +286,122 @@ class HashidFieldMixin(object):
             return super().get_lookup(lookup_name)
         return None  # Otherwise, we don't allow lookups of this type
 
-    def to_python(self, value):
+    def _get_instance_hashid(self, model_instance, value):
+        """
+        Returns the Hashid that the descriptor already made for `value` on `model_instance`, if there is one, so that
+        cleaning and saving a value doesn't have to decode it again.
+        """
+        if isinstance(value, Hashid):
+            return value
+        if model_instance is None or not isinstance(value, str):
+            return None
+        hashid = model_instance.__dict__.get(self.attname + "_hashid")
+        if isinstance(hashid, Hashid) and str(hashid) == value:
+            return hashid
+        return None
+
+    def clean(self, value, model_instance):
+        hashid = self._get_instance_hashid(model_instance, value)
+        if hashid is None:
+            hashid = self._to_hashid(value)
+            if hashid is not None and model_instance is not None and not self.enable_hashid_object:
+                # Keep it where the descriptor would, so that pre_save() doesn't decode the cleaned string again
+                model_instance.__dict__[self.attname + "_hashid"] = hashid
+        value = hashid if hashid is None or self.enable_hashid_object else str(hashid)
+        self.validate(value, model_instance)
+        # Hand the Hashid to the min/max validators, which would otherwise decode the cleaned string again
+        token = cleaned_hashid.set(hashid)
+        try:
+            self.run_validators(value)
+        finally:
+            cleaned_hashid.reset(token)
+        return value
+
+    def _to_hashid(self, value):
         if isinstance(value, Hashid):
             return value
         if value is None:
             return value
         try:
-            hashid = self.encode_id(value)
+            return self.get_hashid(value)
         except ValueError:
             raise exceptions.ValidationError(
                 self.error_messages['invalid'],
                 code='invalid',
                 params={'value': value},
             )
-        return hashid
+
+    def to_python(self, value):
+        if isinstance(value, Hashid):
+            return value
+        hashid = self._to_hashid(value)
+        if hashid is None or self.enable_hashid_object:
+            return hashid
+        else:
+            return str(hashid)
 
     def get_prep_value(self, value):
         if value is None or value == '':
             return None
         if isinstance(value, Hashid):
             return value.id
+        if type(value) is int and value >= 0:
+            return value
+        prepared = getattr(self._prepared, 'hashids', None)
+        if prepared is not None:
+            hashid = prepared.get(value) if isinstance(value, str) else None
+            if hashid is not None:
+                return hashid.id
         try:
             hashid = self.get_hashid(value)
         except ValueError:
             raise ValueError(self.error_messages['invalid'] % {'value': value})
         return hashid.id
 
+    def get_prep_values(self, values):
+        """Returns get_prep_value() of each of the values, converting each distinct hashid string only once."""
+        values = list(values)
+        with self.prepared_values(values):
+            return [self.get_prep_value(value) for value in values]
+
+    @contextmanager
+    def prepared_values(self, values):
+        """
+        Converts all of the hashid strings among `values` at once, and has get_prep_value() use the results in this
+        thread until the block exits, so that code which prepares one value at a time, such as the queries built by
+        bulk_create() and bulk_update(), doesn't decode them one by one. Invalid strings are left for get_prep_value()
+        to reject as usual.
+        """
+        previous = getattr(self._prepared, 'hashids', None)
+        hashids = dict(previous) if previous else {}
+        invalid = set()
+        for value in values:
+            if isinstance(value, str) and value and value not in hashids and value not in invalid:
+                try:
+                    hashids[value] = self.get_hashid(value)
+                except ValueError:
+                    invalid.add(value)
+        self._prepared.hashids = hashids
+        try:
+            yield
+        finally:
+            self._prepared.hashids = previous
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        hashid = self._get_instance_hashid(model_instance, value)
+        return value if hashid is None else hashid
+
     def contribute_to_class(self, cls, name, **kwargs):
         super().contribute_to_class(cls, name, **kwargs)
         # if callable(self.prefix):
         #     self.prefix = self.prefix(field_instance=self, model_class=cls, field_name=name, **kwargs)
         if self.enable_descriptor:
             descriptor = HashidDescriptor(field_name=self.attname, salt=self.salt, min_length=self.min_length,
-                                          alphabet=self.alphabet, prefix=self.prefix, hashids=self._hashids,
-                                          enable_hashid_object=self.enable_hashid_object)
+                                          alphabet=self.alphabet, prefix=self.prefix,
+                                          enable_hashid_object=self.enable_hashid_object,
+                                          hashid_class=self.hashid_class, hashid_options=self._hashid_options,
+                                          get_hashids=lambda: self._hashids, get_hashid=self.get_hashid)
             setattr(cls, self.attname, descriptor)
 
 
@@ -214,15 +446,54 @@ class BigHashidAutoField(HashidFieldMixin, models.AutoField):
         super().__init__(min_length=min_length, *args, **kwargs)
 
 
-# Monkey patch Django REST Framework, if it's installed, to throw exceptions if fields aren't explicitly defined in
-# ModelSerializers. Not doing so can lead to hard-to-debug behavior.
-try:
-    from rest_framework.serializers import ModelSerializer
-    from hashid_field.rest import UnconfiguredHashidSerialField
+class ShardedHashidFieldMixin(object):
+    """
+    A Hashid*Field for IDs that embed a shard number in their upper bits, as `(shard << local_id_bits) | local_id`.
+    Values are CompositeHashids, whose hashids encode the shard and the local ID separately, so the shard can be read
+    from a hashid without touching any database. The column holds the combined integer.
+    """
+    hashid_class = CompositeHashid
+
+    def __init__(self, local_id_bits=48, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.local_id_bits = local_id_bits
+        self._hashid_options = {'local_id_bits': local_id_bits}
+        if self._intern_table is not None:
+            self._intern_table = get_intern_table(self.salt, self.min_length, self.alphabet, self.prefix,
+                                                  CompositeHashid, local_id_bits)
+        if self.negative_cache is not None:
+            self.negative_cache = get_negative_cache(self.negative_cache_size, self.salt, self.min_length,
+                                                     self.alphabet, self.prefix, self.retired_salts,
+                                                     CompositeHashid, local_id_bits)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['local_id_bits'] = self.local_id_bits
+        return name, path, args, kwargs
+
+    def _new_hashid(self, value, salt=None, hashids=None):
+        if hashids is None:
+            salt, hashids = self.salt, self._hashids
+        return CompositeHashid(value, salt=salt, min_length=self.min_length, alphabet=self.alphabet,
+                               prefix=self.prefix, hashids=hashids, local_id_bits=self.local_id_bits)
+
+    def get_shard(self, value):
+        """
+        Returns the shard number of a CompositeHashid, hashid string, integer ID or `(shard, local_id)` tuple, without
+        querying the database. Raises ValueError for anything that isn't valid for this field.
+        """
+        if isinstance(value, CompositeHashid):
+            return value.shard
+        if type(value) is int and value >= 0:
+            return value >> self.local_id_bits
+        if isinstance(value, tuple):
+            return CompositeHashid.pack(value, self.local_id_bits) >> self.local_id_bits
+        return self.get_hashid(value).shard
+
+
+class ShardedHashidField(ShardedHashidFieldMixin, BigHashidField):
+    description = "A Hashids obscured BigIntegerField with an embedded shard number"
+
 
-    ModelSerializer.serializer_field_mapping[HashidField] = UnconfiguredHashidSerialField
-    ModelSerializer.serializer_field_mapping[BigHashidField] = UnconfiguredHashidSerialField
-    ModelSerializer.serializer_field_mapping[HashidAutoField] = UnconfiguredHashidSerialField
-    ModelSerializer.serializer_field_mapping[BigHashidAutoField] = UnconfiguredHashidSerialField
-except ImportError:
-    pass
+class ShardedHashidAutoField(ShardedHashidFieldMixin, BigHashidAutoField):
+    description = "A Hashids obscured BigAutoField with an embedded shard number"
@@ -0,0 +1,123 @@
+from django import forms
+from django.db.models.constants import LOOKUP_SEP
+
+from django_filters import filters, filterset
+from django_filters.utils import get_model_field
+
+from .conf import settings
+from .field import HashidFieldMixin
+from .lookups import get_hashid_for_hashid_field, get_hashids_for_hashid_field
+
+
+def _get_hashid_field(field):
+    """Returns the Hashid*Field that holds the values of a model field or relation, or None if there isn't one."""
+    if isinstance(field, HashidFieldMixin):
+        return field
+    target_field = getattr(field, 'target_field', None) if getattr(field, 'is_relation', False) else None
+    return target_field if isinstance(target_field, HashidFieldMixin) else None
+
+
+class HashidFilterMixin(object):
+    """
+    Decodes the values of a filter with the configuration of the Hashid*Field it filters on, or the Hashid*Field that
+    the relation it filters on refers to, so that the lookup gets Hashids it doesn't have to decode again. As with
+    lookups on a Hashid*Field, invalid values match nothing, or raise ValueError if HASHID_FIELD_LOOKUP_EXCEPTION is
+    set.
+    """
+    field_class = forms.CharField
+
+    @property
+    def hashid_field(self):
+        if not hasattr(self, '_hashid_field'):
+            hashid_field = _get_hashid_field(get_model_field(self.model, self.field_name))
+            if hashid_field is None:
+                raise ValueError("'{}' isn't a Hashid*Field or a relation to one".format(self.field_name))
+            self._hashid_field = hashid_field
+        return self._hashid_field
+
+    def decode(self, value):
+        """Returns the Hashid for a value, or None if it isn't valid."""
+        try:
+            return get_hashid_for_hashid_field(self.hashid_field, value)
+        except ValueError:
+            if settings.HASHID_FIELD_LOOKUP_EXCEPTION:
+                raise
+            return None
+
+    def match_nothing(self, qs):
+        return qs if self.exclude else qs.none()
+
+    def get_lookup(self):
+        return LOOKUP_SEP.join((self.field_name, self.lookup_expr))
+
+
+class HashidFilter(HashidFilterMixin, filters.Filter):
+    """Filters on a single hashid."""
+    def filter(self, qs, value):
+        if value in filters.EMPTY_VALUES:
+            return qs
+        if self.distinct:
+            qs = qs.distinct()
+        hashid = self.decode(value)
+        if hashid is None:
+            return self.match_nothing(qs)
+        return self.get_method(qs)(**{self.get_lookup(): hashid})
+
+
+class HashidInFilter(HashidFilterMixin, filters.BaseInFilter, filters.Filter):
+    """Filters on a comma separated list of hashids, which are decoded in one batch."""
+    def filter(self, qs, value):
+        if value in filters.EMPTY_VALUES:
+            return qs
+        if self.distinct:
+            qs = qs.distinct()
+        hashids, invalid = get_hashids_for_hashid_field(self.hashid_field, value)
+        if invalid and settings.HASHID_FIELD_LOOKUP_EXCEPTION:
+            self.decode(invalid[0])  # Raises the same error as the lookup would
+        if not hashids:
+            return self.match_nothing(qs)
+        # Lookups take the ID straight from a Hashid, for relations too, so nothing is decoded again
+        return self.get_method(qs)(**{self.get_lookup(): list(hashids.values())})
+
+
+class HashidRangeFilter(HashidFilterMixin, filters.BaseRangeFilter, filters.Filter):
+    """Filters on a range of hashids given as "start,end", inclusive."""
+    def filter(self, qs, value):
+        if value in filters.EMPTY_VALUES:
+            return qs
+        if self.distinct:
+            qs = qs.distinct()
+        start, end = self.decode(value[0]), self.decode(value[1])
+        if start is None or end is None:
+            return self.match_nothing(qs)
+        if isinstance(get_model_field(self.model, self.field_name), HashidFieldMixin):
+            return self.get_method(qs)(**{self.get_lookup(): (start, end)})
+        # Relations don't have the range lookup, so compare with the bounds separately
+        return self.get_method(qs)(**{
+            LOOKUP_SEP.join((self.field_name, 'gte')): start,
+            LOOKUP_SEP.join((self.field_name, 'lte')): end,
+        })
+
+
+class HashidFilterSet(filterset.FilterSet):
+    """
+    A FilterSet that generates HashidFilter, HashidInFilter and HashidRangeFilter filters for Hashid*Fields and
+    relations to models with a Hashid*Field primary key, rather than the number or model choice filters they would
+    otherwise get.
+    """
+    hashid_filters = {
+        'in': HashidInFilter,
+        'range': HashidRangeFilter,
+        'exact': HashidFilter,
+        'iexact': HashidFilter,
+        'gt': HashidFilter,
+        'gte': HashidFilter,
+        'lt': HashidFilter,
+        'lte': HashidFilter,
+    }
+
+    @classmethod
+    def filter_for_lookup(cls, field, lookup_type):
+        if lookup_type in cls.hashid_filters and _get_hashid_field(field) is not None:
+            return cls.hashid_filters[lookup_type], {}
+        return super().filter_for_lookup(field, lookup_type)
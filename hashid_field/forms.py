@@ -0,0 +1,90 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.validators import ProhibitNullCharactersValidator
+
+from .hashid import Hashid
+from .lookups import get_hashids_for_hashid_field
+
+
+class HashidMultipleInput(forms.TextInput):
+    """
+    A text input for a comma separated list of hashids, for relations with too many possible choices to render them
+    all in a select.
+    """
+    separator = ","
+
+    def value_from_datadict(self, data, files, name):
+        getter = getattr(data, 'getlist', None)
+        if getter is not None:
+            chunks = getter(name)
+        else:
+            chunks = data.get(name) or []
+            if isinstance(chunks, str):
+                chunks = [chunks]
+        values = []
+        for chunk in chunks:
+            values.extend(value.strip() for value in str(chunk).split(self.separator) if value.strip())
+        return values
+
+    def value_omitted_from_data(self, data, files, name):
+        # An empty list is a valid submission, just like SelectMultiple
+        return False
+
+    def format_value(self, value):
+        if value is None or value == '':
+            return None
+        if isinstance(value, (list, tuple)):
+            return (self.separator + " ").join(str(v) for v in value)
+        return str(value)
+
+
+class HashidModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """
+    A ModelMultipleChoiceField for models whose primary key (or `to_field_name`) is a Hashid*Field. The submitted list
+    is converted in one batch, every invalid value is reported, and the choices are then fetched with a single query.
+    """
+    def _get_hashid_field(self):
+        from .field import HashidFieldMixin  # avoid circular import
+        opts = self.queryset.model._meta
+        field = opts.get_field(self.to_field_name) if self.to_field_name else opts.pk
+        return field if isinstance(field, HashidFieldMixin) else None
+
+    @staticmethod
+    def _get_id(field, obj):
+        value = getattr(obj, field.attname)
+        if not isinstance(value, Hashid):
+            # With enable_hashid_object=False the attribute is the string, and the descriptor keeps its Hashid as well
+            hashid = obj.__dict__.get(field.attname + "_hashid")
+            value = hashid if isinstance(hashid, Hashid) else field.get_hashid(value)
+        return value.id
+
+    def _check_values(self, value):
+        field = self._get_hashid_field()
+        if field is None:
+            return super()._check_values(value)
+        try:
+            values = list(dict.fromkeys(value))
+        except TypeError:
+            # list of lists isn't hashable, for example
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+        prohibit_null_characters = ProhibitNullCharactersValidator()
+        for val in values:
+            prohibit_null_characters(val)
+
+        hashids, invalid = get_hashids_for_hashid_field(field, values)
+        if invalid:
+            raise ValidationError([
+                ValidationError(self.error_messages['invalid_pk_value'], code='invalid_pk_value', params={'pk': val})
+                for val in invalid
+            ])
+
+        key = self.to_field_name or 'pk'
+        qs = self.queryset.filter(**{"%s__in" % key: list(hashids.values())})
+        found_ids = {self._get_id(field, obj) for obj in qs}
+        missing = [val for val, hashid in hashids.items() if hashid.id not in found_ids]
+        if missing:
+            raise ValidationError([
+                ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': val})
+                for val in missing
+            ])
+        return qs
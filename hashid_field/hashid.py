@@ -2,6 +2,8 @@ from functools import total_ordering
 
 from hashids import Hashids
 
+from .encoder import make_hashids
+
 
 def _is_uint(candidate):
     """Returns whether a value is an unsigned integer."""
@@ -23,7 +25,7 @@ class Hashid(object):
 
         # If hashids is provided, it's for optimization only, and should be initialized with the same salt, min_length
         # and alphabet, or else we will run into problems
-        self._hashids = hashids or Hashids(salt=self._salt, min_length=self._min_length, alphabet=self._alphabet)
+        self._hashids = hashids or make_hashids(self._salt, self._min_length, self._alphabet)
         if not self._valid_hashids_object():
             raise Exception("Invalid hashids.Hashids object")
 
@@ -49,8 +51,13 @@ class Hashid(object):
                 except (TypeError, ValueError):
                     raise ValueError("value must begin with prefix {}".format(self._prefix))
 
-            # Check if this string is a valid hashid, even if it's made up entirely of numbers
-            _id = self.decode(value)
+            # Check if this string is a valid hashid, even if it's made up entirely of numbers. A string with any
+            # character that can't appear in a hashid of this configuration (such as a number when the alphabet has no
+            # digits) is rejected by a table check without attempting to decode it.
+            if _is_str(value) and not self._is_candidate(value):
+                _id = None
+            else:
+                _id = self.decode(value)
             if _id is None:
                 # The given value is not a hashids string, so see if it's a valid string representation of an integer
                 try:
@@ -100,6 +107,10 @@ class Hashid(object):
         else:
             return None
 
+    def _is_candidate(self, hashid):
+        is_candidate = getattr(self._hashids, 'is_candidate', None)
+        return is_candidate is None or is_candidate(hashid)
+
     def _valid_hashids_object(self):
         # The hashids.Hashids class randomizes the alphabet and pulls out separators and guards, thus not being
         # reversible. So all we can test is that the length of the alphabet, separators and guards are equal to the
@@ -194,3 +205,62 @@ class Hashid(object):
 
     def __or__(self, other):
         return self._id | other
+
+
+class CompositeHashid(Hashid):
+    """
+    A Hashid for an ID that embeds a shard number in its upper bits, as `(shard << local_id_bits) | local_id`. The
+    hashid encodes `(shard, local_id)` as two numbers, so both can be read from it without a database round trip.
+
+    Besides everything Hashid accepts, `value` can be a `(shard, local_id)` tuple.
+    """
+    def __init__(self, value, salt="", min_length=0, alphabet=Hashids.ALPHABET, prefix="", hashids=None,
+                 local_id_bits=48):
+        self._local_id_bits = local_id_bits
+        if isinstance(value, tuple):
+            value = self.pack(value, local_id_bits)
+        super().__init__(value, salt=salt, min_length=min_length, alphabet=alphabet, prefix=prefix, hashids=hashids)
+
+    @staticmethod
+    def pack(value, local_id_bits):
+        """Returns the integer ID for a `(shard, local_id)` tuple."""
+        try:
+            shard, local_id = value
+        except (TypeError, ValueError):
+            raise ValueError("value must be a (shard, local_id) tuple")
+        if not _is_uint(shard) or not _is_uint(local_id):
+            raise ValueError("shard and local_id must be positive integers")
+        if local_id >> local_id_bits:
+            raise ValueError("local_id must be less than {}".format(1 << local_id_bits))
+        return (shard << local_id_bits) | local_id
+
+    @property
+    def shard(self):
+        return self._id >> self._local_id_bits
+
+    @property
+    def local_id(self):
+        return self._id & ((1 << self._local_id_bits) - 1)
+
+    @property
+    def local_id_bits(self):
+        return self._local_id_bits
+
+    def encode(self, id):
+        return self._hashids.encode(id >> self._local_id_bits, id & ((1 << self._local_id_bits) - 1))
+
+    def decode(self, hashid):
+        ret = self._hashids.decode(hashid)
+        if len(ret) == 2 and not ret[1] >> self._local_id_bits:
+            return (ret[0] << self._local_id_bits) | ret[1]
+        return None
+
+    def __repr__(self):
+        return "CompositeHashid({}, {}): {}".format(self.shard, self.local_id, str(self))
+
+    def __getstate__(self):
+        return super().__getstate__() + (self._local_id_bits,)
+
+    def __setstate__(self, state):
+        super().__setstate__(state[:-1])
+        self._local_id_bits = state[-1]
@@ -0,0 +1,227 @@
+import csv
+import json
+from collections import namedtuple
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+
+from .array import HashidArray
+from .lookups import get_hashid_for_hashid_field, get_hashids_for_hashid_field
+
+ImportResult = namedtuple('ImportResult', ['updated', 'created', 'rejected'])
+
+
+def read_csv(file):
+    """Yields a dict for each row of a CSV file with a header row, reading it a line at a time."""
+    return csv.DictReader(file)
+
+
+def read_ndjson(file):
+    """Yields a dict for each line of a newline delimited JSON file, reading it a line at a time."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+class CSVRejectsWriter(object):
+    """Writes rejected rows to a CSV file, with the reason in an extra 'error' column."""
+    def __init__(self, file, fieldnames):
+        self._writer = csv.DictWriter(file, fieldnames=list(fieldnames) + ['error'], extrasaction='ignore')
+        self._writer.writeheader()
+
+    def __call__(self, row, error):
+        self._writer.writerow(dict(row, error=error))
+
+
+class NDJSONRejectsWriter(object):
+    """Writes rejected rows to a newline delimited JSON file, with the reason in an extra 'error' key."""
+    def __init__(self, file):
+        self._file = file
+
+    def __call__(self, row, error):
+        self._file.write(json.dumps(dict(row, error=error)) + "\n")
+
+
+class HashidImporter(object):
+    """
+    Updates, and optionally creates, objects of `model` from a stream of rows, such as those from read_csv() or
+    read_ndjson(). Each row is a dict with the hashid of the object in the `key` column, which defaults to the primary
+    key, and a column for each of `fields` to set on it.
+
+    Rows are processed `batch_size` at a time, each batch in its own transaction. The hashids in each column for a
+    Hashid*Field, or a relation to one, are decoded together, the existing objects are fetched with one query, and
+    then saved with bulk_update() and bulk_create(). Only one batch is held in memory at a time, so memory use doesn't
+    depend on how many rows there are. A row with an invalid value, or whose object doesn't exist when `create` is
+    False, is passed to `rejects` with the reason, if given, and skipped.
+    """
+    def __init__(self, model, fields, key=None, create=False, batch_size=1000, using=None):
+        self.model = model
+        opts = model._meta
+        self.key_field = opts.pk if key in (None, 'pk') else opts.get_field(key)
+        self._check_hashid_field(self.key_field)
+        if not self.key_field.unique:
+            raise ValueError("The key field '{}' must be unique".format(self.key_field.name))
+        self.fields = [opts.get_field(name) for name in fields]
+        for field in self.fields:
+            if not field.concrete or field.many_to_many or field.primary_key:
+                raise ValueError("'{}' can't be imported, only concrete fields other than the primary key can".format(
+                    field.name))
+        self.create = create
+        self.batch_size = batch_size
+        self.using = using or router.db_for_write(model)
+
+    @staticmethod
+    def _check_hashid_field(field):
+        from .field import HashidFieldMixin  # avoid circular import
+        if not isinstance(field, HashidFieldMixin):
+            raise ValueError("'{}' is not a Hashid*Field".format(field.name))
+
+    @staticmethod
+    def _get_hashid_field(field):
+        """Returns the Hashid*Field that holds the values of `field`, if there is one."""
+        from .field import HashidFieldMixin  # avoid circular import
+        if isinstance(field, HashidFieldMixin):
+            return field
+        target_field = getattr(field, 'target_field', None) if field.is_relation else None
+        if isinstance(target_field, HashidFieldMixin):
+            return target_field
+        return None
+
+    def run(self, rows, rejects=None):
+        """Imports an iterable of rows, and returns an ImportResult of how many were updated, created and rejected."""
+        updated = created = rejected = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic(using=self.using):
+                batch_updated, batch_created, batch_rejected = self._import_batch(batch, rejects)
+            updated += batch_updated
+            created += batch_created
+            rejected += batch_rejected
+        return ImportResult(updated, created, rejected)
+
+    def _decode_columns(self, batch):
+        """
+        Decodes every Hashid*Field column of the batch at once, and returns a tuple of a dict of
+        {column: {value: Hashid}}, and a dict of {row index: error} for the rows with an invalid hashid.
+        """
+        decoded = {}
+        errors = {}
+        for field in [self.key_field] + self.fields:
+            hashid_field = self._get_hashid_field(field)
+            if hashid_field is None:
+                continue
+            values = [row.get(field.name) for row in batch]
+            error = "'{}' is not a valid hashid for '{}'"
+            # Values such as lists from NDJSON can't be looked up, so reject them before decoding the rest
+            unhashable = set()
+            for index, value in enumerate(values):
+                try:
+                    hash(value)
+                except TypeError:
+                    unhashable.add(index)
+                    errors.setdefault(index, error.format(value, field.name))
+            # Every row needs a key, but other columns may be empty
+            present = [value for index, value in enumerate(values) if index not in unhashable and (
+                field is self.key_field or value not in (None, ''))]
+            hashids, invalid = get_hashids_for_hashid_field(hashid_field, present)
+            decoded[field.name] = hashids
+            if invalid:
+                invalid = set(invalid)
+                for index, value in enumerate(values):
+                    if index not in errors and value in invalid:
+                        errors[index] = error.format(value, field.name)
+        return decoded, errors
+
+    def _import_batch(self, batch, rejects):
+        decoded, errors = self._decode_columns(batch)
+        key_ids = {hashid.id for hashid in decoded[self.key_field.name].values()}
+        manager = self.model._base_manager.db_manager(self.using)
+        lookup = {"{}__in".format(self.key_field.name): HashidArray(key_ids, self.key_field)}
+        existing = {}
+        if key_ids:
+            for obj in manager.filter(**lookup).only(self.key_field.name, *(field.name for field in self.fields)):
+                existing[get_hashid_for_hashid_field(self.key_field, getattr(obj, self.key_field.attname)).id] = obj
+
+        to_update = {}
+        to_create = {}
+        for index, row in enumerate(batch):
+            if index in errors:
+                continue
+            key_id = decoded[self.key_field.name][row.get(self.key_field.name)].id
+            obj = existing.get(key_id)
+            if obj is None:
+                if not self.create:
+                    errors[index] = "No {} with {} '{}'".format(
+                        self.model._meta.object_name, self.key_field.name, row.get(self.key_field.name))
+                    continue
+                obj = to_create.get(key_id) or self.model(**{self.key_field.attname: key_id})
+            try:
+                values = self._get_values(row, decoded)
+            except ValidationError as e:
+                errors[index] = "; ".join(e.messages)
+                continue
+            for attname, value in values.items():
+                setattr(obj, attname, value)
+            if key_id in existing:
+                to_update[key_id] = obj
+            else:
+                to_create[key_id] = obj
+
+        if to_update:
+            manager.bulk_update(to_update.values(), [field.name for field in self.fields])
+        if to_create:
+            manager.bulk_create(to_create.values())
+
+        if rejects is not None:
+            for index in sorted(errors):
+                rejects(batch[index], errors[index])
+        return len(to_update), len(to_create), len(errors)
+
+    def _get_values(self, row, decoded):
+        """Returns a dict of {attname: value} of the fields to set from a row, or raises ValidationError."""
+        values = {}
+        for field in self.fields:
+            value = row.get(field.name)
+            if value in (None, '') and not (value == '' and field.empty_strings_allowed):
+                if not field.null:
+                    raise ValidationError("'{}' is required".format(field.name))
+                value = None
+            elif field.name in decoded:
+                value = decoded[field.name][value]
+            else:
+                value = field.to_python(value)
+            values[field.attname] = value
+        return values
+
+
+def import_file(path, model, fields, format=None, rejects_path=None, **kwargs):
+    """
+    Imports a CSV or newline delimited JSON file with a HashidImporter, reading it a line at a time, and writes the
+    rejected rows to `rejects_path` in the same format, if given. The format is taken from the file extension if it
+    isn't given. Any other arguments are passed to HashidImporter.
+    """
+    if format is None:
+        format = 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+    if format not in READERS:
+        raise ValueError("Unknown format '{}', expected one of: {}".format(format, ", ".join(READERS)))
+    importer = HashidImporter(model, fields, **kwargs)
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = READERS[format](file)
+        if rejects_path is None:
+            return importer.run(rows)
+        with open(rejects_path, 'w', newline='', encoding='utf-8') as rejects_file:
+            if format == 'csv':
+                rejects = CSVRejectsWriter(rejects_file, rows.fieldnames or [])
+            else:
+                rejects = NDJSONRejectsWriter(rejects_file)
+            return importer.run(rows, rejects)
@@ -0,0 +1,97 @@
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+
+# Event names
+ENCODE = 'encode'
+DECODE = 'decode'
+DECODE_FAILED = 'decode_failed'
+NEGATIVE_CACHE_HIT = 'negative_cache_hit'
+INVALID_LOOKUP = 'invalid_lookup'
+EMPTY_RESULT = 'empty_result'
+DESCRIPTOR_SET = 'descriptor_set'
+
+HashidEvent = namedtuple('HashidEvent', ['name', 'label', 'duration', 'value'])
+
+# The list is replaced rather than mutated so that emit() never iterates over a list that is changing underneath it,
+# and so that checking `instrumentation.hooks` is all it costs when nothing is registered.
+hooks = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook):
+    """Registers a callable that will be called with a HashidEvent for every encode, decode, etc."""
+    global hooks
+    with _hooks_lock:
+        if hook not in hooks:
+            hooks = hooks + [hook]
+
+
+def remove_hook(hook):
+    global hooks
+    with _hooks_lock:
+        hooks = [h for h in hooks if h != hook]
+
+
+def emit(name, label, duration=None, value=None):
+    event = HashidEvent(name, label, duration, value)
+    for hook in hooks:
+        hook(event)
+
+
+def get_label(field):
+    """Returns 'app_label.Model.field' for a model field, or just the field name if it isn't bound to a model."""
+    model = getattr(field, 'model', None)
+    if model is None:
+        return getattr(field, 'name', None) or field.__class__.__name__
+    return "{}.{}".format(model._meta.label, field.name)
+
+
+class HashidStats(object):
+    """
+    A hook that keeps counters and timing histograms for each event name and field label, suitable for periodically
+    exporting to statsd, Prometheus, etc.
+    """
+    # Upper bounds, in seconds, of each histogram bucket. Anything slower lands in a final overflow bucket.
+    buckets = (0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01)
+
+    def __init__(self, buckets=None):
+        if buckets is not None:
+            self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __call__(self, event):
+        key = (event.name, event.label)
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+            if event.duration is not None:
+                self.durations[key] = self.durations.get(key, 0.0) + event.duration
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = [0] * (len(self.buckets) + 1)
+                histogram[bisect_left(self.buckets, event.duration)] += 1
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+            self.durations = {}
+            self.histograms = {}
+
+    def snapshot(self, reset=False):
+        """
+        Returns a dict of {(event_name, label): {'count': ..., 'duration': ..., 'histogram': [...]}}, where the
+        histogram has one count per bucket in `buckets` plus a final overflow bucket.
+        """
+        with self._lock:
+            snapshot = {
+                key: {
+                    'count': count,
+                    'duration': self.durations.get(key, 0.0),
+                    'histogram': list(self.histograms.get(key, ())),
+                }
+                for key, count in self.counts.items()
+            }
+        if reset:
+            self.reset()
+        return snapshot
@@ -0,0 +1,47 @@
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .hashid import Hashid
+
+
+def hashid_to_str(hashid):
+    # The same as str(hashid), without the call through __str__
+    return hashid._prefix + hashid._hashid
+
+
+def hashid_to_int(hashid):
+    return hashid._id
+
+
+def make_default(as_int=False, fallback=None):
+    """
+    Returns a `default` hook for json.dumps(), orjson.dumps(), ujson.dumps() and any other JSON library that takes one,
+    which serializes Hashids as their hashid string, or their integer ID if `as_int` is True. Anything else is passed to
+    `fallback`, if given, or raises TypeError.
+    """
+    convert = hashid_to_int if as_int else hashid_to_str
+
+    def default(obj):
+        if isinstance(obj, Hashid):
+            return convert(obj)
+        if fallback is not None:
+            return fallback(obj)
+        raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+    return default
+
+
+# For orjson.dumps(data, default=hashid_default), ujson.dumps(data, default=hashid_default) and so on
+hashid_default = make_default()
+hashid_int_default = make_default(as_int=True)
+
+
+class HashidJSONEncoder(DjangoJSONEncoder):
+    """
+    A DjangoJSONEncoder that also serializes Hashids, as their hashid string, or their integer ID if `hashid_as_int`
+    is True, so that the results of values() and values_list() can be passed to JsonResponse as they are.
+    """
+    hashid_as_int = False
+
+    def default(self, o):
+        if isinstance(o, Hashid):
+            return hashid_to_int(o) if self.hashid_as_int else hashid_to_str(o)
+        return super().default(o)
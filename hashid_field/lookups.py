@@ -1,10 +1,12 @@
 import itertools
 
 import django
-from django.db.models.lookups import Lookup, GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual
+from django.db.models.lookups import Lookup, GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual, Range
 from django.utils.datastructures import OrderedSet
 from django.core.exceptions import EmptyResultSet
 
+from . import instrumentation
+from .array import HashidArray
 from .hashid import Hashid
 from .conf import settings
 
@@ -20,8 +22,12 @@ def _is_int_representation(number):
 
 
 def get_id_for_hashid_field(field, value):
+    return get_hashid_for_hashid_field(field, value).id
+
+
+def get_hashid_for_hashid_field(field, value):
     if isinstance(value, Hashid):
-        return value.id
+        return value
     try:
         hashid = field.get_hashid(value)
     except ValueError:
@@ -36,7 +42,27 @@ def get_id_for_hashid_field(field, value):
         without_prefix = value[len(field.prefix):]
         if _is_int_representation(without_prefix) and without_prefix != hashid.hashid:
             raise ValueError(field.error_messages['invalid_hashid'] % {'value': value})
-    return hashid.id
+    return hashid
+
+
+def get_hashids_for_hashid_field(field, values):
+    """
+    Converts all of the given values for a lookup on `field` at once, following the same rules as a single lookup, and
+    converting each distinct value only once. Returns a tuple of a dict of {value: Hashid} for the valid values, and a
+    list of the invalid values in the order given.
+    """
+    hashids = {}
+    invalid = []
+    seen_invalid = set()
+    for value in values:
+        if value in hashids or value in seen_invalid:
+            continue
+        try:
+            hashids[value] = get_hashid_for_hashid_field(field, value)
+        except ValueError:
+            seen_invalid.add(value)
+            invalid.append(value)
+    return hashids, invalid
 
 
 # Most of this code is derived or copied from Django. (django/db/models/lookups.py)
@@ -63,10 +89,14 @@ class HashidFieldGetDbPrepValueMixin:
                     if settings.HASHID_FIELD_LOOKUP_EXCEPTION:
                         raise
                     # Ignore this value
-                    pass
+                    if instrumentation.hooks:
+                        instrumentation.emit(instrumentation.INVALID_LOOKUP, instrumentation.get_label(field),
+                                             value=val)
                 else:
                     lookup_ids.append(lookup_id)
             if len(lookup_ids) == 0:
+                if instrumentation.hooks:
+                    instrumentation.emit(instrumentation.EMPTY_RESULT, instrumentation.get_label(field), value=value)
                 raise EmptyResultSet
             return '%s', lookup_ids
         else:
@@ -75,6 +105,9 @@ class HashidFieldGetDbPrepValueMixin:
             except ValueError:
                 if settings.HASHID_FIELD_LOOKUP_EXCEPTION:
                     raise
+                if instrumentation.hooks:
+                    instrumentation.emit(instrumentation.INVALID_LOOKUP, instrumentation.get_label(field), value=value)
+                    instrumentation.emit(instrumentation.EMPTY_RESULT, instrumentation.get_label(field), value=value)
                 raise EmptyResultSet
             return '%s', [lookup_id]
 
@@ -111,6 +144,8 @@ class HashidIterableLookup(HashidExactLookup):
 
         if hasattr(self.rhs, 'resolve_expression'):
             return self.rhs
+        if isinstance(self.rhs, HashidArray):
+            return self.rhs
         prepared_values = []
         if hasattr(self.rhs, '_prepare'):
             # A subquery is like an iterable but its items shouldn't be
@@ -133,6 +168,12 @@ class HashidIterableLookup(HashidExactLookup):
             )
 
         if self.rhs_is_direct_value():
+            if isinstance(self.rhs, HashidArray):
+                # A HashidArray holds integer IDs, so there's nothing to decode or validate
+                ids = list(dict.fromkeys(self.rhs.ids))
+                if not ids:
+                    raise EmptyResultSet
+                return '(' + ', '.join(['%s'] * len(ids)) + ')', ids
             try:
                 rhs = OrderedSet(self.rhs)
             except TypeError:  # Unhashable items in self.rhs
@@ -188,3 +229,24 @@ class HashidLessThan(HashidFieldGetDbPrepValueMixin, LessThan):
 
 class HashidLessThanOrEqual(HashidFieldGetDbPrepValueMixin, LessThanOrEqual):
     prepare_rhs = False
+
+
+class HashidRangeLookup(HashidFieldGetDbPrepValueMixin, Range):
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        if not hasattr(self.rhs, 'resolve_expression') and any(hasattr(b, 'resolve_expression') for b in self.rhs):
+            # Keep the bounds as a plain list rather than letting Django wrap the other bound in a Value, so that
+            # get_db_prep_lookup() still converts it with the lookup rules, and the expression is compiled on its own
+            return list(self.rhs)
+        return super().get_prep_lookup()
+
+    def get_db_prep_lookup(self, value, connection):
+        # Convert each bound once, on its own, so that if either one is invalid the whole range matches nothing
+        params = []
+        for bound in value:
+            if hasattr(bound, 'resolve_expression'):
+                params.append(bound)
+            else:
+                params.extend(super().get_db_prep_lookup(bound, connection)[1])
+        return '%s', params
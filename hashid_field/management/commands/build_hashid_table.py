@@ -0,0 +1,47 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import BigIntegerField, Max, Min
+
+from hashid_field.field import HashidFieldMixin
+from hashid_field.hashid import Hashid
+from hashid_field.tables import build_encoding_table
+
+
+class Command(BaseCommand):
+    help = ("Precomputes the hashids of a range of IDs of a Hashid*Field into an encoding table, for use with the "
+            "field's `encoding_table` option.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('field', help="The field, as app_label.Model.field")
+        parser.add_argument('output', help="Where to write the encoding table")
+        parser.add_argument('--start', type=int, help="The first ID. Defaults to the smallest ID in the database.")
+        parser.add_argument('--end', type=int,
+                            help="The last ID, inclusive. Defaults to the largest ID in the database.")
+        parser.add_argument('--database', default='default', help="The database to read the range of IDs from.")
+
+    def handle(self, *args, **options):
+        try:
+            app_label, model_name, field_name = options['field'].split(".")
+            field = apps.get_model(app_label, model_name)._meta.get_field(field_name)
+        except (ValueError, LookupError) as e:
+            raise CommandError("'{}' is not a field: {}".format(options['field'], e))
+        if not isinstance(field, HashidFieldMixin) or field.hashid_class is not Hashid:
+            raise CommandError("'{}' is not a HashidField, BigHashidField, HashidAutoField or "
+                               "BigHashidAutoField".format(options['field']))
+
+        start, end = options['start'], options['end']
+        if start is None or end is None:
+            bounds = field.model._base_manager.using(options['database']).aggregate(
+                start=Min(field.attname, output_field=BigIntegerField()),
+                end=Max(field.attname, output_field=BigIntegerField()))
+            if bounds['start'] is None:
+                raise CommandError("There are no IDs in the database, so --start and --end are required")
+            start = bounds['start'] if start is None else start
+            end = bounds['end'] if end is None else end
+
+        try:
+            count = build_encoding_table(options['output'], field.salt, field.min_length, field.alphabet, start,
+                                         end + 1)
+        except ValueError as e:
+            raise CommandError(e)
+        self.stdout.write("Wrote {} hashids for IDs {} to {} to {}".format(count, start, end, options['output']))
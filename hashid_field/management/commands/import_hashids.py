@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.exceptions import FieldDoesNotExist
+
+from hashid_field.importer import READERS, import_file
+
+
+class Command(BaseCommand):
+    help = ("Updates, or creates, objects from a CSV or newline delimited JSON file of rows keyed by hashid, streaming "
+            "the file in batches.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="The model, as app_label.Model")
+        parser.add_argument('path', help="The file to import")
+        parser.add_argument('fields', nargs='+', help="The fields to set from the columns of the same name")
+        parser.add_argument('--key', help="The unique Hashid*Field column that identifies each object. Defaults to "
+                                          "the primary key.")
+        parser.add_argument('--format', choices=sorted(READERS), help="Defaults to ndjson for .ndjson and .jsonl "
+                                                                      "files, and csv otherwise.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="How many rows to save per transaction.")
+        parser.add_argument('--create', action='store_true', help="Create objects that don't exist yet.")
+        parser.add_argument('--rejects', help="Where to write the rows that couldn't be imported, with the reason.")
+        parser.add_argument('--database', help="The database to import into.")
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (ValueError, LookupError) as e:
+            raise CommandError("'{}' is not a model: {}".format(options['model'], e))
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        try:
+            result = import_file(options['path'], model, options['fields'], format=options['format'],
+                                 rejects_path=options['rejects'], key=options['key'], create=options['create'],
+                                 batch_size=options['batch_size'], using=options['database'])
+        except (ValueError, FieldDoesNotExist, OSError) as e:
+            raise CommandError(e)
+        self.stdout.write("Updated {}, created {} and rejected {} {}".format(
+            result.updated, result.created, result.rejected, model._meta.verbose_name_plural))
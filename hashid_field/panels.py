@@ -0,0 +1,64 @@
+from django.utils.html import format_html, format_html_join
+from django.utils.translation import gettext_lazy as _, ngettext
+from debug_toolbar.panels import Panel
+
+from .profiling import profile_hashids
+
+
+class HashidPanel(Panel):
+    """
+    A Django Debug Toolbar panel that lists every hashid conversion made during the request, grouped by field and call
+    site, along with any values that were encoded or decoded more than once.
+    """
+    title = _("Hashids")
+
+    @property
+    def nav_subtitle(self):
+        stats = self.get_stats()
+        if not stats:
+            return ""
+        count = len(stats['entries'])
+        return ngettext("%(count)d conversion in %(time).2fms", "%(count)d conversions in %(time).2fms", count) % {
+            'count': count, 'time': stats['total_time'] * 1000}
+
+    def process_request(self, request):
+        with profile_hashids() as self.profile:
+            return super().process_request(request)
+
+    def generate_stats(self, request, response):
+        profile = self.profile
+        self.record_stats({
+            'total_time': profile.total_time,
+            'entries': [
+                [entry.name, entry.label, str(entry.value), entry.duration, entry.site, entry.caller]
+                for entry in profile.entries
+            ],
+            'sites': [
+                [label, site, count, duration]
+                for (label, site), (count, duration) in sorted(profile.by_site().items(), key=str)
+            ],
+            'duplicates': [[name, label, str(value), count] for name, label, value, count in profile.duplicates()],
+        })
+
+    @property
+    def content(self):
+        stats = self.get_stats()
+        return format_html(
+            "<h4>{}</h4><table><thead><tr><th>Field</th><th>Site</th><th>Count</th><th>Time (ms)</th></tr></thead>"
+            "<tbody>{}</tbody></table>"
+            "<h4>{}</h4><table><thead><tr><th>Field</th><th>Event</th><th>Value</th><th>Count</th></tr></thead>"
+            "<tbody>{}</tbody></table>"
+            "<h4>{}</h4><table><thead><tr><th>Field</th><th>Event</th><th>Value</th><th>Site</th><th>Caller</th>"
+            "<th>Time (ms)</th></tr></thead><tbody>{}</tbody></table>",
+            _("By field and site"),
+            format_html_join("", "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+                             ((label, site, count, "{:.3f}".format(duration * 1000))
+                              for label, site, count, duration in stats['sites'])),
+            _("Duplicates"),
+            format_html_join("", "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+                             ((label, name, value, count) for name, label, value, count in stats['duplicates'])),
+            _("All conversions"),
+            format_html_join("", "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+                             ((label, name, value, site, caller, "{:.3f}".format(duration * 1000) if duration else "")
+                              for name, label, value, duration, site, caller in stats['entries'])),
+        )
@@ -0,0 +1,92 @@
+from collections import namedtuple
+
+from django.db.models import BigIntegerField, Count, ExpressionWrapper, F, Max, Min
+
+from .hashid import Hashid
+from .lookups import get_hashid_for_hashid_field
+
+Window = namedtuple('Window', ['start', 'end'])
+
+
+def _get_field(queryset, field_name):
+    from .field import HashidFieldMixin  # avoid circular import
+    opts = queryset.model._meta
+    field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+    if not isinstance(field, HashidFieldMixin):
+        raise ValueError("'{}' is not a Hashid*Field".format(field_name))
+    return field
+
+
+def _as_int(field_name):
+    return ExpressionWrapper(F(field_name), output_field=BigIntegerField())
+
+
+def _get_boundaries(queryset, field_name, count, sample_size):
+    """Returns the sorted integer IDs each window after the first starts at, and the lowest and highest IDs."""
+    stats = queryset.aggregate(rows=Count(field_name), low=Min(_as_int(field_name)), high=Max(_as_int(field_name)))
+    low, high, rows = stats['low'], stats['high'], stats['rows']
+    if not rows:
+        return [], None, None
+    if sample_size is None:
+        # Split the span of IDs evenly, which is balanced as long as the IDs don't have large gaps
+        # With integer arithmetic, since a float can't hold every ID above 2**53. The first `remainder` windows each
+        # get one more ID than the rest.
+        size, remainder = divmod(high - low + 1, count)
+        boundaries = [low + size * i + min(i, remainder) for i in range(1, count)]
+    else:
+        # Split at the quantiles of a sample of rows evenly spaced by their position in the ordered queryset, rather
+        # than by their IDs, which may all share a stride. Only the sampled rows at the edges of the windows are needed,
+        # so each of them is read on its own at its OFFSET, and at most count - 1 rows are fetched.
+        samples = min(sample_size, rows)
+        ordered = (queryset.annotate(_partition_id=_as_int(field_name))
+                   .order_by('_partition_id')
+                   .values_list('_partition_id', flat=True))
+        positions = sorted({rows * (samples * i // count) // samples for i in range(1, count)} - {0}) if samples else []
+        boundaries = [ordered[position] for position in positions]
+    return sorted({boundary for boundary in boundaries if low < boundary <= high}), low, high
+
+
+def partition(queryset, count, field_name='pk', sample_size=None):
+    """
+    Splits the rows of a queryset into at most `count` windows of its Hashid*Field `field_name`, and returns a list of
+    Windows of (start, end) hashid strings, inclusive. The windows cover every ID from the lowest to the highest, with
+    no gaps or overlaps, so they can be handed out to separate processes or task queues and read with iterate_window().
+
+    By default the windows split the span from the lowest ID to the highest evenly, which takes one query. If the IDs
+    have large gaps, give a `sample_size` to split at the quantiles of a sample of that many rows, evenly spaced by
+    their position, instead. That reads one row per window edge, with a query each.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    field = _get_field(queryset, field_name)
+    boundaries, low, high = _get_boundaries(queryset.order_by(), field_name, count, sample_size)
+    if low is None:
+        return []
+    starts = [low] + boundaries
+    ends = [boundary - 1 for boundary in boundaries] + [high]
+    return [Window(str(field.get_hashid(start)), str(field.get_hashid(end))) for start, end in zip(starts, ends)]
+
+
+def iterate_window(queryset, start, end, field_name='pk', chunk_size=1000):
+    """
+    Yields the objects of a queryset whose Hashid*Field `field_name` is from `start` to `end`, inclusive, in order.
+    Either bound may be None to leave that end open. The objects are fetched `chunk_size` at a time with keyset
+    pagination, so each query starts just after the last object of the one before, rather than at an OFFSET that
+    gets slower the further through the window it is.
+    """
+    field = _get_field(queryset, field_name)
+    if not field.unique:
+        raise ValueError("iterate_window()'s field_name must be a unique field but '{}' isn't.".format(field_name))
+    queryset = queryset.order_by(field_name)
+    if start is not None:
+        queryset = queryset.filter(**{"{}__gte".format(field_name): get_hashid_for_hashid_field(field, start)})
+    if end is not None:
+        queryset = queryset.filter(**{"{}__lte".format(field_name): get_hashid_for_hashid_field(field, end)})
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield from chunk
+        if len(chunk) < chunk_size:
+            break
+        last = getattr(chunk[-1], field.attname)
+        last = last if isinstance(last, Hashid) else field.get_hashid(last)
+        chunk = list(queryset.filter(**{"{}__gt".format(field_name): last})[:chunk_size])
@@ -0,0 +1,148 @@
+import logging
+import os
+import sys
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib.util import find_spec
+
+import django
+
+from . import instrumentation
+
+logger = logging.getLogger('hashid_field.profiling')
+
+ProfileEntry = namedtuple('ProfileEntry', ['name', 'label', 'value', 'duration', 'site', 'caller'])
+
+# Functions in this package that mark where a conversion was requested from, innermost first.
+_SITES = {
+    'from_db_value': 'from_db_value',
+    'get_id_for_hashid_field': 'lookup',
+    'get_hashid_for_hashid_field': 'lookup',
+    'get_hashids_for_hashid_field': 'lookup',
+    'get_db_prep_lookup': 'lookup',
+    'to_internal_value': 'serializer',
+    '__set__': 'descriptor',
+    'to_python': 'to_python',
+    'get_prep_value': 'get_prep_value',
+}
+_package_dir = os.path.dirname(os.path.abspath(__file__))
+_ignored_dirs = (_package_dir, os.path.dirname(os.path.abspath(django.__file__)))
+_rest_framework_spec = find_spec('rest_framework')
+if _rest_framework_spec is not None:
+    _ignored_dirs += tuple(_rest_framework_spec.submodule_search_locations)
+
+# Every profile active in the current context, outermost first, so that nested profiles each see the whole block
+_current_profiles = ContextVar('hashid_profiles', default=())
+# The recording hook is only registered while at least one profile is active, so it costs nothing otherwise.
+_active_profiles = 0
+_active_profiles_lock = threading.Lock()
+
+
+def _get_call_site():
+    """Returns the internal site and the first frame outside of this package, Django and DRF that caused an event."""
+    site = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_package_dir):
+            if site is None:
+                site = _SITES.get(code.co_name)
+        elif not code.co_filename.startswith(_ignored_dirs):
+            return site, "{}:{} in {}".format(code.co_filename, frame.f_lineno, code.co_name)
+        frame = frame.f_back
+    return site, None
+
+
+def _record(event):
+    profiles = _current_profiles.get()
+    if profiles:
+        site, caller = _get_call_site()
+        entry = ProfileEntry(event.name, event.label, event.value, event.duration, site, caller)
+        for profile in profiles:
+            profile.entries.append(entry)
+
+
+class HashidProfile(object):
+    """Every hashid conversion recorded while the profile was active."""
+    conversions = (instrumentation.ENCODE, instrumentation.DECODE, instrumentation.DECODE_FAILED)
+
+    def __init__(self):
+        self.entries = []
+
+    @property
+    def total_time(self):
+        return sum(entry.duration for entry in self.entries if entry.duration is not None)
+
+    def duplicates(self):
+        """
+        Returns a list of (name, label, value, count) for every value that was encoded or decoded more than once,
+        most repeated first.
+        """
+        counts = {}
+        for entry in self.entries:
+            if entry.name in self.conversions:
+                key = (entry.name, entry.label, entry.value)
+                try:
+                    counts[key] = counts.get(key, 0) + 1
+                except TypeError:  # Unhashable value that failed to decode
+                    pass
+        duplicates = [key + (count,) for key, count in counts.items() if count > 1]
+        return sorted(duplicates, key=lambda duplicate: -duplicate[3])
+
+    def by_site(self):
+        """Returns a dict of {(label, site): (count, duration)}."""
+        sites = {}
+        for entry in self.entries:
+            key = (entry.label, entry.site)
+            count, duration = sites.get(key, (0, 0.0))
+            sites[key] = (count + 1, duration + (entry.duration or 0.0))
+        return sites
+
+
+@contextmanager
+def profile_hashids():
+    """
+    Records every hashid conversion in the block into the HashidProfile that is yielded. Profiles can be nested, such
+    as the debug toolbar panel around the middleware, and each of them records everything in its own block.
+    """
+    global _active_profiles
+    with _active_profiles_lock:
+        _active_profiles += 1
+        instrumentation.add_hook(_record)
+    profile = HashidProfile()
+    token = _current_profiles.set(_current_profiles.get() + (profile,))
+    try:
+        yield profile
+    finally:
+        _current_profiles.reset(token)
+        with _active_profiles_lock:
+            _active_profiles -= 1
+            if _active_profiles == 0:
+                instrumentation.remove_hook(_record)
+
+
+class HashidProfilerMiddleware(object):
+    """
+    Records every hashid conversion made during a request, attaches the HashidProfile to the request as
+    `request.hashid_profile`, logs a summary to the 'hashid_field.profiling' logger, warning about values that were
+    converted more than once, and adds an X-Hashid-Conversions header to the response.
+
+    This has a real cost on every request, so only enable it in development or staging.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_hashids() as profile:
+            request.hashid_profile = profile
+            response = self.get_response(request)
+        duplicates = profile.duplicates()
+        response['X-Hashid-Conversions'] = "{}; duplicates={}; time={:.3f}ms".format(
+            len(profile.entries), len(duplicates), profile.total_time * 1000)
+        logger.info("%s %s: %d hashid conversions in %.3fms", request.method, request.path, len(profile.entries),
+                    profile.total_time * 1000)
+        for name, label, value, count in duplicates:
+            logger.warning("%s %s: %s %s %r %d times", request.method, request.path, label, name, value, count)
+        return response
@@ -0,0 +1,110 @@
+from contextlib import ExitStack
+
+from django.db import connections, models
+
+from .array import HashidArray
+from .hashid import Hashid
+from .conf import settings
+from .lookups import get_hashid_for_hashid_field, get_hashids_for_hashid_field
+
+
+class HashidQuerySet(models.QuerySet):
+    """A QuerySet with methods for looking up objects by hashid in bulk."""
+    def in_bulk_hashids(self, values, field_name='pk', missing=None, batch_size=None):
+        """
+        Returns a dict of {value: object} for each of the given hashids, or `missing` for values that are invalid or
+        have no matching object. Unlike `in_bulk()`, the keys are the values exactly as given, so there is no need to
+        re-encode the results to match them up. Every distinct value is decoded once, and the objects are fetched with
+        `IN` queries of at most `batch_size` IDs, which defaults to the most the database allows in one query.
+        """
+        from .field import HashidFieldMixin  # avoid circular import
+        if self.query.is_sliced:
+            raise TypeError("Cannot use 'limit' or 'offset' with in_bulk_hashids().")
+        opts = self.model._meta
+        field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+        if not isinstance(field, HashidFieldMixin):
+            raise ValueError("in_bulk_hashids()'s field_name must be a Hashid*Field, not '{}'.".format(field_name))
+        if not field.unique and field_name not in self._get_unique_field_names():
+            raise ValueError("in_bulk_hashids()'s field_name must be a unique field but '{}' isn't.".format(field_name))
+
+        values = list(values)
+        hashids, _invalid = get_hashids_for_hashid_field(field, values)
+        ids = list(dict.fromkeys(hashid.id for hashid in hashids.values()))
+        if batch_size is None:
+            batch_size = connections[self.db].features.max_query_params or len(ids)
+        batch_size = max(batch_size, 1)
+        by_id = {}
+        for start in range(0, len(ids), batch_size):
+            # The IDs are already decoded, so a HashidArray passes them to the lookup without converting them again
+            batch = HashidArray(ids[start:start + batch_size], field)
+            for obj in self.filter(**{"{}__in".format(field_name): batch}).order_by():
+                value = getattr(obj, field.attname)
+                if not isinstance(value, Hashid):
+                    # With enable_hashid_object=False the attribute is the string, and the descriptor keeps its Hashid
+                    hashid = obj.__dict__.get(field.attname + "_hashid")
+                    value = hashid if isinstance(hashid, Hashid) else field.get_hashid(value)
+                by_id[value.id] = obj
+        result = {}
+        for value in values:
+            hashid = hashids.get(value)
+            result[value] = missing if hashid is None else by_id.get(hashid.id, missing)
+        return result
+
+    def between(self, start, end, field_name='pk'):
+        """
+        Returns the objects whose Hashid*Field `field_name` is from `start` to `end`, inclusive, with a single BETWEEN.
+        The bounds are converted to Hashids once, here, so the query can be run many times without decoding them again.
+        Either bound may be None to leave that end of the range open. If a bound is invalid, nothing matches, or a
+        ValueError is raised if HASHID_FIELD_LOOKUP_EXCEPTION is set.
+        """
+        opts = self.model._meta
+        field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+        try:
+            start, end = [None if bound is None else get_hashid_for_hashid_field(field, bound)
+                          for bound in (start, end)]
+        except ValueError:
+            if settings.HASHID_FIELD_LOOKUP_EXCEPTION:
+                raise
+            return self.none()
+        if start is None and end is None:
+            return self._chain()
+        if start is None:
+            return self.filter(**{"{}__lte".format(field_name): end})
+        if end is None:
+            return self.filter(**{"{}__gte".format(field_name): start})
+        return self.filter(**{"{}__range".format(field_name): (start, end)})
+
+    def _prepare_hashid_values(self, objs, fields):
+        """
+        Returns an ExitStack that has each of the Hashid*Fields among `fields`, or that they refer to, convert the
+        hashid strings the objects hold for them in one batch, rather than one at a time as the queries are built.
+        """
+        from .field import HashidFieldMixin  # avoid circular import
+        stack = ExitStack()
+        for field in fields:
+            hashid_field = field if isinstance(field, HashidFieldMixin) else getattr(field, 'target_field', None)
+            if not field.concrete or not isinstance(hashid_field, HashidFieldMixin):
+                continue
+            values = [getattr(obj, field.attname) for obj in objs]
+            if any(isinstance(value, str) for value in values):
+                stack.enter_context(hashid_field.prepared_values(values))
+        return stack
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with self._prepare_hashid_values(objs, self.model._meta.concrete_fields):
+            return super().bulk_create(objs, *args, **kwargs)
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        with self._prepare_hashid_values(objs, [self.model._meta.get_field(name) for name in fields]):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+    bulk_update.alters_data = True
+
+    def _get_unique_field_names(self):
+        return {
+            constraint.fields[0]
+            for constraint in self.model._meta.total_unique_constraints
+            if len(constraint.fields) == 1
+        }
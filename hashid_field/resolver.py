@@ -0,0 +1,119 @@
+import operator
+from functools import reduce
+
+from django.db.models import Q
+
+from .array import HashidArray
+from .lookups import get_hashid_for_hashid_field
+
+
+class _Node(object):
+    __slots__ = ('children', 'fields')
+
+    def __init__(self):
+        self.children = {}
+        self.fields = []
+
+
+class PrefixRegistry(object):
+    """
+    Maps hashid prefixes to the model fields that use them, as a trie, so that the field for a prefixed hashid can be
+    found from the hashid alone. `registry` is populated with every concrete Hashid*Field that has a prefix when the
+    hashid_field app is ready.
+    """
+    def __init__(self):
+        self._root = _Node()
+
+    def register(self, model, field):
+        """Registers a Hashid*Field of `model`, by its prefix, which must be a non-empty string."""
+        if not isinstance(field.prefix, str) or not field.prefix:
+            raise ValueError("Only fields with a prefix can be registered, '{}.{}' has none".format(
+                model._meta.label, field.name))
+        node = self._root
+        for char in field.prefix:
+            node = node.children.setdefault(char, _Node())
+        if (model, field) not in node.fields:
+            node.fields.append((model, field))
+
+    def populate(self, models):
+        """Registers every local, concrete Hashid*Field of the given models that has a prefix."""
+        from .field import HashidFieldMixin  # avoid circular import
+        for model in models:
+            for field in model._meta.local_concrete_fields:
+                if isinstance(field, HashidFieldMixin) and isinstance(field.prefix, str) and field.prefix:
+                    self.register(model, field)
+
+    def clear(self):
+        self._root = _Node()
+
+    def get_fields(self, value):
+        """Returns a list of (model, field) whose prefix `value` starts with, the longest prefix first."""
+        matches = []
+        node = self._root
+        for char in value:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.fields:
+                matches.append(node.fields)
+        return [entry for fields in reversed(matches) for entry in fields]
+
+    def get_hashid(self, value):
+        """
+        Returns a tuple of (model, field, Hashid) for the first registered field that `value` is a valid hashid for, or
+        None if there isn't one.
+        """
+        if not isinstance(value, str):
+            return None
+        for model, field in self.get_fields(value):
+            # Skip the fields the value can't be a hashid for without decoding it
+            is_candidate = getattr(field._hashids, 'is_candidate', None)
+            if is_candidate is not None and not is_candidate(value[len(field.prefix):]):
+                continue
+            try:
+                return model, field, get_hashid_for_hashid_field(field, value)
+            except ValueError:
+                continue
+        return None
+
+    def resolve_many(self, values, missing=None):
+        """
+        Returns the objects for a list of prefixed hashids, which may be for any of the registered models, in the same
+        order as `values`. Values that don't match a registered prefix, or have no matching object, are `missing`. The
+        values are grouped by field and decoded once each, and each model is queried once for all of its fields. If a
+        field isn't unique and several objects match a value, the one with the lowest primary key is used.
+        """
+        values = list(values)
+        by_model = {}  # {model: {field: {value: Hashid}}}
+        for value in dict.fromkeys(value for value in values if isinstance(value, str)):
+            found = self.get_hashid(value)
+            if found is not None:
+                model, field, hashid = found
+                by_model.setdefault(model, {}).setdefault(field, {})[value] = hashid
+
+        objects = {}  # {value: object}
+        for model, fields in by_model.items():
+            queries = [
+                Q(**{"{}__in".format(field.name): HashidArray({h.id for h in hashids.values()}, field)})
+                for field, hashids in fields.items()
+            ]
+            found_by_field = {field: {} for field in fields}
+            for obj in model._default_manager.filter(reduce(operator.or_, queries)).order_by('pk'):
+                for field, found in found_by_field.items():
+                    hashid = getattr(obj, field.attname)
+                    if hashid is not None:
+                        found.setdefault(get_hashid_for_hashid_field(field, hashid).id, obj)
+            for field, hashids in fields.items():
+                found = found_by_field[field]
+                for value, hashid in hashids.items():
+                    if hashid.id in found:
+                        objects[value] = found[hashid.id]
+        return [objects.get(value, missing) if isinstance(value, str) else missing for value in values]
+
+
+registry = PrefixRegistry()
+
+
+def resolve_many(values, missing=None):
+    """Returns the objects for a list of prefixed hashids for any model, in order. See PrefixRegistry.resolve_many()."""
+    return registry.resolve_many(values, missing=missing)
@@ -1,12 +1,18 @@
+from time import perf_counter
+
 from django.apps import apps
 from django.core import exceptions
 from django.utils.translation import gettext_lazy as _
 
-from hashids import Hashids
 from rest_framework import fields
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
 
+from hashid_field import instrumentation
 from hashid_field.conf import settings
+from hashid_field.encoder import make_hashids
 from hashid_field.hashid import Hashid
+from hashid_field.json import hashid_to_int, hashid_to_str
 from hashid_field.lookups import _is_int_representation
 
 
@@ -32,6 +38,10 @@ class HashidSerializerMixin(object):
         self.allow_int_lookup = kwargs.pop('allow_int_lookup', settings.HASHID_FIELD_ALLOW_INT_LOOKUP)
         self.prefix = kwargs.pop('prefix', "")
         self._hashids = kwargs.pop('hashids', None)
+        self._instrumentation_label = None
+        self._retired_source_field = None
+        self._hashid_class = Hashid
+        self._hashid_options = {}
 
         source_field = kwargs.pop('source_field', None)
         if source_field:
@@ -51,19 +61,46 @@ class HashidSerializerMixin(object):
             self.allow_int_lookup = source_field.allow_int_lookup
             self.prefix = source_field.prefix
             self._hashids =source_field._hashids
+            self._instrumentation_label = instrumentation.get_label(source_field)
+            self._hashid_class = source_field.hashid_class
+            self._hashid_options = source_field._hashid_options
+            if source_field.retired_salts:
+                self._retired_source_field = source_field
         if not self._hashids:
-            self._hashids = Hashids(salt=self.hashid_salt, min_length=self.hashid_min_length,
-                                    alphabet=self.hashid_alphabet)
+            self._hashids = make_hashids(self.hashid_salt, self.hashid_min_length, self.hashid_alphabet)
         super().__init__(**kwargs)
 
     def to_internal_value(self, data):
         value = super().to_internal_value(data)
+        if instrumentation.hooks:
+            return self._to_hashid_instrumented(value, data)
         try:
-            return Hashid(value, salt=self.hashid_salt, min_length=self.hashid_min_length,
-                          alphabet=self.hashid_alphabet, prefix=self.prefix, hashids=self._hashids)
+            return self._to_hashid(value)
         except ValueError:
             self.fail('invalid_hashid', value=data)
 
+    def _to_hashid(self, value):
+        try:
+            return self._hashid_class(value, salt=self.hashid_salt, min_length=self.hashid_min_length,
+                                      alphabet=self.hashid_alphabet, prefix=self.prefix, hashids=self._hashids,
+                                      **self._hashid_options)
+        except ValueError:
+            if self._retired_source_field is None:
+                raise
+            return self._retired_source_field._make_hashid_from_retired(value)
+
+    def _to_hashid_instrumented(self, value, data):
+        label = self._instrumentation_label or "{}.{}".format(self.parent.__class__.__name__, self.field_name)
+        event = instrumentation.ENCODE if isinstance(value, int) else instrumentation.DECODE
+        start = perf_counter()
+        try:
+            hashid = self._to_hashid(value)
+        except ValueError:
+            instrumentation.emit(instrumentation.DECODE_FAILED, label, perf_counter() - start, value)
+            self.fail('invalid_hashid', value=data)
+        instrumentation.emit(event, label, perf_counter() - start, value)
+        return hashid
+
 
 class HashidSerializerCharField(HashidSerializerMixin, fields.CharField):
     def to_representation(self, value):
@@ -86,3 +123,33 @@ class HashidSerializerIntegerField(HashidSerializerMixin, fields.IntegerField):
     def to_representation(self, value):
         return int(value)
 
+
+class HashidJSONEncoder(JSONEncoder):
+    """DRF's JSONEncoder, which also serializes Hashids, as strings, or integers if `hashid_as_int` is True."""
+    hashid_as_int = False
+
+    def default(self, obj):
+        if isinstance(obj, Hashid):
+            return hashid_to_int(obj) if self.hashid_as_int else hashid_to_str(obj)
+        return super().default(obj)
+
+
+class HashidJSONRenderer(JSONRenderer):
+    """A JSONRenderer for responses that hold Hashids that haven't been through a serializer field."""
+    encoder_class = HashidJSONEncoder
+
+
+def register_model_serializer_fields():
+    """
+    Patches Django REST Framework's ModelSerializer to throw exceptions if Hashid*Fields aren't explicitly declared.
+    Not doing so can lead to hard-to-debug behavior. This happens when this module is first imported, and when Django
+    starts if `hashid_field` is in INSTALLED_APPS, so that importing models never has to import DRF.
+    """
+    from rest_framework.serializers import ModelSerializer
+    from hashid_field import HashidField, BigHashidField, HashidAutoField, BigHashidAutoField
+
+    for field_class in (HashidField, BigHashidField, HashidAutoField, BigHashidAutoField):
+        ModelSerializer.serializer_field_mapping[field_class] = UnconfiguredHashidSerialField
+
+
+register_model_serializer_fields()
@@ -0,0 +1,231 @@
+from bisect import bisect_right
+from collections import Counter
+from itertools import chain
+
+from django.db import router
+from django.db.models.sql.where import AND
+
+from .conf import settings
+from .lookups import HashidExactLookup, HashidIterableLookup, get_hashid_for_hashid_field
+from .query import HashidQuerySet
+
+
+class ShardMapping(object):
+    """Maps the Hashid of a primary key to the alias of the database that holds the row."""
+    def get_alias(self, hashid):
+        raise NotImplementedError("Subclasses of ShardMapping must provide a get_alias() method")
+
+
+class RangeShards(ShardMapping):
+    """
+    Routes by ranges of the integer ID. `ranges` is a list of `(upper_bound, alias)` where `upper_bound` is exclusive,
+    in any order, so `[(1_000_000, 'default'), (2_000_000, 'shard1')]` puts IDs below one million on 'default'. IDs
+    beyond the last bound aren't routed.
+    """
+    def __init__(self, ranges):
+        ranges = sorted(ranges, key=lambda r: r[0])
+        self.bounds = [bound for bound, alias in ranges]
+        self.aliases = [alias for bound, alias in ranges]
+
+    def get_alias(self, hashid):
+        index = bisect_right(self.bounds, hashid.id)
+        return self.aliases[index] if index < len(self.aliases) else None
+
+
+class ModuloShards(ShardMapping):
+    """Routes ID `n` to `aliases[n % len(aliases)]`."""
+    def __init__(self, aliases):
+        self.aliases = list(aliases)
+
+    def get_alias(self, hashid):
+        return self.aliases[hashid.id % len(self.aliases)]
+
+
+class EmbeddedShards(ShardMapping):
+    """
+    Routes the CompositeHashids of a Sharded*HashidField by their embedded shard number. `aliases` is either a dict of
+    {shard: alias} or a format string such as "shard_{}".
+    """
+    def __init__(self, aliases):
+        self.aliases = aliases
+
+    def get_alias(self, hashid):
+        shard = hashid.shard
+        if isinstance(self.aliases, str):
+            return self.aliases.format(shard)
+        return self.aliases.get(shard)
+
+
+def get_shard_mapping(model):
+    """Returns the ShardMapping for a model from settings.HASHID_FIELD_SHARDS, or None if it isn't sharded."""
+    return settings.HASHID_FIELD_SHARDS.get(model._meta.label)
+
+
+class HashidShardRouter(object):
+    """
+    A database router for models listed in settings.HASHID_FIELD_SHARDS. Instances are routed by their primary key,
+    and anything related to an instance goes to the database the instance came from. Querysets can only be routed by
+    the values they look up if they are ShardedQuerySets, since routers never see the query itself.
+    """
+    def _db_for_model(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is None:
+            return None
+        mapping = get_shard_mapping(model)
+        if mapping is not None and isinstance(instance, model) and instance.pk is not None:
+            try:
+                hashid = get_hashid_for_hashid_field(model._meta.pk, instance.pk)
+            except ValueError:
+                return None
+            return mapping.get_alias(hashid)
+        return instance._state.db
+
+    db_for_read = _db_for_model
+    db_for_write = _db_for_model
+
+
+class ShardedQuerySet(HashidQuerySet):
+    """
+    A QuerySet for a model listed in settings.HASHID_FIELD_SHARDS, which picks the database from the hashids it looks
+    up. A query filtered by `pk=...` runs on the shard that holds that row, and a query filtered by `pk__in=[...]` is
+    split by shard and run once on each of them, with the results concatenated in shard order. Calling `using()`
+    turns this off.
+
+    Ordering applies within each shard, so it is only exact when all of the IDs are on one shard. Slicing applies to
+    the concatenated results, with each shard only asked for the rows the slice can still reach.
+    """
+    def _get_shard_routing(self):
+        """
+        Returns a tuple of (index, lookup, {alias: [Hashid, ...]}) for the first top-level exact or `in` lookup on the
+        primary key, or None if the query can't be routed by it.
+        """
+        mapping = get_shard_mapping(self.model)
+        where = self.query.where
+        if mapping is None or where.connector != AND or where.negated:
+            return None
+        field = self.model._meta.pk
+        for index, lookup in enumerate(where.children):
+            if not isinstance(lookup, HashidExactLookup):
+                continue
+            lhs = lookup.lhs
+            if getattr(lhs, 'target', None) is not field or getattr(lhs, 'alias', None) != self.query.base_table:
+                continue
+            values = lookup.rhs if isinstance(lookup, HashidIterableLookup) else [lookup.rhs]
+            if hasattr(values, 'resolve_expression'):
+                return None
+            by_alias = {}
+            for value in values:
+                if hasattr(value, 'resolve_expression'):
+                    return None
+                try:
+                    hashid = get_hashid_for_hashid_field(field, value)
+                except ValueError:
+                    continue  # The lookup ignores invalid values, so don't route them anywhere
+                alias = mapping.get_alias(hashid)
+                if alias is None:
+                    return None
+                by_alias.setdefault(alias, []).append(hashid)
+            return index, lookup, by_alias
+        return None
+
+    def _get_shard_querysets(self):
+        """Returns a list of querysets, one per shard, or None if this queryset isn't split across shards."""
+        if self._db is not None:
+            return None
+        routing = self._get_shard_routing()
+        if routing is None:
+            return None
+        index, lookup, by_alias = routing
+        if len(by_alias) == 1:
+            return None  # The db property already sends a single shard to the right place
+        querysets = []
+        for alias, hashids in by_alias.items():
+            clone = self._chain()
+            clone.query.where.children[index] = HashidIterableLookup(lookup.lhs, hashids)
+            clone._db = alias
+            querysets.append(clone)
+        return querysets
+
+    def _fetch_sliced(self, querysets):
+        """Returns the slice of the concatenated results of the shard querysets that this queryset's slice asks for."""
+        low, high = self.query.low_mark, self.query.high_mark
+        results = []
+        for queryset in querysets:
+            queryset.query.clear_limits()
+            if high is not None:
+                if len(results) >= high:
+                    break
+                queryset.query.set_limits(high=high - len(results))
+            results.extend(queryset)
+        return results[low:high]
+
+    def create(self, **kwargs):
+        # QuerySet.create() saves to self.db, which can't know the shard before there's an instance to route
+        if self._db is None:
+            return self.using(router.db_for_write(self.model, instance=self.model(**kwargs))).create(**kwargs)
+        return super().create(**kwargs)
+
+    @property
+    def db(self):
+        if self._db is None:
+            routing = self._get_shard_routing()
+            if routing is not None and len(routing[2]) == 1:
+                return next(iter(routing[2]))
+        return super().db
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            querysets = self._get_shard_querysets()
+            if querysets is not None:
+                if self.query.is_sliced:
+                    self._result_cache = self._fetch_sliced(querysets)
+                else:
+                    self._result_cache = list(chain.from_iterable(querysets))
+                if self._prefetch_related_lookups and not self._prefetch_done:
+                    self._prefetch_related_objects()
+                return
+        super()._fetch_all()
+
+    def iterator(self, *args, **kwargs):
+        querysets = self._get_shard_querysets()
+        if querysets is None:
+            return super().iterator(*args, **kwargs)
+        if self.query.is_sliced:
+            return iter(self._fetch_sliced(querysets))
+        return chain.from_iterable(queryset.iterator(*args, **kwargs) for queryset in querysets)
+
+    def count(self):
+        querysets = None if self._result_cache is not None else self._get_shard_querysets()
+        if querysets is None:
+            return super().count()
+        if self.query.is_sliced:
+            return len(self._fetch_sliced(querysets))
+        return sum(queryset.count() for queryset in querysets)
+
+    def exists(self):
+        querysets = None if self._result_cache is not None else self._get_shard_querysets()
+        if querysets is None:
+            return super().exists()
+        if self.query.is_sliced:
+            return bool(self._fetch_sliced(querysets))
+        return any(queryset.exists() for queryset in querysets)
+
+    def update(self, **kwargs):
+        querysets = None if self.query.is_sliced else self._get_shard_querysets()
+        if querysets is None:
+            return super().update(**kwargs)
+        return sum(queryset.update(**kwargs) for queryset in querysets)
+    update.alters_data = True
+
+    def delete(self):
+        querysets = None if self.query.is_sliced else self._get_shard_querysets()
+        if querysets is None:
+            return super().delete()
+        total, counts = 0, Counter()
+        for queryset in querysets:
+            deleted, deleted_counts = queryset.delete()
+            total += deleted
+            counts.update(deleted_counts)
+        return total, dict(counts)
+    delete.alters_data = True
+    delete.queryset_only = True
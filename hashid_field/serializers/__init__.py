@@ -0,0 +1,117 @@
+"""
+Serialization formats for dumpdata and loaddata that decode each distinct hashid only once. Use them in place of
+Django's own formats with:
+
+    SERIALIZATION_MODULES = {
+        'json': 'hashid_field.serializers.json',
+        'jsonl': 'hashid_field.serializers.jsonl',
+        'python': 'hashid_field.serializers.python',
+    }
+"""
+from django.apps import apps
+
+from ..hashid import Hashid
+from ..json import hashid_to_str
+
+# The most decoded values kept for each field while loading
+CACHE_SIZE = 100_000
+
+
+def _get_hashid_field(field):
+    """Returns the Hashid*Field that holds the values of `field`, or that its relation refers to, if there is one."""
+    from ..field import HashidFieldMixin  # avoid circular import
+    if field.many_to_many:
+        target_field = field.remote_field.model._meta.pk
+    elif field.is_relation:
+        target_field = field.target_field
+    else:
+        target_field = field
+    return target_field if isinstance(target_field, HashidFieldMixin) else None
+
+
+class _ModelFields(object):
+    """The Hashid*Fields that hold the primary key and the serialized fields of a model, by the name of the field."""
+    def __init__(self, model):
+        opts = model._meta
+        self.pk = _get_hashid_field(opts.pk)
+        self.fields = {}
+        for field in opts.concrete_fields + opts.many_to_many:
+            hashid_field = _get_hashid_field(field)
+            if hashid_field is not None:
+                self.fields[field.name] = hashid_field
+        self.many = {field.name for field in opts.many_to_many if field.name in self.fields}
+
+
+def _get_model(label, cache):
+    if label not in cache:
+        try:
+            cache[label] = _ModelFields(apps.get_model(label))
+        except (LookupError, TypeError, ValueError):
+            cache[label] = None
+    return cache[label]
+
+
+def decode_hashids(objects, cache_size=CACHE_SIZE):
+    """
+    Yields the dicts of serialized objects, as read by Django's Python deserializer, with the hashid strings of every
+    Hashid*Field, and of every relation to one, replaced by Hashids, so that the deserializer and the save after it use
+    them as they are instead of decoding each value again. Each Hashid*Field keeps up to `cache_size` of the values it
+    has decoded, so a value that appears many times, such as the primary key of an object and every foreign key to it,
+    is only decoded once. Values that aren't valid hashids, and natural keys, are left as they are for
+    the deserializer to handle as usual.
+    """
+    models_cache = {}
+    caches = {}  # {field: {value: Hashid or None}}
+
+    def decode(field, value):
+        cache = caches.get(field)
+        if cache is None:
+            cache = caches[field] = {}
+        try:
+            hashid = cache[value]
+        except KeyError:
+            try:
+                hashid = field.get_hashid(value)
+            except ValueError:
+                hashid = None
+            if len(cache) >= cache_size:
+                cache.clear()
+            cache[value] = hashid
+        return value if hashid is None else hashid
+
+    for obj in objects:
+        model_fields = _get_model(obj.get('model'), models_cache) if isinstance(obj, dict) else None
+        if model_fields is None:
+            yield obj
+            continue
+        obj = dict(obj)
+        if model_fields.pk is not None and isinstance(obj.get('pk'), str):
+            obj['pk'] = decode(model_fields.pk, obj['pk'])
+        fields = obj['fields'] = dict(obj.get('fields') or {})
+        for name, value in fields.items():
+            field = model_fields.fields.get(name)
+            if field is None:
+                continue
+            if isinstance(value, str):
+                fields[name] = decode(field, value)
+            elif name in model_fields.many and isinstance(value, list):
+                fields[name] = [decode(field, item) if isinstance(item, str) else item for item in value]
+        yield obj
+
+
+class HashidSerializerMixin(object):
+    """Writes the Hashids of an object as they are loaded, rather than getting each value from the field again."""
+    def handle_field(self, obj, field):
+        value = field.value_from_object(obj)
+        if isinstance(value, Hashid):
+            self._current[field.name] = hashid_to_str(value)
+        else:
+            super().handle_field(obj, field)
+
+    def handle_fk_field(self, obj, field):
+        value = getattr(obj, field.attname)
+        if isinstance(value, Hashid) and not (self.use_natural_foreign_keys and
+                                              hasattr(field.remote_field.model, 'natural_key')):
+            self._current[field.name] = hashid_to_str(value)
+        else:
+            super().handle_fk_field(obj, field)
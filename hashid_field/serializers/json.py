@@ -0,0 +1,27 @@
+"""Django's JSON serialization format, decoding each distinct hashid once."""
+import json
+
+from django.core.serializers import json as django_json
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.python import Deserializer as PythonDeserializer
+
+from . import CACHE_SIZE, HashidSerializerMixin, decode_hashids
+
+
+class Serializer(HashidSerializerMixin, django_json.Serializer):
+    pass
+
+
+def Deserializer(stream_or_string, **options):
+    cache_size = options.pop('hashid_cache_size', CACHE_SIZE)
+    if not isinstance(stream_or_string, (bytes, str)):
+        stream_or_string = stream_or_string.read()
+    if isinstance(stream_or_string, bytes):
+        stream_or_string = stream_or_string.decode()
+    try:
+        objects = json.loads(stream_or_string)
+        yield from PythonDeserializer(decode_hashids(objects, cache_size), **options)
+    except (GeneratorExit, DeserializationError):
+        raise
+    except Exception as exc:
+        raise DeserializationError() from exc
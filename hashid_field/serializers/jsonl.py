@@ -0,0 +1,33 @@
+"""Django's JSON Lines serialization format, decoding each distinct hashid once."""
+import json
+
+from django.core.serializers import jsonl as django_jsonl
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.python import Deserializer as PythonDeserializer
+
+from . import CACHE_SIZE, HashidSerializerMixin, decode_hashids
+
+
+class Serializer(HashidSerializerMixin, django_jsonl.Serializer):
+    pass
+
+
+def _get_lines(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def Deserializer(stream_or_string, **options):
+    cache_size = options.pop('hashid_cache_size', CACHE_SIZE)
+    if isinstance(stream_or_string, bytes):
+        stream_or_string = stream_or_string.decode()
+    if isinstance(stream_or_string, str):
+        stream_or_string = stream_or_string.splitlines()
+    try:
+        # The file is read a line at a time, so only the decoded hashids are held in memory
+        yield from PythonDeserializer(decode_hashids(_get_lines(stream_or_string), cache_size), **options)
+    except (GeneratorExit, DeserializationError):
+        raise
+    except Exception as exc:
+        raise DeserializationError() from exc
@@ -0,0 +1,13 @@
+"""Django's Python serialization format, decoding each distinct hashid once."""
+from django.core.serializers import python
+
+from . import CACHE_SIZE, HashidSerializerMixin, decode_hashids
+
+
+class Serializer(HashidSerializerMixin, python.Serializer):
+    pass
+
+
+def Deserializer(object_list, **options):
+    cache_size = options.pop('hashid_cache_size', CACHE_SIZE)
+    yield from python.Deserializer(decode_hashids(object_list, cache_size), **options)
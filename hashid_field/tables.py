@@ -0,0 +1,86 @@
+import hashlib
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .encoder import TableHashids, make_hashids
+
+# File layout, all little-endian:
+#   header: magic, first ID, number of IDs, slot width, SHA-256 of the configuration
+#   slots:  one fixed-width, NUL padded ASCII hashid per ID, in ID order
+MAGIC = b'HASHIDT1'
+HEADER = struct.Struct('<8sQQH32s')
+CHUNK_SIZE = 65536
+
+
+def _config_digest(salt, min_length, alphabet):
+    return hashlib.sha256("{!r}\0{!r}\0{!r}".format(salt, min_length, alphabet).encode('utf-8')).digest()
+
+
+def build_encoding_table(path, salt, min_length, alphabet, start, stop):
+    """
+    Writes the hashids of every ID in range(start, stop) for the given configuration to an encoding table at `path`.
+    The file is written next to `path` and then moved into place, so processes that already have the old table open
+    keep using it.
+    """
+    if start < 0 or stop <= start:
+        raise ValueError("the range of IDs must be non-empty and positive")
+    hashids = make_hashids(salt, min_length, alphabet)
+    # The hashid of a single number never gets shorter as the number grows, so the last one is the widest
+    width = len(hashids.encode(stop - 1))
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, start, stop - start, width, _config_digest(salt, min_length, alphabet)))
+        for chunk_start in range(start, stop, CHUNK_SIZE):
+            chunk = range(chunk_start, min(chunk_start + CHUNK_SIZE, stop))
+            f.write(b''.join(hashids.encode(id).encode('ascii').ljust(width, b'\0') for id in chunk))
+    os.replace(tmp_path, path)
+    return stop - start
+
+
+class MappedHashids(TableHashids):
+    """
+    A TableHashids that reads the hashids of a range of IDs from an encoding table made by build_encoding_table(),
+    memory mapped so that every process on the host shares one read-only copy. Encoding an ID in the range is an
+    offset lookup, and everything else falls back to TableHashids.
+
+    Decoding still works out the number arithmetically, since that's cheaper than searching the table, but verifies
+    it against the table instead of encoding it again.
+    """
+    def __init__(self, path, salt='', min_length=0, alphabet=TableHashids.ALPHABET):
+        super().__init__(salt=salt, min_length=min_length, alphabet=alphabet)
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                raise ImproperlyConfigured("'{}' is not a hashid encoding table".format(path))
+        try:
+            magic, start, count, width, digest = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            raise ImproperlyConfigured("'{}' is not a hashid encoding table".format(path))
+        if magic != MAGIC:
+            raise ImproperlyConfigured("'{}' is not a hashid encoding table".format(path))
+        if digest != _config_digest(salt, min_length, alphabet):
+            raise ImproperlyConfigured("The hashid encoding table '{}' was built for a different salt, min_length or "
+                                       "alphabet".format(path))
+        if len(self._mmap) != HEADER.size + count * width:
+            raise ImproperlyConfigured("The hashid encoding table '{}' is truncated".format(path))
+        self.start = start
+        self.stop = start + count
+        self._width = width
+
+    def encode(self, *values):
+        if len(values) == 1 and type(values[0]) is int and self.start <= values[0] < self.stop:
+            offset = HEADER.size + (values[0] - self.start) * self._width
+            return self._mmap[offset:offset + self._width].rstrip(b'\0').decode('ascii')
+        return super().encode(*values)
+
+
+@lru_cache(maxsize=None)
+def make_mapped_hashids(path, salt, min_length, alphabet):
+    """Returns the shared MappedHashids for an encoding table and configuration."""
+    return MappedHashids(path, salt=salt, min_length=min_length, alphabet=alphabet)
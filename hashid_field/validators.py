@@ -1,5 +1,17 @@
+from contextvars import ContextVar
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 
+# The Hashid of the value a Hashid*Field is cleaning, while its validators run
+cleaned_hashid = ContextVar('hashid_field_cleaned_hashid', default=None)
+
+
+def _clean(hashid_field, x):
+    hashid = cleaned_hashid.get()
+    if hashid is not None and (x is hashid or (isinstance(x, str) and str(hashid) == x)):
+        return hashid.id
+    return hashid_field.get_prep_value(x)
+
 
 class HashidMaxValueValidator(MaxValueValidator):
     def __init__(self, hashid_field, limit_value, message=None):
@@ -7,7 +19,7 @@ class HashidMaxValueValidator(MaxValueValidator):
         super().__init__(limit_value, message)
 
     def clean(self, x):
-        return self.hashid_field.get_prep_value(x)
+        return _clean(self.hashid_field, x)
 
 
 class HashidMinValueValidator(MinValueValidator):
@@ -16,4 +28,4 @@ class HashidMinValueValidator(MinValueValidator):
         super().__init__(limit_value, message)
 
     def clean(self, x):
-        return self.hashid_field.get_prep_value(x)
+        return _clean(self.hashid_field, x)
@@ -1,10 +1,12 @@
 from django.contrib import admin
 
+from hashid_field.admin import HashidSearchMixin
+
 from library.models import Author, Editor, Book
 
 
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
+class AuthorAdmin(HashidSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'int_id', 'name')
     search_fields = ('id', 'name')
     ordering = ('name',)
@@ -14,14 +16,14 @@ class AuthorAdmin(admin.ModelAdmin):
 
 
 @admin.register(Editor)
-class EditorAdmin(admin.ModelAdmin):
+class EditorAdmin(HashidSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'name')
     search_fields = ('id', 'name')
     ordering = ('name',)
 
 
 @admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(HashidSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'id', 'reference_id', 'int_reference_id', 'key', 'alt', 'author')
     list_select_related = ('author',)
     list_filter = ('author__name',)
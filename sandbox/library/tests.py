@@ -123,3 +123,14 @@ class AuthorTests(TestCase):
         self.assertIsInstance(a.id, Hashid)
         self.assertIsInstance(b.id, Hashid)
         self.assertListEqual(list(Author.objects.order_by('id')), [a, b])
+
+
+class ProfilerTests(TestCase):
+    def test_book_detail_profile(self):
+        author = Author.objects.create(name="John Doe")
+        book = Book.objects.create(name="Test Book", reference_id=123, author=author)
+        response = self.client.get(book.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-Hashid-Conversions', response)
+        profile = response.wsgi_request.hashid_profile
+        self.assertIn(('library.Author.id', 'from_db_value'), {(entry.label, entry.site) for entry in profile.entries})
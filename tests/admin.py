@@ -1,8 +1,14 @@
 from django.contrib import admin
 
+from hashid_field.admin import HashidSearchMixin
+
 from tests.models import Record
 
 
 @admin.register(Record)
 class RecordAdmin(admin.ModelAdmin):
     pass
+
+
+class RecordSearchAdmin(HashidSearchMixin, admin.ModelAdmin):
+    search_fields = ('id', 'prefixed_id', 'artist__id', 'name')
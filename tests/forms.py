@@ -1,6 +1,7 @@
 from django import forms
 
-from tests.models import Record
+from hashid_field.forms import HashidModelMultipleChoiceField, HashidMultipleInput
+from tests.models import Record, Playlist
 
 
 class RecordForm(forms.ModelForm):
@@ -13,3 +14,17 @@ class AlternateRecordForm(forms.ModelForm):
     class Meta:
         model = Record
         fields = ('name', 'reference_id', 'alternate_id')
+
+
+class StringRecordForm(forms.ModelForm):
+    class Meta:
+        model = Record
+        fields = ('name', 'reference_id', 'string_id', 'plain_id')
+
+
+class PlaylistForm(forms.ModelForm):
+    class Meta:
+        model = Playlist
+        fields = ('name', 'artists')
+        field_classes = {'artists': HashidModelMultipleChoiceField}
+        widgets = {'artists': HashidMultipleInput}
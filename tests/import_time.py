@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# Measures how long `import hashid_field` takes in a fresh interpreter, with Django REST Framework importable and with
+# it hidden, to make sure that importing the fields (and so any models) never drags in DRF.
+import os
+import subprocess
+import sys
+from statistics import median
+from textwrap import dedent
+
+import django
+
+RUNS = 20
+
+HIDE_DRF = dedent('''
+    import sys
+    from importlib.abc import MetaPathFinder
+
+    class HideRestFramework(MetaPathFinder):
+        def find_spec(self, fullname, path, target=None):
+            if fullname == 'rest_framework' or fullname.startswith('rest_framework.'):
+                raise ImportError("No module named " + fullname)
+
+    sys.meta_path.insert(0, HideRestFramework())
+''')
+
+IMPORT = dedent('''
+    import sys
+    from time import perf_counter
+    import django
+    from django.conf import settings
+    settings.configure()
+    django.setup()
+    start = perf_counter()
+    import hashid_field
+    print(perf_counter() - start, 'rest_framework' in sys.modules)
+''')
+
+
+def import_time(hide_drf):
+    code = (HIDE_DRF if hide_drf else '') + IMPORT
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    times = []
+    imported_drf = False
+    for _ in range(RUNS):
+        output = subprocess.check_output([sys.executable, '-c', code], env=env, text=True)
+        time, drf = output.split()
+        times.append(float(time))
+        imported_drf |= drf == 'True'
+    label = "without DRF" if hide_drf else "with DRF installed"
+    print("import hashid_field {}: {:.2f}ms median of {} runs, imported rest_framework: {}".format(
+        label, median(times) * 1000, RUNS, imported_drf))
+
+
+if __name__ == "__main__":
+    print("Python:", sys.version)
+    print("Django:", django.get_version(django.VERSION))
+
+    import_time(hide_drf=False)
+    import_time(hide_drf=True)
@@ -2,6 +2,9 @@ from django.db import models
 from django.core import validators
 
 from hashid_field import HashidField, BigHashidField, HashidAutoField, BigHashidAutoField
+from hashid_field import ShardedHashidField, ShardedHashidAutoField
+from hashid_field.query import HashidQuerySet
+from hashid_field.routers import ShardedQuerySet
 
 
 class Artist(models.Model):
@@ -25,6 +28,8 @@ class Record(models.Model):
     alternate_id = HashidField(salt="a different salt", null=True, blank=True)
     key = BigHashidField(min_length=10, alphabet="abcdlmnotuvwxyz123789", null=True, blank=True)
 
+    objects = HashidQuerySet.as_manager()
+
     def __str__(self):
         return "{} ({})".format(self.name, self.reference_id)
 
@@ -38,3 +43,29 @@ class RecordLabel(models.Model):
         return model_class._meta.verbose_name.replace(' ', '_') + '/'
 
     id = HashidAutoField(primary_key=True, allow_int_lookup=True, prefix=name_prefix)
+
+
+class Playlist(models.Model):
+    id = HashidAutoField(primary_key=True)
+    name = models.CharField(max_length=40)
+    artists = models.ManyToManyField(Artist, blank=True, related_name="playlists")
+
+
+class Coupon(models.Model):
+    id = HashidAutoField(primary_key=True, salt="current salt", retired_salts=("old salt", "older salt"),
+                         negative_cache_size=100)
+
+
+class ShardedRecord(models.Model):
+    id = ShardedHashidAutoField(primary_key=True)
+    name = models.CharField(max_length=40, blank=True)
+    reference_id = ShardedHashidField(null=True, blank=True, local_id_bits=32, prefix="ref_")
+
+    objects = ShardedQuerySet.as_manager()
+
+
+class Ticket(models.Model):
+    id = BigHashidAutoField(primary_key=True)
+    record = models.ForeignKey(ShardedRecord, on_delete=models.CASCADE, null=True, blank=True, related_name="tickets")
+
+    objects = ShardedQuerySet.as_manager()
@@ -49,6 +49,169 @@ def hashid_decode():
     print("Hashid decode: {}".format(time))
 
 
+def table_hashids():
+    # Compare the table based encoder with hashids.Hashids for a hex alphabet
+    for cls in ("Hashids", "TableHashids"):
+        setup = dedent('''
+            from hashids import Hashids
+            from hashid_field.encoder import TableHashids
+            hashids = {}(salt="asdf", min_length=13, alphabet="0123456789abcdef")
+            hashid = hashids.encode(123456789)
+        '''.format(cls))
+        stmt = dedent('''
+            hashids.encode(123456789)
+            hashids.decode(hashid)
+        ''')
+        timer = Timer(stmt, setup)
+        time = timer.timeit(100_000)
+        print("{} encode/decode: {}".format(cls, time))
+
+
+def mapped_hashids():
+    # Compare an encoding table for 1M IDs with the table based encoder
+    import tempfile
+    from hashid_field.tables import build_encoding_table
+    path = os.path.join(tempfile.mkdtemp(), "perf.table")
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890"
+    build_encoding_table(path, "asdf", 13, alphabet, 1, 1_000_001)
+    for engine in ("TableHashids(", "MappedHashids(path, "):
+        setup = dedent('''
+            from hashid_field.encoder import TableHashids
+            from hashid_field.tables import MappedHashids
+            hashids = {}salt="asdf", min_length=13)
+            hashid = hashids.encode(123456)
+        '''.format(engine))
+        stmt = dedent('''
+            hashids.encode(123456)
+            hashids.decode(hashid)
+        ''')
+        timer = Timer(stmt, setup, globals={'path': path})
+        time = timer.timeit(100_000)
+        print("{} encode/decode: {}".format(engine.split("(")[0], time))
+
+
+def field_construction():
+    # Building fields is repeated for every historical model state when migrations run
+    setup = dedent('''
+        from hashid_field import HashidField
+    ''')
+    stmt = dedent('''
+        HashidField(salt="asdf", min_length=7)
+        HashidField(salt="asdf", min_length=7, alphabet="0123456789abcdef")
+    ''')
+    timer = Timer(stmt, setup)
+    time = timer.timeit(10_000)
+    print("HashidField construction: {}".format(time))
+
+
+def in_bulk():
+    # Look up a batch of 10k hashids and key the results by the strings given, with in_bulk() and in_bulk_hashids()
+    from django.db import connection
+    from tests.models import Record
+    connection.creation.create_test_db(verbosity=0)
+    Record.objects.bulk_create(Record(name="Record", reference_id=i) for i in range(10_000))
+    values = [str(hashid) for hashid in Record.objects.values_list('id', flat=True)]
+    setup = dedent('''
+        from tests.models import Record
+    ''')
+    stmts = {
+        "in_bulk": dedent('''
+            objects = Record.objects.in_bulk(values)
+            result = {str(hashid): obj for hashid, obj in objects.items()}
+            result = {value: result.get(value) for value in values}
+        '''),
+        "in_bulk_hashids": dedent('''
+            result = Record.objects.in_bulk_hashids(values)
+        '''),
+    }
+    for name, stmt in stmts.items():
+        timer = Timer(stmt, setup, globals={'values': values})
+        time = timer.timeit(10)
+        print("{} of 10k hashids: {}".format(name, time))
+
+
+def bulk_import():
+    # Import CSV files of increasing size, to check that the time per row and peak memory stay flat
+    import tempfile
+    import tracemalloc
+    from time import perf_counter
+    from django.db import connection
+    from hashid_field.importer import import_file
+    from tests.models import Record
+    connection.creation.create_test_db(verbosity=0)
+    Record.objects.bulk_create(Record(name="Record", reference_id=i) for i in range(100_000))
+    ids = [str(hashid) for hashid in Record.objects.values_list('id', flat=True)]
+    path = os.path.join(tempfile.mkdtemp(), "perf.csv")
+    for rows in (10_000, 100_000):
+        with open(path, 'w') as f:
+            f.write("id,name\n")
+            f.writelines("{},Imported {}\n".format(ids[i % len(ids)], i) for i in range(rows))
+        tracemalloc.start()
+        start = perf_counter()
+        import_file(path, Record, ['name'])
+        time = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("Import of {} rows: {:.2f}us/row, peak {:.1f}MB".format(rows, time / rows * 1e6, peak / 1e6))
+
+
+def json_encoding():
+    # Serialize 100k rows of values() with Hashids, converting them by hand first or with the default hooks
+    import json
+    from time import perf_counter
+    from hashid_field.json import HashidJSONEncoder, hashid_default
+    from tests.models import Record
+    field = Record._meta.get_field('id')
+    rows = [{'id': field.get_hashid(i), 'reference_id': field.get_hashid(i * 7), 'name': "Record {}".format(i)}
+            for i in range(1, 100_001)]
+
+    def by_hand(rows):
+        return [{key: str(value) if key != 'name' else value for key, value in row.items()} for row in rows]
+
+    cases = [
+        ("json, str() by hand", lambda: json.dumps(by_hand(rows))),
+        ("json, HashidJSONEncoder", lambda: json.dumps(rows, cls=HashidJSONEncoder)),
+        ("json, default=hashid_default", lambda: json.dumps(rows, default=hashid_default)),
+    ]
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        cases += [
+            ("orjson, str() by hand", lambda: orjson.dumps(by_hand(rows))),
+            ("orjson, default=hashid_default", lambda: orjson.dumps(rows, default=hashid_default)),
+        ]
+    for name, dumps in cases:
+        start = perf_counter()
+        dumps()
+        print("{}: {:.3f}s".format(name, perf_counter() - start))
+
+
+def fixture_loading():
+    # Deserialize a fixture of 100k records, each with a hashid primary key, foreign key and three Hashid*Fields, with
+    # Django's JSON format and hashid_field's, which decodes each distinct value of a batch once
+    import json
+    from time import perf_counter
+    from django.core import serializers
+    from hashid_field.serializers import json as hashid_json
+    from tests.models import Artist, Record
+    pk, artist_pk = Record._meta.pk, Artist._meta.pk
+    fields = [Record._meta.get_field(name) for name in ('reference_id', 'prefixed_id', 'key')]
+    data = json.dumps([
+        {'model': "tests.record", 'pk': str(pk.get_hashid(i)), 'fields': dict(
+            {field.name: str(field.get_hashid(i % 1000)) for field in fields},
+            name="Record {}".format(i), artist=str(artist_pk.get_hashid(i % 100)))}
+        for i in range(1, 100_001)
+    ])
+    for name, deserialize in (("Django json", lambda: serializers.deserialize('json', data)),
+                              ("hashid_field json", lambda: hashid_json.Deserializer(data))):
+        start = perf_counter()
+        for _ in deserialize():
+            pass
+        print("{}: {:.3f}s".format(name, perf_counter() - start))
+
+
 if __name__ == "__main__":
     print("Python:", sys.version)
     print("Django:", django.get_version(django.VERSION))
@@ -58,3 +221,10 @@ if __name__ == "__main__":
     # no_cache()
     # with_cache()
     hashid_decode()
+    # table_hashids()
+    # field_construction()
+    # mapped_hashids()
+    # in_bulk()
+    # bulk_import()
+    # json_encoding()
+    # fixture_loading()
@@ -1,8 +1,10 @@
 from django.contrib.admin import AdminSite
 from django.test import TestCase
 
-from tests.admin import RecordAdmin
-from tests.models import Record
+from unittest import mock
+
+from tests.admin import RecordAdmin, RecordSearchAdmin
+from tests.models import Artist, Record
 
 
 class MockRequest:
@@ -26,3 +28,79 @@ class HashidAdminTests(TestCase):
         form = form_class()
         widget = form.fields['reference_id'].widget
         self.assertEqual(widget.input_type, 'text')
+
+
+class HashidSearchMixinTests(TestCase):
+    def setUp(self):
+        self.admin = RecordSearchAdmin(Record, site)
+        self.artist = Artist.objects.create(name="Blue Note")
+        self.records = [
+            Record.objects.create(name="Blue Train", reference_id=1, prefixed_id=11, artist=self.artist),
+            Record.objects.create(name="Kind of Blue", reference_id=2, prefixed_id=12),
+            Record.objects.create(name="Giant Steps", reference_id=3, prefixed_id=13),
+        ]
+
+    def search(self, search_term):
+        queryset, may_have_duplicates = self.admin.get_search_results(request, Record.objects.all(), search_term)
+        return set(queryset), may_have_duplicates
+
+    def test_search_by_hashids(self):
+        first, second, third = self.records
+        self.assertEqual(self.search(str(first.id)), ({first}, False))
+        # Pasting several IDs finds all of them
+        self.assertEqual(self.search("{} {}".format(first.id, third.id)), ({first, third}, False))
+        self.assertEqual(self.search(str(second.prefixed_id)), ({second}, False))
+        self.assertEqual(self.search(str(self.artist.id)), ({first}, False))
+
+    def test_search_mixed_terms(self):
+        first, second, third = self.records
+        # Every term has to match, as in ModelAdmin
+        self.assertEqual(self.search("blue {}".format(first.id)), ({first}, False))
+        self.assertEqual(self.search("blue {}".format(third.id)), (set(), False))
+        self.assertEqual(self.search("{} steps".format(third.id)), ({third}, False))
+        self.assertEqual(self.search("{} {} blue".format(first.id, third.id)), ({first}, False))
+        self.assertEqual(self.search("blue"), ({first, second}, False))
+        self.assertEqual(self.search("blue train"), ({first}, False))
+
+    def test_hashid_terms_are_still_searched_as_text(self):
+        field = Record._meta.get_field('id')
+        record = Record.objects.create(name="2001", reference_id=4)
+        with mock.patch.object(field, 'allow_int_lookup', True):
+            self.assertEqual(self.search("2001"), ({record}, False))
+            self.assertEqual(self.search(str(record.pk.id)), ({record}, False))
+
+    def test_only_hashid_search_fields(self):
+        first = self.records[0]
+        self.admin.search_fields = ('id',)
+        self.assertEqual(self.search(str(first.id)), ({first}, False))
+        self.assertEqual(self.search("{} blue".format(first.id)), (set(), False))
+
+    def test_request_is_not_changed(self):
+        search_request = MockRequest()
+        search_request.user = request.user
+        self.admin.get_search_results(search_request, Record.objects.all(), "{} blue".format(self.records[0].id))
+        self.assertEqual(vars(search_request), {'user': request.user})
+        self.assertEqual(self.admin.get_search_fields(search_request), RecordSearchAdmin.search_fields)
+
+    def test_search_without_hashids(self):
+        self.assertEqual(self.search("nothing"), (set(), False))
+        self.assertEqual(self.search(""), (set(self.records), False))
+
+    def test_hashids_decoded_once(self):
+        field = Record._meta.get_field('id')
+        term = " ".join(str(record.id) for record in self.records)
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            self.assertEqual(self.search(term), (set(self.records), False))
+        self.assertEqual(decode.call_count, len(self.records))
+
+    def test_non_candidates_are_not_decoded(self):
+        field = Record._meta.get_field('id')
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            self.assertEqual(self.search("kind-of"), (set(), False))
+        decode.assert_not_called()
+
+    def test_single_query(self):
+        queryset, _ = self.admin.get_search_results(
+            request, Record.objects.all(), "{} {} giant".format(self.records[0].id, self.records[2].id))
+        with self.assertNumQueries(1):
+            self.assertEqual(set(queryset), {self.records[2]})
@@ -0,0 +1,77 @@
+import pickle
+from unittest import skipUnless
+
+from django.test import TestCase
+
+from hashid_field.array import HashidArray, numpy
+from tests.models import Artist, Record, Track
+
+
+class HashidArrayTests(TestCase):
+    def setUp(self):
+        self.artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(5)]
+        self.field = Artist._meta.get_field('id')
+
+    def test_from_queryset(self):
+        with self.assertNumQueries(1):
+            ids = HashidArray.from_queryset(Artist.objects.order_by('pk'))
+        self.assertEqual(list(ids.ids), [artist.id.id for artist in self.artists])
+        self.assertEqual(list(ids), [artist.id for artist in self.artists])
+        self.assertEqual(ids[1], self.artists[1].id)
+        self.assertEqual(ids[-1], self.artists[-1].id)
+        self.assertIsInstance(ids[1:3], HashidArray)
+        self.assertEqual(list(ids[1:3]), [self.artists[1].id, self.artists[2].id])
+
+    def test_from_queryset_field(self):
+        Record.objects.create(name="Record", reference_id=123, artist=self.artists[0])
+        ids = HashidArray.from_queryset(Record.objects.all(), 'reference_id')
+        self.assertEqual(list(ids.ids), [123])
+        self.assertIs(ids.field, Record._meta.get_field('reference_id'))
+
+    def test_strings(self):
+        ids = HashidArray([1, 2, 3], self.field)
+        self.assertEqual(ids.strings(), [str(self.field.get_hashid(i)) for i in (1, 2, 3)])
+        track_field = Track._meta.get_field('id')
+        self.assertEqual(HashidArray([5], track_field).strings(), [str(track_field.get_hashid(5))])
+        self.assertTrue(HashidArray([5], track_field).strings()[0].startswith("albumtrack:"))
+
+    def test_membership(self):
+        ids = HashidArray([1, 2, 3], self.field)
+        self.assertIn(2, ids)
+        self.assertIn(self.field.get_hashid(3), ids)
+        self.assertIn(str(self.field.get_hashid(1)), ids)
+        self.assertNotIn(4, ids)
+        self.assertNotIn("invalid", ids)
+        self.assertEqual(ids.contains([1, self.field.get_hashid(4), "invalid", str(self.field.get_hashid(3))]),
+                         [True, False, False, True])
+
+    def test_set_operations(self):
+        a = HashidArray([1, 2, 3, 4], self.field)
+        b = HashidArray([3, 4, 5], self.field)
+        self.assertEqual(list((a & b).ids), [3, 4])
+        self.assertEqual(list((a | b).ids), [1, 2, 3, 4, 5])
+        self.assertEqual(list((a - b).ids), [1, 2])
+        self.assertEqual(list((a - [self.field.get_hashid(1), str(self.field.get_hashid(2))]).ids), [3, 4])
+        self.assertEqual(a & b, HashidArray([3, 4], self.field))
+
+    def test_in_lookup(self):
+        ids = HashidArray.from_queryset(Artist.objects.filter(name__in=["Artist 1", "Artist 3"]))
+        self.assertEqual(set(Artist.objects.filter(id__in=ids)), {self.artists[1], self.artists[3]})
+        self.assertEqual(list(Artist.objects.filter(id__in=HashidArray([], self.field))), [])
+        Record.objects.create(name="Record", reference_id=1, artist=self.artists[1])
+        self.assertEqual(Record.objects.filter(artist__in=ids).count(), 1)
+
+    def test_in_lookup_does_not_encode(self):
+        ids = HashidArray([artist.id.id for artist in self.artists], self.field)
+        query = str(Artist.objects.filter(id__in=ids).query)
+        for artist in self.artists:
+            self.assertIn(str(artist.id.id), query)
+
+    def test_pickle(self):
+        ids = HashidArray([1, 2, 3], self.field)
+        self.assertEqual(pickle.loads(pickle.dumps(ids)), ids)
+
+    @skipUnless(numpy, "Requires NumPy to be installed")
+    def test_to_numpy(self):
+        ids = HashidArray([1, 2, 3], self.field)
+        self.assertEqual(ids.to_numpy().tolist(), [1, 2, 3])
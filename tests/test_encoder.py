@@ -0,0 +1,74 @@
+import random
+
+from django.test import TestCase
+from hashids import Hashids
+
+from hashid_field import Hashid, HashidField
+from hashid_field.encoder import TableHashids
+
+CONFIGS = [
+    ("", 0, Hashids.ALPHABET),
+    ("gg ez", 7, Hashids.ALPHABET),
+    ("gg ez", 13, Hashids.ALPHABET),
+    ("salt", 1, "0123456789abcdef"),
+    ("salt", 30, "0123456789abcdef"),
+    ("abcd", 10, "abcdefghijklmnop"),
+    ("a different salt", 20, "abcdlmnotuvwxyz123789"),
+    ("", 50, "abcdefghijklmnopqrstuvwxyz0123456789"),
+]
+
+
+class TableHashidsTests(TestCase):
+    def setUp(self):
+        self.random = random.Random(1234)
+
+    def numbers(self):
+        return list(range(0, 500)) + [self.random.randrange(2**63) for _ in range(500)] + [2**64, 2**100 + 1]
+
+    def test_same_encoding(self):
+        for salt, min_length, alphabet in CONFIGS:
+            hashids = Hashids(salt=salt, min_length=min_length, alphabet=alphabet)
+            table_hashids = TableHashids(salt=salt, min_length=min_length, alphabet=alphabet)
+            for number in self.numbers():
+                encoded = hashids.encode(number)
+                self.assertEqual(table_hashids.encode(number), encoded)
+                self.assertEqual(table_hashids.decode(encoded), (number,))
+
+    def test_same_decoding_of_invalid_hashids(self):
+        for salt, min_length, alphabet in CONFIGS:
+            hashids = Hashids(salt=salt, min_length=min_length, alphabet=alphabet)
+            table_hashids = TableHashids(salt=salt, min_length=min_length, alphabet=alphabet)
+            for _ in range(2000):
+                candidate = "".join(self.random.choice(alphabet)
+                                    for _ in range(self.random.randint(1, max(min_length, 8) + 2)))
+                self.assertEqual(table_hashids.decode(candidate), hashids.decode(candidate))
+            for number in self.numbers():
+                encoded = list(hashids.encode(number))
+                encoded[self.random.randrange(len(encoded))] = self.random.choice(alphabet)
+                candidate = "".join(encoded)
+                self.assertEqual(table_hashids.decode(candidate), hashids.decode(candidate))
+            for invalid in ("", None, 123, "!!!", "a" * 200):
+                self.assertEqual(table_hashids.decode(invalid), hashids.decode(invalid))
+
+    def test_multiple_numbers(self):
+        hashids = Hashids(salt="salt", min_length=10, alphabet="0123456789abcdef")
+        table_hashids = TableHashids(salt="salt", min_length=10, alphabet="0123456789abcdef")
+        self.assertEqual(table_hashids.encode(1, 23, 456), hashids.encode(1, 23, 456))
+        self.assertEqual(table_hashids.decode(hashids.encode(1, 23, 456)), (1, 23, 456))
+        self.assertEqual(table_hashids.encode(-1), "")
+        self.assertEqual(table_hashids.encode(), "")
+
+    def test_is_candidate(self):
+        table_hashids = TableHashids(salt="salt", alphabet="abcdefghijklmnop")
+        self.assertTrue(table_hashids.is_candidate(table_hashids.encode(123)))
+        self.assertFalse(table_hashids.is_candidate("123"))
+        self.assertFalse(table_hashids.is_candidate(""))
+
+    def test_used_by_default(self):
+        self.assertIsInstance(HashidField()._hashids, TableHashids)
+        self.assertIsInstance(Hashid(123).hashids, TableHashids)
+
+    def test_numeric_string_with_non_numeric_alphabet(self):
+        h = Hashid("123", salt="salt", alphabet="abcdefghijklmnop")
+        self.assertEqual(h.id, 123)
+        self.assertEqual(h.hashid, TableHashids(salt="salt", alphabet="abcdefghijklmnop").encode(123))
@@ -0,0 +1,93 @@
+from unittest import mock, skipUnless
+
+from django.test import TestCase
+
+from tests.models import Artist, Playlist, Record
+
+try:
+    import django_filters
+except ImportError:
+    django_filters = None
+else:
+    from hashid_field.filters import HashidFilter, HashidFilterSet, HashidInFilter, HashidRangeFilter
+
+    class RecordFilterSet(HashidFilterSet):
+        artist_range = HashidRangeFilter(field_name='artist')
+
+        class Meta:
+            model = Record
+            fields = {
+                'id': ['exact', 'in', 'range'],
+                'artist': ['exact', 'in'],
+                'name': ['exact'],
+            }
+
+    class PlaylistFilterSet(django_filters.FilterSet):
+        artists = HashidInFilter(distinct=True)
+        artist = HashidFilter(field_name='artists')
+        reference = HashidRangeFilter(field_name='artists__records__reference_id')
+
+        class Meta:
+            model = Playlist
+            fields = []
+
+
+@skipUnless(django_filters, "django-filter is not installed")
+class HashidFilterTests(TestCase):
+    def setUp(self):
+        self.artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(3)]
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i + 1, artist=self.artists[i])
+                        for i in range(3)]
+        self.playlist = Playlist.objects.create(name="Playlist")
+        self.playlist.artists.set(self.artists[:2])
+
+    def test_generated_filters(self):
+        filters = RecordFilterSet.base_filters
+        self.assertIsInstance(filters['id'], HashidFilter)
+        self.assertIsInstance(filters['id__in'], HashidInFilter)
+        self.assertIsInstance(filters['id__range'], HashidRangeFilter)
+        self.assertIsInstance(filters['artist'], HashidFilter)
+        self.assertIsInstance(filters['artist__in'], HashidInFilter)
+        self.assertNotIsInstance(filters['name'], HashidFilter)
+
+    def test_exact(self):
+        qs = RecordFilterSet({'id': str(self.records[1].id)}).qs
+        self.assertEqual(list(qs), [self.records[1]])
+        qs = RecordFilterSet({'artist': str(self.artists[2].id)}).qs
+        self.assertEqual(list(qs), [self.records[2]])
+        self.assertEqual(list(RecordFilterSet({'id': "invalid"}).qs), [])
+
+    def test_in(self):
+        field = Record._meta.pk
+        values = ",".join(str(record.id) for record in self.records[:2])
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            qs = RecordFilterSet({'id__in': values}).qs
+            self.assertEqual(sorted(qs, key=lambda r: r.name), self.records[:2])
+        self.assertEqual(decode.call_count, 2)
+        qs = RecordFilterSet({'artist__in': "{},invalid".format(self.artists[2].id)}).qs
+        self.assertEqual(list(qs), [self.records[2]])
+        self.assertEqual(list(RecordFilterSet({'id__in': "invalid,also invalid"}).qs), [])
+
+    def test_range(self):
+        ids = sorted(record.id for record in self.records)
+        qs = RecordFilterSet({'id__range': "{},{}".format(ids[0], ids[1])}).qs
+        self.assertEqual(sorted(record.id for record in qs), ids[:2])
+
+    def test_range_on_relation(self):
+        ids = sorted(artist.id for artist in self.artists)
+        qs = RecordFilterSet({'artist_range': "{},{}".format(ids[1], ids[2])}).qs
+        self.assertEqual({record.artist_id for record in qs}, set(ids[1:]))
+        self.assertEqual(list(RecordFilterSet({'artist_range': "{},invalid".format(ids[0])}).qs), [])
+
+    def test_relations(self):
+        artists = ",".join(str(artist.id) for artist in self.artists)
+        self.assertEqual(list(PlaylistFilterSet({'artists': artists}).qs), [self.playlist])
+        self.assertEqual(list(PlaylistFilterSet({'artist': str(self.artists[2].id)}).qs), [])
+        references = "{},{}".format(self.records[1].reference_id, self.records[2].reference_id)
+        self.assertEqual(list(PlaylistFilterSet({'reference': references}).qs), [self.playlist])
+
+    def test_not_a_hashid_field(self):
+        filter_ = HashidFilter(field_name='name')
+        filter_.model = Record
+        with self.assertRaises(ValueError):
+            filter_.hashid_field
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.http import QueryDict
+
+from hashid_field.forms import HashidModelMultipleChoiceField, HashidMultipleInput
+from tests.forms import PlaylistForm
+from tests.models import Artist, Record
+
+
+class HashidModelMultipleChoiceFieldTests(TestCase):
+    def setUp(self):
+        self.artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(5)]
+
+    def test_valid_list(self):
+        form = PlaylistForm({'name': "Mix", 'artists': ", ".join(str(a.id) for a in self.artists[:3])})
+        self.assertTrue(form.is_valid(), form.errors)
+        playlist = form.save()
+        self.assertEqual(set(playlist.artists.all()), set(self.artists[:3]))
+
+    def test_single_query_and_decode(self):
+        field = Artist._meta.get_field('id')
+        hashids = [str(a.id) for a in self.artists]
+        form = PlaylistForm({'name': "Mix", 'artists': ",".join(hashids + hashids[:2])})
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode, \
+                self.assertNumQueries(1):
+            self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(decode.call_count, len(hashids))
+
+    def test_invalid_values_are_all_reported(self):
+        form = PlaylistForm({'name': "Mix", 'artists': "{},invalid,also_invalid".format(self.artists[0].id)})
+        self.assertFalse(form.is_valid())
+        self.assertEqual([e.code for e in form.errors.as_data()['artists']], ['invalid_pk_value', 'invalid_pk_value'])
+        self.assertEqual([e.params['pk'] for e in form.errors.as_data()['artists']], ['invalid', 'also_invalid'])
+
+    def test_missing_values_are_all_reported(self):
+        missing = [str(Artist._meta.get_field('id').get_hashid(i)) for i in (1000, 1001)]
+        form = PlaylistForm({'name': "Mix", 'artists': ",".join([str(self.artists[0].id)] + missing)})
+        self.assertFalse(form.is_valid())
+        self.assertEqual([e.code for e in form.errors.as_data()['artists']], ['invalid_choice', 'invalid_choice'])
+        self.assertEqual([e.params['value'] for e in form.errors.as_data()['artists']], missing)
+
+    def test_integers_not_allowed(self):
+        form = PlaylistForm({'name': "Mix", 'artists': str(self.artists[0].id.id)})
+        self.assertFalse(form.is_valid())
+
+    def test_string_target_field(self):
+        records = [Record.objects.create(name="Record", reference_id=i, string_id=i + 100) for i in range(3)]
+        self.assertIsInstance(records[0].string_id, str)
+        field = HashidModelMultipleChoiceField(queryset=Record.objects.all(), to_field_name='string_id')
+        self.assertEqual(set(field.clean([records[0].string_id, records[2].string_id])), {records[0], records[2]})
+        missing = str(Record._meta.get_field('string_id').get_hashid(999))
+        with self.assertRaises(ValidationError) as cm:
+            field.clean([records[1].string_id, missing])
+        self.assertEqual([e.params['value'] for e in cm.exception.error_list], [missing])
+
+    def test_render_initial(self):
+        form = PlaylistForm(initial={'artists': self.artists[:2]})
+        html = str(form['artists'])
+        self.assertIn('value="{}, {}"'.format(self.artists[0].id, self.artists[1].id), html)
+
+
+class HashidMultipleInputTests(TestCase):
+    def test_value_from_datadict(self):
+        widget = HashidMultipleInput()
+        data = QueryDict(mutable=True)
+        data.setlist('ids', ["abc, def", "ghi", ""])
+        self.assertEqual(widget.value_from_datadict(data, {}, 'ids'), ["abc", "def", "ghi"])
+        self.assertEqual(widget.value_from_datadict({'ids': "abc,def"}, {}, 'ids'), ["abc", "def"])
+        self.assertEqual(widget.value_from_datadict({'ids': ["abc", "def"]}, {}, 'ids'), ["abc", "def"])
+        self.assertEqual(widget.value_from_datadict({}, {}, 'ids'), [])
@@ -4,7 +4,7 @@ import hashids
 from django.test import TestCase
 from django.utils.encoding import force_str
 
-from hashid_field import Hashid
+from hashid_field import Hashid, CompositeHashid
 
 
 class HashidTests(TestCase):
@@ -175,3 +175,42 @@ class HashidTests(TestCase):
         a1 = Hashid(123)
         a2 = pickle.loads(pickled_a)
         self.assertTrue(a1 == a2)
+
+
+class CompositeHashidTests(TestCase):
+    def test_tuple(self):
+        h = CompositeHashid((3, 17), salt="shards")
+        self.assertEqual(h.shard, 3)
+        self.assertEqual(h.local_id, 17)
+        self.assertEqual(h.id, (3 << 48) | 17)
+        self.assertEqual(h.hashid, hashids.Hashids(salt="shards").encode(3, 17))
+
+    def test_integer(self):
+        h = CompositeHashid((5 << 16) | 123, salt="shards", local_id_bits=16)
+        self.assertEqual((h.shard, h.local_id), (5, 123))
+        self.assertEqual(h.hashid, hashids.Hashids(salt="shards").encode(5, 123))
+
+    def test_hashid(self):
+        h = CompositeHashid("o_" + hashids.Hashids(salt="shards").encode(2, 456), salt="shards", prefix="o_")
+        self.assertEqual((h.shard, h.local_id), (2, 456))
+        self.assertEqual(h, CompositeHashid((2, 456), salt="shards", prefix="o_"))
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            CompositeHashid(hashids.Hashids(salt="shards").encode(123), salt="shards")  # a single number
+        with self.assertRaises(ValueError):
+            CompositeHashid(hashids.Hashids(salt="shards").encode(1, 2, 3), salt="shards")
+        with self.assertRaises(ValueError):
+            CompositeHashid(hashids.Hashids(salt="shards").encode(1, 1 << 16), salt="shards", local_id_bits=16)
+        with self.assertRaises(ValueError):
+            CompositeHashid((1, 1 << 16), local_id_bits=16)
+        with self.assertRaises(ValueError):
+            CompositeHashid((1, -2))
+        with self.assertRaises(ValueError):
+            CompositeHashid((1, 2, 3))
+
+    def test_pickle(self):
+        a = CompositeHashid((7, 99), local_id_bits=20)
+        pickled = pickle.loads(pickle.dumps(a))
+        self.assertEqual(a, pickled)
+        self.assertEqual((pickled.shard, pickled.local_id), (7, 99))
@@ -1,14 +1,21 @@
+import gc
+import weakref
+
 from django.core import exceptions
 from django.core import validators as django_validators
 from django.core.management import call_command
-from django.db.models import Expression
+from django.db import connection
+from django.db.models import Expression, F
 from django.shortcuts import get_object_or_404
 from django.test import TestCase, override_settings
 from io import StringIO
+from unittest import mock
+
+from hashids import Hashids
 
-from hashid_field import Hashid, HashidField
-from tests.forms import RecordForm, AlternateRecordForm
-from tests.models import Record, Artist, Track, RecordLabel
+from hashid_field import Hashid, HashidField, CompositeHashid
+from tests.forms import RecordForm, AlternateRecordForm, StringRecordForm
+from tests.models import Record, Artist, Track, RecordLabel, Coupon, ShardedRecord
 
 
 class HashidsTests(TestCase):
@@ -262,6 +269,36 @@ class HashidsTests(TestCase):
         Artist._meta.get_field('id').allow_int_lookup = False
         Record._meta.get_field('reference_id').allow_int_lookup = False
 
+    def test_range_lookup(self):
+        artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(4)]
+        ids = [artist.id for artist in artists]
+        field = Artist._meta.get_field('id')
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            qs = Artist.objects.filter(id__range=(str(ids[1]), ids[2].hashid))
+            self.assertIn("BETWEEN", str(qs.query))
+            self.assertEqual(list(qs.order_by('id')), artists[1:3])
+        self.assertEqual(decode.call_count, 4)  # Each bound, once for the query and once for printing it
+        self.assertEqual(list(Artist.objects.filter(id__range=(ids[0], ids[0]))), artists[:1])
+        self.assertEqual(list(Record.objects.filter(artist__id__range=(ids[0], ids[3]))), [])
+        # An invalid bound, or an integer without allow_int_lookup, matches nothing
+        self.assertEqual(Artist.objects.filter(id__range=("invalid", ids[3])).count(), 0)
+        self.assertEqual(Artist.objects.filter(id__range=(ids[0].id, ids[3])).count(), 0)
+        self.assertEqual(Artist.objects.exclude(id__range=(ids[0], "invalid")).count(), 4)
+        with override_settings(HASHID_FIELD_LOOKUP_EXCEPTION=True):
+            with self.assertRaises(ValueError):
+                Artist.objects.filter(id__range=("invalid", ids[3])).count()
+
+    def test_range_lookup_with_expression(self):
+        record = Record.objects.create(name="Record", reference_id=self.record.id.id + 5)
+        qs = Record.objects.filter(id__range=(str(record.id), F('reference_id')))
+        self.assertEqual(list(qs), [record])
+        # The other bound follows the same rules as a lookup without an expression
+        self.assertEqual(Record.objects.filter(reference_id__range=(F('reference_id'), 5)).count(), 0)
+        self.assertEqual(Record.objects.filter(id__range=("invalid", F('reference_id'))).count(), 0)
+        with override_settings(HASHID_FIELD_LOOKUP_EXCEPTION=True):
+            with self.assertRaises(ValueError):
+                Record.objects.filter(id__range=("invalid", F('reference_id'))).count()
+
     def assert_lookup_name(self, model_field, lookup_val, expected_lookup_name):
         # The below lookup is based on how django-filter FilterSet class implements `filter_for_field`
         # using the utility `resolve_field` function.
@@ -281,6 +318,7 @@ class HashidsTests(TestCase):
         self.assert_lookup_name(Artist._meta.get_field('id'), 'gte', 'gte')
         self.assert_lookup_name(Artist._meta.get_field('id'), 'lt', 'lt')
         self.assert_lookup_name(Artist._meta.get_field('id'), 'lte', 'lte')
+        self.assert_lookup_name(Artist._meta.get_field('id'), 'range', 'range')
 
     def test_int_lookup_with_made_entirely_of_numbers(self):
         # The integer id 428697 encodes to the hashids string "3557953" which looks like an integer.
@@ -357,6 +395,39 @@ class HashidsTests(TestCase):
         self.assertEqual(str(self.record.reference_id), self.ref_hashids.encode(987))
         self.assertEqual(str(self.record.prefixed_id), "prefix_" + self.ref_hashids.encode(987))
 
+    def test_form_decodes_each_value_once(self):
+        fields = [Record._meta.get_field(name) for name in ('reference_id', 'string_id', 'plain_id')]
+        hashids = [str(field.get_hashid(i)) for i, field in enumerate(fields, start=1)]
+        # All three fields have the same configuration, so they share one encoder
+        self.assertTrue(fields[0]._hashids is fields[1]._hashids is fields[2]._hashids)
+        with mock.patch.object(fields[0]._hashids, 'decode', wraps=fields[0]._hashids.decode) as decode:
+            form = StringRecordForm({
+                'name': "A new name",
+                'reference_id': hashids[0],
+                'string_id': hashids[1],
+                'plain_id': hashids[2],
+            }, instance=self.record)
+            self.assertTrue(form.is_valid())
+            form.save()
+        self.assertEqual(decode.call_args_list, [mock.call(hashid) for hashid in hashids])
+        self.record.refresh_from_db()
+        self.assertEqual(self.record.reference_id.id, 1)
+        self.assertEqual(self.record.string_id, hashids[1])
+        self.assertEqual(self.record.string_id_hashid.id, 2)
+        self.assertEqual(self.record.plain_id, hashids[2])
+
+    def test_clean_keeps_the_hashid_on_the_instance(self):
+        field = Record._meta.get_field('plain_id')
+        hashid = str(field.get_hashid(5))
+        record = Record(name="Record", reference_id=1)
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            self.assertEqual(field.clean(hashid, record), hashid)
+            self.assertEqual(decode.call_count, 1)
+            self.assertEqual(record.plain_id_hashid.id, 5)
+            # Nothing is kept on the field itself, which every request shares
+            self.assertEqual(field.get_prep_value(hashid), 5)
+            self.assertEqual(decode.call_count, 2)
+
     def test_invalid_id_in_form(self):
         form = RecordForm({'name': "A new name", 'reference_id': "asdfqwer"})
         self.assertFalse(form.is_valid())
@@ -398,6 +469,41 @@ class HashidsTests(TestCase):
         self.assertEqual(r.artist, a)
         self.assertTrue(Record.objects.filter(artist__id=a.id))
 
+    def test_related_hashids_are_shared_within_a_query(self):
+        a = Artist.objects.create(name="John Doe")
+        b = Artist.objects.create(name="Jane Doe")
+        for i in range(6):
+            Record.objects.create(name="Album {}".format(i), reference_id=i, artist=a if i % 2 else b)
+        artist_field = Artist._meta.get_field('id')
+        with mock.patch.object(artist_field, 'encode_id', wraps=artist_field.encode_id) as encode_id:
+            records = list(Record.objects.filter(artist__isnull=False).prefetch_related('artist'))
+        # One encode per distinct artist for the FK column, and one per artist for the prefetched objects
+        self.assertEqual(encode_id.call_count, 4)
+        self.assertIs(records[0].artist_id, records[2].artist_id)
+        self.assertIs(records[1].artist_id, records[3].artist_id)
+        self.assertEqual(records[0].artist, b)
+        self.assertEqual(records[1].artist, a)
+
+    def test_related_hashids_are_shared_with_select_related(self):
+        artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(3)]
+        for i in range(30):
+            Record.objects.create(name="Album {}".format(i), reference_id=i, artist=artists[i % 3])
+        artist_field = Artist._meta.get_field('id')
+        with mock.patch.object(artist_field, 'encode_id', wraps=artist_field.encode_id) as encode_id:
+            records = list(Record.objects.filter(artist__isnull=False).select_related('artist').order_by('pk'))
+        # One encode per distinct artist for the FK column, and one per artist for the joined primary key column
+        self.assertEqual(encode_id.call_count, 6)
+        self.assertEqual([record.artist.id for record in records], [artists[i % 3].id for i in range(30)])
+        self.assertIs(records[0].artist.id, records[3].artist.id)
+
+    def test_converter_cache_is_bounded(self):
+        field = Record._meta.get_field('reference_id')
+        from_db_value = field.get_db_converters(connection)[0]
+        with mock.patch('hashid_field.field.CONVERTER_CACHE_SIZE', 10):
+            hashids = [from_db_value(i, field.get_col('tests_record'), connection) for i in range(25)]
+        self.assertEqual(len(from_db_value.cache), 5)
+        self.assertEqual([hashid.id for hashid in hashids], list(range(25)))
+
     def test_spanning_relationships(self):
         a = Artist.objects.create(name="John Doe")
         r = Record.objects.create(name="Blue Album", reference_id=456, artist=a)
@@ -507,6 +613,112 @@ class HashidsTests(TestCase):
         with self.assertRaises(exceptions.ImproperlyConfigured):
             HashidField(alphabet="aabcdefghijklmno")  # not unique by one
 
+    def test_encoder_is_lazy_and_shared(self):
+        field = HashidField(salt="lazy encoder", min_length=9)
+        self.assertNotIn('_hashids', field.__dict__)
+        same_config = HashidField(salt="lazy encoder", min_length=9)
+        self.assertIs(field._hashids, same_config._hashids)
+        self.assertIsNot(field._hashids, HashidField(salt="another salt", min_length=9)._hashids)
+        self.assertEqual(field.get_hashid(123).hashid, Hashids(salt="lazy encoder", min_length=9).encode(123))
+
+    def test_retired_salts(self):
+        field = HashidField(salt="new salt", retired_salts=["old salt", "older salt"], prefix="c_")
+        current = "c_" + Hashids(salt="new salt", min_length=7).encode(123)
+        old = "c_" + Hashids(salt="old salt", min_length=7).encode(123)
+        older = "c_" + Hashids(salt="older salt", min_length=7).encode(456)
+        self.assertEqual(field.get_hashid(current), field.get_hashid(123))
+        self.assertEqual(field.retired_salt_hits, {"old salt": 0, "older salt": 0})
+        # Old hashids are converted to the current salt
+        self.assertEqual(str(field.get_hashid(old)), current)
+        self.assertEqual(field.get_hashid(older).id, 456)
+        self.assertEqual(field.to_python(old).hashid, current[2:])
+        self.assertEqual(field.retired_salt_hits, {"old salt": 2, "older salt": 1})
+        for invalid in ("c_" + Hashids(salt="unknown salt", min_length=7).encode(123), old[2:], "c_!!!", "c_", "c_-1"):
+            with self.assertRaises(ValueError):
+                field.get_hashid(invalid)
+        self.assertEqual(field.retired_salt_hits, {"old salt": 2, "older salt": 1})
+
+    def test_retired_salts_not_decoded_for_non_candidates(self):
+        field = HashidField(salt="new salt", retired_salts=["old salt"])
+        with mock.patch.object(field._retired_hashids[0][1], 'decode') as decode:
+            with self.assertRaises(ValueError):
+                field.get_hashid("not a hashid!")
+        decode.assert_not_called()
+
+    def test_retired_salts_lookups(self):
+        coupon = Coupon.objects.create()
+        old = Hashids(salt="old salt", min_length=7).encode(coupon.id.id)
+        self.assertEqual(Coupon.objects.get(id=old), coupon)
+        self.assertEqual(list(Coupon.objects.filter(id__in=[old, "invalid"])), [coupon])
+        self.assertEqual(get_object_or_404(Coupon, pk=old).id, coupon.id)
+
+    def test_retired_salts_descriptor(self):
+        coupon = Coupon.objects.create()
+        field = Coupon._meta.pk
+        older = Hashids(salt="older salt", min_length=7).encode(coupon.id.id)
+        hits = field.retired_salt_hits['older salt']
+        assigned = Coupon(id=older)
+        self.assertEqual(assigned.id, coupon.id)
+        self.assertEqual(field.retired_salt_hits['older salt'], hits + 1)
+        assigned.save()
+        self.assertEqual(Coupon.objects.get(pk=assigned.id), coupon)
+        self.assertEqual(field.retired_salt_hits['older salt'], hits + 1)
+
+    def test_interning(self):
+        field = HashidField(salt="interning", enable_interning=True)
+        same_config = HashidField(salt="interning", enable_interning=True)
+        other_config = HashidField(salt="not interning", enable_interning=True)
+        a = field.get_hashid(123)
+        self.assertIs(field.get_hashid(123), a)
+        self.assertIs(field.get_hashid(str(a)), a)
+        self.assertIs(field.to_python(123), a)
+        self.assertIs(same_config.get_hashid(123), a)
+        self.assertIsNot(other_config.get_hashid(123), a)
+        self.assertIsNot(HashidField(salt="interning").get_hashid(123), a)
+
+    def test_interning_is_weak(self):
+        field = HashidField(salt="interning", enable_interning=True)
+        hashid_ref = weakref.ref(field.get_hashid(456))
+        gc.collect()
+        self.assertIsNone(hashid_ref())
+        self.assertNotIn(456, field._intern_table)
+
+    def test_negative_cache(self):
+        field = HashidField(salt="negative cache", negative_cache_size=2)
+        self.assertIs(field.negative_cache, HashidField(salt="negative cache", negative_cache_size=2).negative_cache)
+        self.assertIsNone(HashidField(salt="negative cache").negative_cache)
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            for i in range(3):
+                with self.assertRaises(ValueError):
+                    field.get_hashid("invalid")
+            self.assertEqual(decode.call_count, 1)
+        self.assertEqual(field.negative_cache.stats(), {'hits': 2, 'evictions': 0, 'size': 1, 'maxsize': 2})
+        # Valid values and integers aren't cached
+        field.get_hashid(field.get_hashid(123).hashid)
+        field.get_hashid("123")
+        self.assertEqual(len(field.negative_cache), 1)
+
+    def test_negative_cache_is_bounded(self):
+        field = HashidField(salt="bounded negative cache", negative_cache_size=2)
+        for value in ("invalid1", "invalid2", "invalid1", "invalid3", "x" * 1000):
+            with self.assertRaises(ValueError):
+                field.get_hashid(value)
+        # invalid2 was the least recently seen when invalid3 was added, and the long value is never kept
+        self.assertNotIn("invalid2", field.negative_cache)
+        self.assertEqual(field.negative_cache.stats(), {'hits': 1, 'evictions': 1, 'size': 2, 'maxsize': 2})
+
+    def test_negative_cache_lookups(self):
+        coupon = Coupon.objects.create()
+        Coupon._meta.pk.negative_cache.clear()
+        self.assertEqual(list(Coupon.objects.filter(id__in=[coupon.id, "invalid!"])), [coupon])
+        with self.assertRaises(Coupon.DoesNotExist):
+            Coupon.objects.get(id="invalid!")
+        # Retired salts are tried before a value is cached as invalid
+        old = Hashids(salt="old salt", min_length=7).encode(coupon.id.id)
+        self.assertEqual(Coupon.objects.get(id=old), coupon)
+        self.assertEqual(Coupon._meta.pk.negative_cache.stats()['hits'], 1)
+        self.assertNotIn(old, Coupon._meta.pk.negative_cache)
+
     def test_encode_with_prefix(self):
         field_without_prefix = HashidField(min_length=5)
         field_with_prefix = HashidField(min_length=5, prefix=1)
@@ -540,3 +752,46 @@ class HashidsTests(TestCase):
 
         # Test that a full clean works
         self.record.full_clean()
+
+
+class ShardedHashidFieldTests(TestCase):
+    def test_save_and_load(self):
+        record = ShardedRecord.objects.create(id=(3, 17), reference_id=(1, 5))
+        self.assertIsInstance(record.id, CompositeHashid)
+        self.assertEqual((record.id.shard, record.id.local_id), (3, 17))
+        record = ShardedRecord.objects.get(pk=record.pk)
+        self.assertIsInstance(record.id, CompositeHashid)
+        self.assertEqual((record.id.shard, record.id.local_id), (3, 17))
+        self.assertEqual((record.reference_id.shard, record.reference_id.local_id), (1, 5))
+        self.assertTrue(str(record.reference_id).startswith("ref_"))
+        self.assertEqual(record.reference_id.id, (1 << 32) | 5)
+
+    def test_lookups(self):
+        a = ShardedRecord.objects.create(id=(1, 1))
+        b = ShardedRecord.objects.create(id=(2, 1))
+        self.assertEqual(ShardedRecord.objects.get(id=str(a.id)), a)
+        self.assertEqual(ShardedRecord.objects.get(id=(2, 1)), b)
+        self.assertEqual(set(ShardedRecord.objects.filter(id__in=[str(a.id), (2, 1), "invalid"])), {a, b})
+        self.assertFalse(ShardedRecord.objects.filter(id=Hashid(1).hashid).exists())
+
+    def test_auto_id(self):
+        record = ShardedRecord.objects.create()
+        record.refresh_from_db()
+        self.assertEqual(record.id.shard, 0)
+        self.assertEqual(record.id.local_id, record.id.id)
+
+    def test_get_shard(self):
+        field = ShardedRecord._meta.get_field('id')
+        hashid = field.get_hashid((12, 345))
+        self.assertEqual(field.get_shard(hashid), 12)
+        self.assertEqual(field.get_shard(str(hashid)), 12)
+        self.assertEqual(field.get_shard(hashid.id), 12)
+        self.assertEqual(field.get_shard((12, 345)), 12)
+        with self.assertRaises(ValueError):
+            field.get_shard("invalid")
+
+    def test_descriptor(self):
+        record = ShardedRecord(id=(4, 2))
+        self.assertEqual(record.id.shard, 4)
+        record.reference_id = (4 << 32) | 9
+        self.assertEqual((record.reference_id.shard, record.reference_id.local_id), (4, 9))
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from hashid_field.importer import HashidImporter, ImportResult, import_file, read_csv
+from tests.models import Artist, Record
+
+
+class HashidImporterTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(2)]
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i) for i in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', newline='') as f:
+            f.write(content)
+        return path
+
+    def test_csv(self):
+        missing = str(Record._meta.pk.get_hashid(999))
+        path = self.write("records.csv", "\n".join([
+            "id,name,artist,reference_id",
+            "{},New 0,{},{}".format(self.records[0].id, self.artists[1].id, self.records[1].reference_id),
+            "invalid,Bad,,",
+            "{},Missing,,".format(missing),
+            "{},Bad artist,not an artist,".format(self.records[1].id),
+            "{},New 2,,".format(self.records[2].id),
+        ]))
+        rejects_path = os.path.join(self.directory, "rejects.csv")
+        result = import_file(path, Record, ['name', 'artist', 'reference_id'], rejects_path=rejects_path)
+        self.assertEqual(result, ImportResult(updated=1, created=0, rejected=4))
+
+        record = Record.objects.get(pk=self.records[0].pk)
+        self.assertEqual((record.name, record.artist, record.reference_id),
+                         ("New 0", self.artists[1], self.records[1].reference_id))
+        self.assertEqual(Record.objects.get(pk=self.records[1].pk).name, "Record 1")
+
+        with open(rejects_path, newline='') as f:
+            rejects = list(read_csv(f))
+        self.assertEqual([row['name'] for row in rejects], ["Bad", "Missing", "Bad artist", "New 2"])
+        self.assertEqual(rejects[0]['error'], "'invalid' is not a valid hashid for 'id'")
+        self.assertEqual(rejects[1]['error'], "No Record with id '{}'".format(missing))
+        self.assertEqual(rejects[2]['error'], "'not an artist' is not a valid hashid for 'artist'")
+        # reference_id can't be empty
+        self.assertEqual(rejects[3]['error'], "'reference_id' is required")
+
+    def test_ndjson_create(self):
+        new_id = str(Record._meta.pk.get_hashid(1000))
+        path = self.write("records.ndjson", "\n".join(json.dumps(row) for row in [
+            {"id": str(self.records[0].id), "name": "Updated", "reference_id": str(self.records[0].reference_id)},
+            {"id": new_id, "name": "Created", "reference_id": str(self.records[2].reference_id)},
+        ]) + "\n\n")
+        result = import_file(path, Record, ['name', 'reference_id'], create=True)
+        self.assertEqual(result, ImportResult(updated=1, created=1, rejected=0))
+        self.assertEqual(Record.objects.get(pk=self.records[0].pk).name, "Updated")
+        created = Record.objects.get(pk=new_id)
+        self.assertEqual((created.name, created.reference_id.id), ("Created", 2))
+
+    def test_batches(self):
+        importer = HashidImporter(Record, ['name'], batch_size=2)
+        rows = ({"id": str(record.id), "name": "Batched"} for record in self.records)
+        # Per batch: a savepoint, the select and the update, then releasing the savepoint
+        with self.assertNumQueries(8):
+            result = importer.run(rows)
+        self.assertEqual(result, ImportResult(updated=3, created=0, rejected=0))
+        self.assertEqual(set(Record.objects.values_list('name', flat=True)), {"Batched"})
+
+    def test_rejects_invalid_values(self):
+        rejected = []
+        importer = HashidImporter(Record, ['name', 'reference_id'])
+        result = importer.run([{"id": str(self.records[0].id), "name": "Changed", "reference_id": "invalid"}],
+                              rejects=lambda row, error: rejected.append(error))
+        self.assertEqual(result, ImportResult(updated=0, created=0, rejected=1))
+        self.assertEqual(rejected, ["'invalid' is not a valid hashid for 'reference_id'"])
+        self.assertEqual(Record.objects.get(pk=self.records[0].pk).name, "Record 0")
+
+    def test_rejects_unhashable_values(self):
+        rejected = []
+        importer = HashidImporter(Record, ['name', 'reference_id'])
+        rows = [
+            {"id": [str(self.records[0].id)], "name": "List key", "reference_id": str(self.records[0].reference_id)},
+            {"id": str(self.records[1].id), "name": "Dict reference", "reference_id": {"id": 1}},
+            {"id": str(self.records[2].id), "name": "Changed", "reference_id": str(self.records[2].reference_id)},
+        ]
+        result = importer.run(rows, rejects=lambda row, error: rejected.append((row['name'], error)))
+        self.assertEqual(result, ImportResult(updated=1, created=0, rejected=2))
+        self.assertEqual(rejected, [
+            ("List key", "'['{}']' is not a valid hashid for 'id'".format(self.records[0].id)),
+            ("Dict reference", "'{'id': 1}' is not a valid hashid for 'reference_id'"),
+        ])
+        self.assertEqual(Record.objects.get(pk=self.records[2].pk).name, "Changed")
+
+    def test_fields(self):
+        with self.assertRaises(ValueError):
+            HashidImporter(Record, ['name'], key='name')
+        with self.assertRaises(ValueError):
+            HashidImporter(Record, ['name'], key='reference_id')
+        with self.assertRaises(ValueError):
+            HashidImporter(Record, ['id'])
+
+    def test_command(self):
+        path = self.write("records.csv", "id,name\n{},Commanded\ninvalid,Bad\n".format(self.records[0].id))
+        rejects_path = os.path.join(self.directory, "rejects.csv")
+        out = StringIO()
+        call_command("import_hashids", "tests.Record", path, "name", rejects=rejects_path, batch_size=10, stdout=out)
+        self.assertIn("Updated 1, created 0 and rejected 1 records", out.getvalue())
+        self.assertEqual(Record.objects.get(pk=self.records[0].pk).name, "Commanded")
+        with open(rejects_path) as f:
+            self.assertEqual(f.read().splitlines()[0], "id,name,error")
+        with self.assertRaises(CommandError):
+            call_command("import_hashids", "tests.Record", path, "nope", stdout=out)
+        with self.assertRaises(CommandError):
+            call_command("import_hashids", "tests.Nope", path, "name", stdout=out)
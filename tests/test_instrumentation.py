@@ -0,0 +1,60 @@
+from django.test import TestCase
+
+from hashid_field import instrumentation
+from hashid_field.instrumentation import HashidStats
+from tests.models import Artist, Record
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        self.events = []
+        self.stats = HashidStats()
+        instrumentation.add_hook(self.events.append)
+        instrumentation.add_hook(self.stats)
+        self.addCleanup(instrumentation.remove_hook, self.events.append)
+        self.addCleanup(instrumentation.remove_hook, self.stats)
+
+    def count(self, name, label):
+        return self.stats.snapshot().get((name, label), {}).get('count', 0)
+
+    def test_no_hooks_by_default(self):
+        instrumentation.remove_hook(self.events.append)
+        instrumentation.remove_hook(self.stats)
+        self.assertEqual(instrumentation.hooks, [])
+        Artist.objects.create(name="John Doe")
+        self.assertEqual(self.events, [])
+
+    def test_encode_and_decode(self):
+        artist = Artist.objects.create(name="John Doe")
+        self.stats.reset()
+        Artist.objects.get(pk=str(artist.id))
+        self.assertEqual(self.count(instrumentation.DECODE, 'tests.Artist.id'), 1)
+        self.assertEqual(self.count(instrumentation.ENCODE, 'tests.Artist.id'), 1)
+        snapshot = self.stats.snapshot()[(instrumentation.DECODE, 'tests.Artist.id')]
+        self.assertGreater(snapshot['duration'], 0)
+        self.assertEqual(sum(snapshot['histogram']), 1)
+        self.assertEqual(len(snapshot['histogram']), len(HashidStats.buckets) + 1)
+
+    def test_invalid_lookups(self):
+        self.assertFalse(Artist.objects.filter(pk="invalid").exists())
+        self.assertEqual(self.count(instrumentation.DECODE_FAILED, 'tests.Artist.id'), 1)
+        self.assertEqual(self.count(instrumentation.INVALID_LOOKUP, 'tests.Artist.id'), 1)
+        self.assertEqual(self.count(instrumentation.EMPTY_RESULT, 'tests.Artist.id'), 1)
+
+        artist = Artist.objects.create(name="John Doe")
+        self.stats.reset()
+        self.assertTrue(Artist.objects.filter(pk__in=["invalid", str(artist.id)]).exists())
+        self.assertEqual(self.count(instrumentation.INVALID_LOOKUP, 'tests.Artist.id'), 1)
+        self.assertEqual(self.count(instrumentation.EMPTY_RESULT, 'tests.Artist.id'), 0)
+
+    def test_descriptor_set(self):
+        record = Record(reference_id=123)
+        record.reference_id = 456
+        self.assertEqual(self.count(instrumentation.DESCRIPTOR_SET, 'tests.Record.reference_id'), 2)
+        event = [e for e in self.events if e.name == instrumentation.DESCRIPTOR_SET][-1]
+        self.assertEqual(event.value, 456)
+
+    def test_snapshot_reset(self):
+        Artist.objects.filter(pk="invalid").exists()
+        self.assertTrue(self.stats.snapshot(reset=True))
+        self.assertEqual(self.stats.snapshot(), {})
@@ -0,0 +1,86 @@
+import datetime
+import json
+from unittest import skipUnless
+
+from django.http import JsonResponse
+from django.test import TestCase
+
+from hashid_field.json import HashidJSONEncoder, hashid_default, hashid_int_default, make_default
+from tests.models import Record, ShardedRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    from hashid_field.rest import HashidJSONRenderer
+    have_drf = True
+except ImportError:
+    have_drf = False
+
+
+class HashidJSONTests(TestCase):
+    def setUp(self):
+        self.record = Record.objects.create(name="Record", reference_id=123, prefixed_id=456)
+        self.values = list(Record.objects.values('id', 'reference_id', 'prefixed_id', 'name'))
+
+    def expected(self, as_int=False):
+        record = self.record
+        if as_int:
+            return [{'id': record.id.id, 'reference_id': 123, 'prefixed_id': 456, 'name': "Record"}]
+        return [{'id': str(record.id), 'reference_id': str(record.reference_id),
+                 'prefixed_id': str(record.prefixed_id), 'name': "Record"}]
+
+    def test_encoder(self):
+        self.assertTrue(self.expected()[0]['prefixed_id'].startswith("prefix_"))
+        self.assertEqual(json.loads(json.dumps(self.values, cls=HashidJSONEncoder)), self.expected())
+
+    def test_encoder_as_int(self):
+        class IntEncoder(HashidJSONEncoder):
+            hashid_as_int = True
+        self.assertEqual(json.loads(json.dumps(self.values, cls=IntEncoder)), self.expected(as_int=True))
+
+    def test_encoder_falls_back_to_django(self):
+        data = {'id': self.record.id, 'date': datetime.date(2024, 1, 2)}
+        self.assertEqual(json.loads(json.dumps(data, cls=HashidJSONEncoder)),
+                         {'id': str(self.record.id), 'date': "2024-01-02"})
+        with self.assertRaises(TypeError):
+            json.dumps(object(), cls=HashidJSONEncoder)
+
+    def test_json_response(self):
+        response = JsonResponse(self.values, encoder=HashidJSONEncoder, safe=False)
+        self.assertEqual(json.loads(response.content), self.expected())
+
+    def test_composite_hashid(self):
+        record = ShardedRecord.objects.create(id=(2, 5), name="Sharded")
+        self.assertEqual(json.dumps([record.id], default=hashid_default), json.dumps([str(record.id)]))
+
+    def test_default_hooks(self):
+        self.assertEqual(json.loads(json.dumps(self.values, default=hashid_default)), self.expected())
+        self.assertEqual(json.loads(json.dumps(self.values, default=hashid_int_default)), self.expected(as_int=True))
+        with self.assertRaisesMessage(TypeError, "Object of type object is not JSON serializable"):
+            json.dumps(object(), default=hashid_default)
+        default = make_default(fallback=repr)
+        self.assertEqual(json.dumps([self.record.id, None, 1.5], default=default),
+                         json.dumps([str(self.record.id), None, 1.5]))
+        self.assertEqual(json.dumps(datetime.date(2024, 1, 2), default=default), '"datetime.date(2024, 1, 2)"')
+
+    @skipUnless(orjson, "Requires orjson to be installed")
+    def test_orjson(self):
+        self.assertEqual(orjson.loads(orjson.dumps(self.values, default=hashid_default)), self.expected())
+        self.assertEqual(orjson.loads(orjson.dumps(self.values, default=hashid_int_default)),
+                         self.expected(as_int=True))
+
+    @skipUnless(ujson, "Requires ujson to be installed")
+    def test_ujson(self):
+        self.assertEqual(ujson.loads(ujson.dumps(self.values, default=hashid_default)), self.expected())
+
+    @skipUnless(have_drf, "Requires Django REST Framework to be installed")
+    def test_rest_framework_renderer(self):
+        self.assertEqual(json.loads(HashidJSONRenderer().render(self.values)), self.expected())
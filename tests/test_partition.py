@@ -0,0 +1,116 @@
+from django.test import TestCase
+
+from hashid_field.partition import Window, iterate_window, partition
+from tests.models import Artist, Record
+
+
+class PartitionTests(TestCase):
+    def setUp(self):
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i) for i in range(20)]
+
+    def assert_covers(self, windows, records):
+        found = []
+        for start, end in windows:
+            found.extend(record.id for record in iterate_window(Record.objects.all(), start, end))
+        self.assertEqual(found, [record.id for record in records])
+
+    def test_even_windows(self):
+        with self.assertNumQueries(1):
+            windows = partition(Record.objects.all(), 4)
+        self.assertEqual(len(windows), 4)
+        self.assertIsInstance(windows[0], Window)
+        self.assertIsInstance(windows[0].start, str)
+        self.assertEqual(windows[0].start, str(self.records[0].id))
+        self.assertEqual(windows[-1].end, str(self.records[-1].id))
+        for window in windows:
+            self.assertEqual(Record.objects.between(*window).count(), 5)
+        self.assert_covers(windows, self.records)
+
+    def test_large_ids(self):
+        # Well above 2**53, where a float can't tell neighbouring IDs apart
+        high = 2**62 + 1
+        Record.objects.all().delete()
+        Record.objects.create(id=1, name="Low", reference_id=1)
+        Record.objects.create(id=high, name="High", reference_id=2)
+        field = Record._meta.pk
+        windows = [(field.get_hashid(start).id, field.get_hashid(end).id) for start, end in partition(
+            Record.objects.all(), 3)]
+        # 2**62 + 1 IDs, so the first two windows get one more than the last
+        size = (2**62 + 1) // 3
+        self.assertEqual(windows, [(1, size + 1), (size + 2, 2 * size + 2), (2 * size + 3, high)])
+
+    def test_sampled_windows(self):
+        # With a large gap in the IDs, an even split of the span would leave most windows empty
+        Record.objects.filter(pk__in=[record.id for record in self.records[10:]]).delete()
+        far = [Record.objects.create(id=1_000_000 + i, name="Far", reference_id=i) for i in range(10)]
+        records = self.records[:10] + far
+        windows = partition(Record.objects.all(), 4)
+        self.assertEqual([Record.objects.between(*window).count() for window in windows], [10, 0, 0, 10])
+        # One query for the bounds, and one for each of the three rows at the window edges
+        with self.assertNumQueries(4):
+            windows = partition(Record.objects.all(), 4, sample_size=20)
+        self.assertEqual([Record.objects.between(*window).count() for window in windows], [5, 5, 5, 5])
+        self.assert_covers(windows, records)
+        with self.assertNumQueries(2):
+            windows = partition(Record.objects.all(), 4, sample_size=2)
+        self.assertEqual([Record.objects.between(*window).count() for window in windows], [10, 10])
+
+    def test_sampled_windows_with_id_stride(self):
+        # The sample is spread by row position, so IDs that share a stride don't leave it empty or take every row
+        for first in (1, 10):
+            with self.subTest(first=first):
+                Record.objects.all().delete()
+                for i in range(20):
+                    Record.objects.create(id=first + 10 * i, name="Record {}".format(i), reference_id=i)
+                with self.assertNumQueries(4):
+                    windows = partition(Record.objects.all(), 4, sample_size=100)
+                self.assertEqual([Record.objects.between(*window).count() for window in windows], [5, 5, 5, 5])
+
+    def test_more_windows_than_rows(self):
+        Record.objects.exclude(pk=self.records[0].id).delete()
+        only = str(self.records[0].id)
+        self.assertEqual(partition(Record.objects.all(), 5), [Window(only, only)])
+        self.assertEqual(len(partition(Record.objects.all(), 5, sample_size=10)), 1)
+
+    def test_empty(self):
+        self.assertEqual(partition(Record.objects.none(), 4), [])
+        self.assertEqual(partition(Record.objects.filter(name="Nothing"), 4, sample_size=10), [])
+
+    def test_filtered_queryset(self):
+        windows = partition(Record.objects.filter(name__in=["Record 5", "Record 6", "Record 7"]), 2)
+        self.assertEqual(windows[0].start, str(self.records[5].id))
+        self.assertEqual(windows[-1].end, str(self.records[7].id))
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesMessage(ValueError, "count must be at least 1"):
+            partition(Record.objects.all(), 0)
+        with self.assertRaisesMessage(ValueError, "'name' is not a Hashid*Field"):
+            partition(Record.objects.all(), 2, field_name='name')
+
+
+class IterateWindowTests(TestCase):
+    def setUp(self):
+        self.artist = Artist.objects.create(name="Artist")
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i, artist=self.artist)
+                        for i in range(7)]
+
+    def test_keyset_chunks(self):
+        with self.assertNumQueries(4):
+            found = list(iterate_window(Record.objects.all(), None, None, chunk_size=2))
+        self.assertEqual(found, self.records)
+
+    def test_bounds(self):
+        start, end = str(self.records[1].id), self.records[4].id
+        self.assertEqual(list(iterate_window(Record.objects.all(), start, end, chunk_size=2)), self.records[1:5])
+        self.assertEqual(list(iterate_window(Record.objects.all(), start, None, chunk_size=10)), self.records[1:])
+
+    def test_filtered_queryset(self):
+        queryset = Record.objects.filter(name__in=["Record 1", "Record 3", "Record 6"])
+        found = list(iterate_window(queryset, None, None, chunk_size=1))
+        self.assertEqual(found, [self.records[1], self.records[3], self.records[6]])
+
+    def test_invalid_bound(self):
+        with self.assertRaises(ValueError):
+            list(iterate_window(Record.objects.all(), "invalid", None))
+        with self.assertRaisesMessage(ValueError, "must be a unique field"):
+            list(iterate_window(Record.objects.all(), None, None, field_name='reference_id'))
@@ -0,0 +1,72 @@
+from unittest import skipUnless
+
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory
+
+from hashid_field import instrumentation
+from hashid_field.profiling import HashidProfilerMiddleware, profile_hashids
+from tests.models import Artist, Record
+
+try:
+    from hashid_field.rest import HashidSerializerCharField
+    have_drf = True
+except ImportError:
+    have_drf = False
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.artist = Artist.objects.create(name="John Doe")
+        Record.objects.create(name="Blue Album", reference_id=123, artist=self.artist)
+        Record.objects.create(name="Red Album", reference_id=456, artist=self.artist)
+
+    def test_profile_records_sites(self):
+        with profile_hashids() as profile:
+            list(Record.objects.filter(artist=str(self.artist.id)))
+            Artist.objects.get(pk=str(self.artist.id))
+            Record(reference_id=789)
+        self.assertEqual(instrumentation.hooks, [])
+        sites = {(entry.label, entry.site) for entry in profile.entries}
+        self.assertIn(('tests.Artist.id', 'lookup'), sites)
+        self.assertIn(('tests.Artist.id', 'from_db_value'), sites)
+        self.assertIn(('tests.Record.reference_id', 'descriptor'), sites)
+        for entry in profile.entries:
+            self.assertIn(__file__.rstrip('c'), entry.caller)
+        self.assertIn((instrumentation.DECODE, 'tests.Artist.id', str(self.artist.id), 2), profile.duplicates())
+        self.assertGreater(profile.total_time, 0)
+
+    def test_nested_profiles(self):
+        with profile_hashids() as outer:
+            Artist.objects.filter(pk=str(self.artist.id)).exists()
+            with profile_hashids() as inner:
+                Record(reference_id=789)
+            Artist.objects.filter(pk=str(self.artist.id)).exists()
+        self.assertEqual(outer.entries[0].site, 'lookup')
+        self.assertTrue(inner.entries)
+        self.assertEqual({entry.site for entry in inner.entries}, {'descriptor'})
+        self.assertEqual(outer.entries, outer.entries[:1] + inner.entries + outer.entries[-1:])
+        self.assertEqual(instrumentation.hooks, [])
+
+    def test_middleware(self):
+        artist_id = str(self.artist.id)
+
+        def view(request):
+            for i in range(3):
+                Artist.objects.filter(pk=artist_id).exists()
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        with self.assertLogs('hashid_field.profiling', level='INFO') as logs:
+            response = HashidProfilerMiddleware(view)(request)
+        self.assertEqual(len(request.hashid_profile.entries), 3)
+        self.assertTrue(response['X-Hashid-Conversions'].startswith("3; duplicates=1;"))
+        self.assertTrue(any("tests.Artist.id decode '{}' 3 times".format(artist_id) in line for line in logs.output))
+        self.assertEqual(instrumentation.hooks, [])
+
+    @skipUnless(have_drf, "Requires Django REST Framework to be installed")
+    def test_serializer_site(self):
+        field = HashidSerializerCharField(source_field='tests.Artist.id')
+        with profile_hashids() as profile:
+            field.to_internal_value(str(self.artist.id))
+        self.assertEqual([(entry.name, entry.label, entry.site) for entry in profile.entries],
+                         [(instrumentation.DECODE, 'tests.Artist.id', 'serializer')])
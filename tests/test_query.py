@@ -0,0 +1,170 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from hashid_field import Hashid
+
+from hashid_field.query import HashidQuerySet
+from hashid_field.routers import HashidShardRouter, EmbeddedShards
+from tests.models import Artist, Record, ShardedRecord
+
+
+class InBulkHashidsTests(TestCase):
+    def setUp(self):
+        self.artist = Artist.objects.create(name="Artist")
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i, artist=self.artist)
+                        for i in range(1, 6)]
+
+    def test_keyed_by_input(self):
+        values = [str(self.records[2].id), str(self.records[0].id)]
+        with self.assertNumQueries(1):
+            result = Record.objects.in_bulk_hashids(values)
+        self.assertEqual(list(result), values)
+        self.assertEqual(result[values[0]], self.records[2])
+        self.assertEqual(result[values[1]], self.records[0])
+
+    def test_missing_and_invalid(self):
+        missing_id = str(Record._meta.pk.get_hashid(999))
+        values = [str(self.records[0].id), missing_id, "invalid", 123]
+        result = Record.objects.in_bulk_hashids(values)
+        self.assertEqual(result, {values[0]: self.records[0], missing_id: None, "invalid": None, 123: None})
+        marker = object()
+        result = Record.objects.in_bulk_hashids(values, missing=marker)
+        self.assertIs(result[missing_id], marker)
+        self.assertIs(result["invalid"], marker)
+
+    def test_hashid_objects_and_duplicates(self):
+        hashid = self.records[1].id
+        result = Record.objects.in_bulk_hashids([hashid, str(hashid), str(hashid)])
+        self.assertEqual(result, {hashid: self.records[1]})
+
+    def test_string_field_is_not_decoded_again(self):
+        field = Record._meta.get_field('string_id')
+        for i, record in enumerate(self.records[:2]):
+            record.string_id = i + 100
+            record.save()
+        values = [record.string_id for record in self.records[:2]]
+        # The values are unique, so let the field count as unique too
+        with mock.patch.object(HashidQuerySet, '_get_unique_field_names', return_value={'string_id'}), \
+                mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            result = Record.objects.in_bulk_hashids(values, field_name='string_id')
+        self.assertEqual(result, {values[0]: self.records[0], values[1]: self.records[1]})
+        # Once for each value given, and once as the descriptor loads each object, but not again to match them up
+        self.assertEqual(decode.call_count, 4)
+
+    def test_no_values(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Record.objects.in_bulk_hashids([]), {})
+            self.assertEqual(Record.objects.in_bulk_hashids(["invalid"]), {"invalid": None})
+
+    def test_batch_size(self):
+        values = [str(record.id) for record in self.records]
+        with self.assertNumQueries(3):
+            result = Record.objects.in_bulk_hashids(values, batch_size=2)
+        self.assertEqual(list(result.values()), self.records)
+
+    def test_filtered_queryset(self):
+        values = [str(record.id) for record in self.records[:2]]
+        result = Record.objects.filter(name="Record 1").in_bulk_hashids(values)
+        self.assertEqual(result, {values[0]: self.records[0], values[1]: None})
+
+    def test_field_name(self):
+        with self.assertRaisesMessage(ValueError, "must be a unique field"):
+            Record.objects.in_bulk_hashids([], field_name='reference_id')
+        with self.assertRaisesMessage(ValueError, "must be a Hashid*Field"):
+            Record.objects.in_bulk_hashids([], field_name='name')
+
+    def test_sliced(self):
+        with self.assertRaises(TypeError):
+            Record.objects.all()[:2].in_bulk_hashids([])
+
+
+class BetweenTests(TestCase):
+    def setUp(self):
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i) for i in range(1, 5)]
+        self.ids = [record.id for record in self.records]
+
+    def test_between(self):
+        field = Record._meta.pk
+        with mock.patch.object(field._hashids, 'decode', wraps=field._hashids.decode) as decode:
+            qs = Record.objects.between(str(self.ids[1]), str(self.ids[2])).order_by('id')
+            self.assertEqual(list(qs), self.records[1:3])
+            self.assertEqual(qs.count(), 2)
+        self.assertEqual(decode.call_count, 2)
+        self.assertIn("BETWEEN", str(qs.query))
+
+    def test_open_ended(self):
+        self.assertEqual(list(Record.objects.between(self.ids[2], None).order_by('id')), self.records[2:])
+        self.assertEqual(list(Record.objects.between(None, self.ids[1]).order_by('id')), self.records[:2])
+        self.assertEqual(Record.objects.between(None, None).count(), 4)
+
+    def test_field_name(self):
+        qs = Record.objects.between(self.records[1].reference_id, self.records[2].reference_id, 'reference_id')
+        self.assertEqual(list(qs.order_by('id')), self.records[1:3])
+
+    def test_invalid(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(list(Record.objects.between("invalid", self.ids[3])), [])
+        with override_settings(HASHID_FIELD_LOOKUP_EXCEPTION=True):
+            with self.assertRaises(ValueError):
+                Record.objects.between("invalid", self.ids[3])
+
+
+class BulkPrepareTests(TestCase):
+    def setUp(self):
+        self.field = Record._meta.get_field('plain_hashid')
+        self.hashids = [str(self.field.get_hashid(i)) for i in range(1, 4)]
+
+    def decode_calls(self):
+        return mock.patch.object(self.field._hashids, 'decode', wraps=self.field._hashids.decode)
+
+    def test_get_prep_values(self):
+        with self.decode_calls() as decode:
+            values = self.field.get_prep_values(self.hashids * 2 + [None, 5, Hashid(6)])
+        self.assertEqual(values, [1, 2, 3, 1, 2, 3, None, 5, 6])
+        self.assertEqual(decode.call_count, 3)
+        with self.assertRaises(ValueError):
+            self.field.get_prep_values(["invalid"])
+
+    def test_prepared_values_are_per_block(self):
+        with self.field.prepared_values(self.hashids):
+            with self.decode_calls() as decode:
+                self.assertEqual(self.field.get_prep_value(self.hashids[0]), 1)
+            decode.assert_not_called()
+        self.assertIsNone(getattr(self.field._prepared, 'hashids', None))
+
+    def test_bulk_create(self):
+        records = [Record(name="Record", reference_id=i, plain_hashid=self.hashids[i % 3]) for i in range(30)]
+        with self.decode_calls() as decode:
+            Record.objects.bulk_create(records)
+        self.assertEqual(decode.call_count, 3)
+        self.assertEqual(sorted(Record.objects.values_list('plain_hashid', flat=True))[::10], [1, 2, 3])
+
+    def test_bulk_update(self):
+        Record.objects.bulk_create(Record(name="Record", reference_id=i) for i in range(30))
+        records = list(Record.objects.all())
+        for i, record in enumerate(records):
+            record.plain_hashid = self.hashids[i % 3]
+        with self.decode_calls() as decode:
+            Record.objects.bulk_update(records, ['plain_hashid'])
+        self.assertEqual(decode.call_count, 3)
+        self.assertEqual({hashid.id for hashid in Record.objects.values_list('plain_hashid', flat=True)}, {1, 2, 3})
+
+    def test_bulk_update_invalid(self):
+        record = Record.objects.create(name="Record", reference_id=1)
+        record.plain_hashid = "invalid"
+        with self.assertRaises(ValueError):
+            Record.objects.bulk_update([record], ['plain_hashid'])
+
+
+@override_settings(DATABASE_ROUTERS=[HashidShardRouter()],
+                   HASHID_FIELD_SHARDS={'tests.ShardedRecord': EmbeddedShards({0: 'default', 1: 'shard1'})})
+class ShardedInBulkHashidsTests(TestCase):
+    databases = {'default', 'shard1'}
+
+    def test_across_shards(self):
+        records = [ShardedRecord.objects.create(id=(shard, 3), name=str(shard)) for shard in (0, 1)]
+        values = [str(record.id) for record in reversed(records)]
+        result = ShardedRecord.objects.in_bulk_hashids(values)
+        self.assertEqual(result, {values[0]: records[1], values[1]: records[0]})
+        self.assertEqual(result[values[0]]._state.db, 'shard1')
@@ -0,0 +1,76 @@
+from django.test import TestCase
+
+from hashid_field.resolver import PrefixRegistry, registry, resolve_many
+from tests.models import Artist, Record, ShardedRecord, Track
+
+
+class PrefixRegistryTests(TestCase):
+    def test_populated_when_ready(self):
+        self.assertEqual(registry.get_fields("albumtrack:abc"), [(Track, Track._meta.get_field('id'))])
+        self.assertEqual(registry.get_fields("prefix_abc"), [(Record, Record._meta.get_field('prefixed_id'))])
+        self.assertEqual(registry.get_fields("ref_abc"),
+                         [(ShardedRecord, ShardedRecord._meta.get_field('reference_id'))])
+        self.assertEqual(registry.get_fields("abc"), [])
+        self.assertEqual(registry.get_fields("pre"), [])
+
+    def test_longest_prefix_first(self):
+        field = Artist._meta.get_field('id')
+        short, long = field.clone(), field.clone()
+        short.prefix, long.prefix = "a", "a_"
+        prefixes = PrefixRegistry()
+        prefixes.register(Artist, short)
+        prefixes.register(Artist, long)
+        self.assertEqual(prefixes.get_fields("a_1"), [(Artist, long), (Artist, short)])
+        self.assertEqual(prefixes.get_fields("ab"), [(Artist, short)])
+
+    def test_register_requires_prefix(self):
+        with self.assertRaises(ValueError):
+            PrefixRegistry().register(Artist, Artist._meta.get_field('id'))
+
+    def test_get_hashid(self):
+        field = Record._meta.get_field('prefixed_id')
+        value = str(field.get_hashid(5))
+        model, found_field, hashid = registry.get_hashid(value)
+        self.assertEqual((model, found_field, hashid.id), (Record, field, 5))
+        self.assertIsNone(registry.get_hashid("prefix_!!!"))
+        self.assertIsNone(registry.get_hashid("unknown_abc"))
+        self.assertIsNone(registry.get_hashid(5))
+
+
+class ResolveManyTests(TestCase):
+    def setUp(self):
+        self.records = [Record.objects.create(name="Record {}".format(i), reference_id=i, prefixed_id=i)
+                        for i in range(1, 4)]
+        self.tracks = [Track.objects.create() for i in range(2)]
+
+    def test_resolve_many(self):
+        values = [
+            str(self.tracks[1].id),
+            str(self.records[2].prefixed_id),
+            "prefix_invalid!",
+            str(Track._meta.pk.get_hashid(999)),
+            str(self.records[0].prefixed_id),
+            "unprefixed",
+            str(self.tracks[0].id),
+            None,
+        ]
+        with self.assertNumQueries(2):
+            result = resolve_many(values)
+        self.assertEqual(result, [self.tracks[1], self.records[2], None, None, self.records[0], None, self.tracks[0],
+                                  None])
+
+    def test_missing_marker_and_duplicates(self):
+        marker = object()
+        value = str(self.records[1].prefixed_id)
+        self.assertEqual(resolve_many([value, "nope", value], missing=marker), [self.records[1], marker,
+                                                                                 self.records[1]])
+
+    def test_non_unique_field(self):
+        self.records[2].prefixed_id = self.records[0].prefixed_id
+        self.records[2].save()
+        self.assertEqual(resolve_many([str(self.records[0].prefixed_id)]), [self.records[0]])
+
+    def test_no_values(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_many([]), [])
+            self.assertEqual(resolve_many(["unprefixed"]), [None])
@@ -1,9 +1,12 @@
+import os
+import subprocess
+import sys
 from unittest import skipUnless
 
 from django.core import exceptions
 from django.test import TestCase
 
-from tests.models import Artist, Record, Track
+from tests.models import Artist, Record, Track, ShardedRecord
 import hashids
 
 try:
@@ -53,6 +56,13 @@ class TestRestFramework(TestCase):
         with self.assertRaises(exceptions.ImproperlyConfigured):
             ArtistSerializer().fields()  # Fields aren't built until first accessed
 
+    def test_importing_models_does_not_import_drf(self):
+        code = ("import sys, django; django.setup(); from tests.models import Artist; "
+                "print('rest_framework' in sys.modules)")
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='tests.test_settings')
+        output = subprocess.check_output([sys.executable, '-c', code], env=env, text=True)
+        self.assertEqual(output.strip(), "False")
+
     def test_modelserializer_charfield(self):
         class ArtistSerializer(serializers.ModelSerializer):
             id = HashidSerializerCharField(source_field='tests.Artist.id')
@@ -196,6 +206,29 @@ class TestRestFramework(TestCase):
         with self.assertRaises(exceptions.FieldDoesNotExist):
             id = HashidSerializerIntegerField(source_field="tests.Artist.baz")
 
+    def test_field_without_source_field(self):
+        field = HashidSerializerCharField(salt="alternative salt", prefix="ref_")
+        expected = "ref_" + hashids.Hashids(salt="alternative salt", min_length=field.hashid_min_length).encode(123)
+        hashid = field.to_internal_value(expected)
+        self.assertEqual(hashid.id, 123)
+        self.assertEqual(field.to_representation(hashid), expected)
+
+    def test_retired_salts_from_source_field(self):
+        field = HashidSerializerCharField(source_field="tests.Coupon.id")
+        old = hashids.Hashids(salt="older salt", min_length=7).encode(42)
+        hashid = field.to_internal_value(old)
+        self.assertEqual(hashid.id, 42)
+        self.assertEqual(hashid.hashid, hashids.Hashids(salt="current salt", min_length=7).encode(42))
+        with self.assertRaises(serializers.ValidationError):
+            field.to_internal_value(hashids.Hashids(salt="unknown salt", min_length=7).encode(42))
+
+    def test_sharded_source_field(self):
+        field = HashidSerializerCharField(source_field="tests.ShardedRecord.id")
+        expected = ShardedRecord._meta.get_field('id').get_hashid((5, 8))
+        hashid = field.to_internal_value(str(expected))
+        self.assertEqual((hashid.shard, hashid.local_id), (5, 8))
+        self.assertEqual(field.to_representation(hashid), str(expected))
+
     def test_modelserializer_with_prefix(self):
         class TrackSerializer(serializers.ModelSerializer):
             id = HashidSerializerCharField(source_field="tests.Track.id")
@@ -0,0 +1,105 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core import serializers
+from django.core.management import call_command
+from django.test import TestCase
+
+from hashid_field import Hashid
+from hashid_field.serializers import decode_hashids
+from hashid_field.serializers import json as hashid_json
+from hashid_field.serializers import jsonl as hashid_jsonl
+from hashid_field.serializers import python as hashid_python
+from tests.models import Artist, Playlist, Record
+
+
+class SerializerTests(TestCase):
+    def setUp(self):
+        self.artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(2)]
+        self.records = [
+            Record.objects.create(name="Record {}".format(i), artist=self.artists[i % 2], reference_id=i + 1,
+                                  prefixed_id=i + 10, string_id=i + 20, plain_hashid=i + 30, key=i + 40)
+            for i in range(4)
+        ]
+        self.playlist = Playlist.objects.create(name="Playlist")
+        self.playlist.artists.set(self.artists)
+
+    def test_dump_matches_django(self):
+        for module, format in ((hashid_json, 'json'), (hashid_jsonl, 'jsonl'), (hashid_python, 'python')):
+            for queryset in (Record.objects.order_by('pk'), Playlist.objects.all()):
+                with self.subTest(format=format, model=queryset.model):
+                    self.assertEqual(module.Serializer().serialize(queryset), serializers.serialize(format, queryset))
+
+    def test_round_trip(self):
+        data = hashid_json.Serializer().serialize(Record.objects.order_by('pk'))
+        Record.objects.all().delete()
+        objects = list(hashid_json.Deserializer(data))
+        for deserialized in objects:
+            deserialized.save()
+        self.assertEqual(list(Record.objects.order_by('pk')), self.records)
+        for loaded, record in zip(Record.objects.order_by('pk'), self.records):
+            for name in ('artist_id', 'reference_id', 'prefixed_id', 'string_id', 'plain_hashid', 'key'):
+                self.assertEqual(getattr(loaded, name), getattr(record, name))
+
+    def test_m2m_round_trip(self):
+        data = hashid_jsonl.Serializer().serialize(Playlist.objects.all())
+        Playlist.objects.all().delete()
+        for deserialized in hashid_jsonl.Deserializer(data):
+            deserialized.save()
+        self.assertEqual(set(Playlist.objects.get().artists.all()), set(self.artists))
+
+    def test_decodes_each_value_once(self):
+        data = json.loads(serializers.serialize('json', Record.objects.order_by('pk')))
+        artist_pk = Artist._meta.pk
+        with mock.patch.object(artist_pk, 'get_hashid', wraps=artist_pk.get_hashid) as get_hashid:
+            objects = list(decode_hashids(data))
+        self.assertEqual(get_hashid.call_count, 2)
+        self.assertEqual(len(objects), 4)
+        for obj in objects:
+            self.assertIsInstance(obj['pk'], Hashid)
+            self.assertIsInstance(obj['fields']['artist'], Hashid)
+            self.assertIsInstance(obj['fields']['prefixed_id'], Hashid)
+            self.assertEqual(obj['fields']['name'], data[objects.index(obj)]['fields']['name'])
+        with mock.patch.object(artist_pk, 'get_hashid', wraps=artist_pk.get_hashid) as get_hashid:
+            list(decode_hashids(data, cache_size=1))
+        self.assertEqual(get_hashid.call_count, 4)
+        # The original objects aren't changed
+        self.assertIsInstance(data[0]['fields']['artist'], str)
+
+    def test_foreign_keys_share_primary_keys(self):
+        data = json.loads(serializers.serialize('json', list(Artist.objects.all()) + list(Record.objects.all())))
+        artist_pk = Artist._meta.pk
+        with mock.patch.object(artist_pk, 'get_hashid', wraps=artist_pk.get_hashid) as get_hashid:
+            objects = list(decode_hashids(data))
+        self.assertEqual(get_hashid.call_count, 2)
+        self.assertIs(objects[0]['pk'], objects[2]['fields']['artist'])
+
+    def test_leaves_other_values(self):
+        objects = [
+            {'model': "tests.record", 'pk': 5, 'fields': {'artist': "invalid", 'reference_id': 7, 'name': "Name"}},
+            {'model': "tests.nomodel", 'pk': "abc", 'fields': {}},
+            {'model': "tests.playlist", 'pk': "invalid", 'fields': {'artists': [1, "invalid", ["natural"]]}},
+        ]
+        self.assertEqual(list(decode_hashids(objects)), objects)
+
+    def test_invalid_values_raise_as_usual(self):
+        data = json.dumps([{'model': "tests.record", 'pk': "invalid", 'fields': {'name': "Name", 'reference_id': 1}}])
+        with self.assertRaises(serializers.base.DeserializationError):
+            list(hashid_json.Deserializer(data))
+        with self.assertRaises(serializers.base.DeserializationError):
+            list(hashid_json.Deserializer("not json"))
+
+    def test_loaddata_and_dumpdata(self):
+        serializers.register_serializer('json', 'hashid_field.serializers.json')
+        try:
+            out = StringIO()
+            call_command("loaddata", "artists", stdout=out)
+            self.assertEqual(out.getvalue().strip(), "Installed 2 object(s) from 1 fixture(s)")
+            self.assertEqual(Artist.objects.get(pk='94edaeb').name, "John Doe")
+            self.assertEqual(Artist.objects.get(pk="39e7aeb").name, "Jane Doe")
+            out = StringIO()
+            call_command("dumpdata", "tests.artist", stdout=out)
+            self.assertEqual(out.getvalue(), serializers.serialize('json', Artist.objects.order_by('pk')))
+        finally:
+            serializers.register_serializer('json', 'django.core.serializers.json')
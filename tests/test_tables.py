@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from hashids import Hashids
+
+from hashid_field import HashidField
+from hashid_field.tables import build_encoding_table, MappedHashids
+from tests.models import Artist
+
+
+class EncodingTableTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "ids.table")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_as_hashids(self):
+        for min_length, alphabet in ((0, Hashids.ALPHABET), (7, Hashids.ALPHABET), (13, "0123456789abcdef")):
+            build_encoding_table(self.path, "table salt", min_length, alphabet, 0, 2000)
+            mapped = MappedHashids(self.path, salt="table salt", min_length=min_length, alphabet=alphabet)
+            reference = Hashids(salt="table salt", min_length=min_length, alphabet=alphabet)
+            for id in list(range(0, 2000, 7)) + [1999, 2000, 123456789]:
+                hashid = reference.encode(id)
+                self.assertEqual(mapped.encode(id), hashid)
+                self.assertEqual(mapped.decode(hashid), (id,))
+            self.assertEqual(mapped.encode(1, 2), reference.encode(1, 2))
+            self.assertEqual(mapped.decode(reference.encode(1, 2)), (1, 2))
+            self.assertEqual(mapped.decode("invalid"), ())
+
+    def test_encode_reads_from_table(self):
+        build_encoding_table(self.path, "table salt", 7, Hashids.ALPHABET, 100, 200)
+        mapped = MappedHashids(self.path, salt="table salt", min_length=7, alphabet=Hashids.ALPHABET)
+        self.assertEqual((mapped.start, mapped.stop), (100, 200))
+        with mock.patch('hashid_field.encoder.TableHashids.encode') as engine_encode:
+            mapped.encode(150)
+        engine_encode.assert_not_called()
+
+    def test_wrong_configuration(self):
+        build_encoding_table(self.path, "table salt", 7, Hashids.ALPHABET, 0, 10)
+        with self.assertRaises(ImproperlyConfigured):
+            MappedHashids(self.path, salt="other salt", min_length=7, alphabet=Hashids.ALPHABET)
+        with self.assertRaises(ImproperlyConfigured):
+            MappedHashids(self.path, salt="table salt", min_length=8, alphabet=Hashids.ALPHABET)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ImproperlyConfigured):
+            MappedHashids(self.path, salt="table salt", min_length=7, alphabet=Hashids.ALPHABET)
+        open(self.path, 'wb').close()
+        with self.assertRaises(ImproperlyConfigured):
+            MappedHashids(self.path, salt="table salt", min_length=7, alphabet=Hashids.ALPHABET)
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            build_encoding_table(self.path, "table salt", 7, Hashids.ALPHABET, 10, 10)
+
+    def test_field(self):
+        build_encoding_table(self.path, "field salt", 7, Hashids.ALPHABET, 0, 100)
+        field = HashidField(salt="field salt", encoding_table=self.path)
+        self.assertIsInstance(field._hashids, MappedHashids)
+        reference = Hashids(salt="field salt", min_length=7)
+        self.assertEqual(field.get_hashid(42).hashid, reference.encode(42))
+        self.assertEqual(field.get_hashid(reference.encode(42)).id, 42)
+        self.assertEqual(field.get_hashid(reference.encode(4200)).id, 4200)
+
+    def test_build_command(self):
+        artists = [Artist.objects.create(name="Artist {}".format(i)) for i in range(3)]
+        field = Artist._meta.get_field('id')
+        out = StringIO()
+        call_command("build_hashid_table", "tests.Artist.id", self.path, stdout=out)
+        self.assertIn("Wrote 3 hashids", out.getvalue())
+        mapped = MappedHashids(self.path, salt=field.salt, min_length=field.min_length, alphabet=field.alphabet)
+        self.assertEqual((mapped.start, mapped.stop), (artists[0].id.id, artists[-1].id.id + 1))
+        self.assertEqual(mapped.encode(artists[1].id.id), artists[1].id.hashid)
+
+        call_command("build_hashid_table", "tests.Artist.id", self.path, start=10, end=19, stdout=out)
+        mapped = MappedHashids(self.path, salt=field.salt, min_length=field.min_length, alphabet=field.alphabet)
+        self.assertEqual((mapped.start, mapped.stop), (10, 20))
+
+        with self.assertRaises(CommandError):
+            call_command("build_hashid_table", "tests.Artist.name", self.path, stdout=out)
+        with self.assertRaises(CommandError):
+            call_command("build_hashid_table", "tests.Artist", self.path, stdout=out)
+        with self.assertRaises(CommandError):
+            call_command("build_hashid_table", "tests.ShardedRecord.id", self.path, stdout=out)